@@ -0,0 +1,80 @@
+"""
+Compare the memory use and attribute access speed of small objects of an
+unvalidated plain class, an unvalidated ``__slots__`` class, a class
+decorated with ``slotted_type_hints`` and a ``HasTraits`` class.
+
+Usage: python benchmarks/attributes.py [number of objects]
+
+Run from the repository root with typen importable, e.g. with
+``PYTHONPATH=.``.
+"""
+import sys
+import timeit
+import tracemalloc
+
+from traits.api import Float, HasTraits
+
+from typen import slotted_type_hints
+
+
+class PlainPoint:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class SlotsPoint:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+@slotted_type_hints
+class TypedPoint:
+    x: float
+    y: float
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class TraitsPoint(HasTraits):
+    x = Float()
+    y = Float()
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def memory_per_object(cls, count):
+    tracemalloc.start()
+    objects = [cls(1.0, 2.0) for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def main(count=100000):
+    print("{:>12} {:>10} {:>10} {:>10} {:>10}".format(
+        "", "bytes", "create", "read", "write"))
+    for cls in [PlainPoint, SlotsPoint, TypedPoint, TraitsPoint]:
+        point = cls(1.0, 2.0)
+        timings = [
+            min(timeit.repeat(stmt, number=100000, repeat=5)) * 1e4
+            for stmt in [
+                lambda: cls(1.0, 2.0),
+                lambda: point.x,
+                lambda: setattr(point, "x", 3.0),
+            ]
+        ]
+        print("{:>12} {:>10.0f} {:>8.0f}ns {:>8.0f}ns {:>8.0f}ns".format(
+            cls.__name__, memory_per_object(cls, count), *timings))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,45 @@
+"""
+Compare converting arguments again in the function after validating them,
+with passing the converted values from the validators with
+``coerce=True``.
+
+Usage: python benchmarks/coerce.py [number of points]
+
+Run from the repository root with typen importable, e.g. with
+``PYTHONPATH=.``.
+"""
+import sys
+import timeit
+
+import numpy as np
+from traits.api import Array, Float
+
+from typen import enforce_type_hints
+
+
+@enforce_type_hints
+def converted_again(points: Array(dtype=float), scale: Float) -> Float:
+    points = np.asarray(points, dtype=float)
+    return float(points.sum()) * float(scale)
+
+
+@enforce_type_hints(coerce=True)
+def coerced(points: Array(dtype=float), scale: Float) -> Float:
+    return points.sum() * scale
+
+
+def main(size=1000):
+    points = [float(i) for i in range(size)]
+    variants = [
+        ("converted again", converted_again),
+        ("coerce=True", coerced),
+    ]
+    for name, func in variants:
+        best = min(timeit.repeat(
+            lambda: func(points, 2), number=1000, repeat=5))
+        print("{:>16}: {:.1f}us per call with {} points".format(
+            name, best / 1000 * 1e6, size))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
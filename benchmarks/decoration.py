@@ -0,0 +1,45 @@
+"""
+Measure how many functions per second can have their enforcers built.
+
+Usage: python benchmarks/decoration.py [number of functions]
+
+Run from the repository root with typen importable, e.g. with
+``PYTHONPATH=.``.
+"""
+import sys
+import timeit
+
+from traits.api import Either, Int, List, Str
+
+from typen._enforcer import Enforcer
+
+TEMPLATE = """
+def function_{i}(self, a: int, b: Str, c: Either(Str, Int) = 1, *args: float,
+                 d: List(Int) = None, **kwargs: str) -> int:
+    return a
+"""
+
+
+def make_functions(number):
+    namespace = {"Str": Str, "Int": Int, "Either": Either, "List": List}
+    exec(
+        "".join(TEMPLATE.format(i=i) for i in range(number)),
+        namespace,
+    )
+    return [namespace["function_{}".format(i)] for i in range(number)]
+
+
+def main(number=2000):
+    functions = make_functions(number)
+
+    def decorate():
+        for func in functions:
+            Enforcer(func, ignore_self=True)
+
+    best = min(timeit.repeat(decorate, number=1, repeat=5))
+    print("Built {} enforcers in {:.3f}s: {:.0f} functions per second".format(
+        number, best, number / best))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
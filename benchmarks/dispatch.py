@@ -0,0 +1,78 @@
+"""
+Measure dispatching calls to implementations by their type hints: once
+warmed up for hints that only depend on types, and by trying each
+implementation, as for keyword arguments and hints that depend on values.
+
+Usage: python benchmarks/dispatch.py
+
+Run from the repository root with typen importable, e.g. with
+``PYTHONPATH=.``.
+"""
+import timeit
+from typing import List
+
+from typen import dispatch_type_hints, enforce_type_hints
+
+
+class Circle:
+    pass
+
+
+class Square:
+    pass
+
+
+class Triangle:
+    pass
+
+
+@dispatch_type_hints
+def by_type(shape: Circle) -> str:
+    return "circle"
+
+
+@by_type.register
+def _(shape: Square) -> str:
+    return "square"
+
+
+@by_type.register
+def _(shape: Triangle) -> str:
+    return "triangle"
+
+
+@dispatch_type_hints
+def by_value(values: List[Circle]) -> str:
+    return "circles"
+
+
+@by_value.register
+def _(values: List[Square]) -> str:
+    return "squares"
+
+
+@by_value.register
+def _(values: List[Triangle]) -> str:
+    return "triangles"
+
+
+@enforce_type_hints
+def single(shape: Triangle) -> str:
+    return "triangle"
+
+
+def main():
+    variants = [
+        ("enforce_type_hints", lambda: single(Triangle())),
+        ("dispatch by type", lambda: by_type(Triangle())),
+        # Keyword arguments aren't cached, so each implementation is tried
+        ("by type, keyword", lambda: by_type(shape=Triangle())),
+        ("dispatch by value", lambda: by_value([Triangle()])),
+    ]
+    for name, call in variants:
+        best = min(timeit.repeat(call, number=100000, repeat=5))
+        print("{:>20}: {:.2f}us per call".format(name, best / 100000 * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Measure the time taken to import typen, using ``python -X importtime``.
+
+Usage: python benchmarks/import_time.py [number of runs]
+
+Run from the repository root with typen importable, e.g. with
+``PYTHONPATH=.``. Exits with an error if importing typen imports Traits.
+"""
+import subprocess
+import sys
+
+
+def import_times():
+    """
+    Import typen in a fresh interpreter.
+
+    Returns
+    -------
+    dict
+        Mapping of module names to cumulative import times in microseconds
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import typen"],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stderr
+
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main(runs=20):
+    results = [import_times() for _ in range(runs)]
+
+    best = min(result["typen"] for result in results)
+    print("import typen: {:.1f}ms (best of {})".format(best / 1000, runs))
+
+    loaded = [name for name in results[0] if name.split(".")[0] == "traits"]
+    if loaded:
+        sys.exit("import typen loaded Traits: {}".format(", ".join(loaded)))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
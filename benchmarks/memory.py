@@ -0,0 +1,68 @@
+"""
+Measure the memory used per decorated function, once its enforcer is built.
+
+Usage: python benchmarks/memory.py [number of functions]
+
+Run from the repository root with typen importable, e.g. with
+``PYTHONPATH=.``. Also checks that decorated functions are freed by
+reference counting alone, i.e. without reference cycles.
+"""
+import gc
+import sys
+import tracemalloc
+import weakref
+
+from typen import compile_type_hints, enforce_type_hints
+
+TEMPLATE = """
+def function_{i}(self, a: int, b: str, c: float = 1.0, *args: int,
+                 d: list = None, **kwargs: str) -> Example:
+    return Example()
+"""
+
+HEADER = """
+class Example:
+    pass
+"""
+
+
+def make_functions(number):
+    namespace = {"__name__": "memory_example"}
+    exec(
+        HEADER + "".join(TEMPLATE.format(i=i) for i in range(number)),
+        namespace,
+    )
+    return [namespace["function_{}".format(i)] for i in range(number)]
+
+
+def decorate(functions):
+    decorated = [enforce_type_hints(func) for func in functions]
+    compile_type_hints()
+    return decorated
+
+
+def main(number=5000):
+    functions = make_functions(number)
+    decorate(make_functions(10))  # Warm up shared state
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    decorated = decorate(functions)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print("{:.0f} bytes per decorated function".format(
+        (after - before) / number))
+
+    gc.disable()
+    refs = [weakref.ref(func.enforcer) for func in decorated]
+    del decorated
+    alive = sum(ref() is not None for ref in refs)
+    gc.enable()
+    if alive:
+        sys.exit("{} enforcers kept alive by reference cycles".format(alive))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,66 @@
+"""
+Compare validating a protocol hint by checking every attribute of each value
+with validating it with typen, which caches the attributes of each type.
+
+Usage: python benchmarks/protocols.py
+
+Run from the repository root with typen importable, e.g. with
+``PYTHONPATH=.``.
+"""
+import timeit
+import typing
+
+from typen._hints import compile_hint
+
+
+class Plugin(typing.Protocol):
+    name: str
+
+    def load(self):
+        pass
+
+    def run(self, data):
+        pass
+
+    def unload(self):
+        pass
+
+
+class ExamplePlugin:
+    def __init__(self):
+        self.name = "example"
+
+    def load(self):
+        pass
+
+    def run(self, data):
+        pass
+
+    def unload(self):
+        pass
+
+
+MEMBERS = ("load", "name", "run", "unload")
+
+
+def scan(value):
+    for member in MEMBERS:
+        if not hasattr(value, member):
+            raise TypeError(member)
+    return value
+
+
+def main():
+    plugin = ExamplePlugin()
+    validator = compile_hint(Plugin)
+    variants = [
+        ("hasattr scan", lambda: scan(plugin)),
+        ("typen", lambda: validator.validate(None, None, plugin)),
+    ]
+    for name, check in variants:
+        best = min(timeit.repeat(check, number=100000, repeat=5))
+        print("{:>14}: {:.0f}ns per value".format(name, best / 100000 * 1e9))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Measure the cost of enforcing type hints on a deeply recursive function,
+validating every call or only the entry into the recursion.
+
+Usage: python benchmarks/recursion.py [recursion depth]
+
+Run from the repository root with typen importable, e.g. with
+``PYTHONPATH=.``.
+"""
+import sys
+import timeit
+
+from typen import enforce_type_hints
+
+
+def total(values: list, start: int = 0) -> int:
+    if start == len(values):
+        return 0
+    return values[start] + total(values, start + 1)
+
+
+def main(depth=200):
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * depth))
+    values = list(range(depth))
+    undecorated = total
+
+    variants = [
+        ("undecorated", undecorated),
+        ("enforce_type_hints", enforce_type_hints(undecorated)),
+        ("outermost_only=True",
+         enforce_type_hints(undecorated, outermost_only=True)),
+    ]
+    for name, func in variants:
+        # Recursive calls look up the module global
+        globals()["total"] = func
+        best = min(timeit.repeat(lambda: func(values), number=20, repeat=5))
+        print("{:>20}: {:.2f}us per call at depth {}".format(
+            name, best / 20 * 1e6, depth))
+    globals()["total"] = undecorated
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,71 @@
+"""
+Measure the time taken to build the enforcers of a module in a fresh
+process, as e.g. a short-lived worker would on startup.
+
+Usage: python benchmarks/startup.py [number of functions]
+
+Run from the repository root with typen importable, e.g. with
+``PYTHONPATH=.``.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+TEMPLATE = """
+@enforce_type_hints
+def function_{i}(a: int, b: str, c: float = 1.0, *args: int,
+                 d: list = None, **kwargs: str) -> Example:
+    return Example()
+"""
+
+HEADER = """
+from typen import enforce_type_hints
+
+
+class Example:
+    pass
+"""
+
+RUNNER = """
+import sys
+import time
+
+import typen
+
+import startup_example
+
+start = time.perf_counter()
+typen.compile_type_hints(startup_example)
+print(time.perf_counter() - start)
+"""
+
+
+def run(module_dir):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [module_dir, env.get("PYTHONPATH", "")])
+    output = subprocess.run(
+        [sys.executable, "-c", RUNNER],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+        env=env,
+    ).stdout
+    return float(output)
+
+
+def main(number=2000, repeat=5):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with open(os.path.join(tmp_dir, "startup_example.py"), "w") as fh:
+            fh.write(HEADER)
+            fh.write("".join(TEMPLATE.format(i=i) for i in range(number)))
+
+        best = min(run(tmp_dir) for _ in range(repeat))
+
+    print("Built {} enforcers in a fresh process in {:.1f}ms".format(
+        number, best * 1000))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
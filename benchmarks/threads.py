@@ -0,0 +1,62 @@
+"""
+Measure the throughput of calls of enforced functions from several threads.
+
+Usage: python benchmarks/threads.py [number of calls per thread]
+
+Run from the repository root with typen importable, e.g. with
+``PYTHONPATH=.``. With the GIL, throughput stays flat as threads are added.
+On free-threaded builds of CPython, it should grow with the number of
+threads, up to the number of cores.
+"""
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from typen import enforce_type_hints
+
+
+class Point:
+    pass
+
+
+@enforce_type_hints
+def transform(
+        point: Point, scale: float, labels: Optional[List[str]] = None,
+) -> Point:
+    return point
+
+
+def run(threads, calls):
+    point = Point()
+    labels = ["a", "b", "c"]
+    barrier = threading.Barrier(threads + 1)
+
+    def target():
+        barrier.wait()
+        for _ in range(calls):
+            transform(point, 2.0, labels)
+
+    workers = [threading.Thread(target=target) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return threads * calls / (time.perf_counter() - start)
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("GIL enabled: {}".format(gil))
+    # The first calls of all threads build the enforcer at the same time
+    run(8, 1)
+    for threads in (1, 2, 4, 8):
+        print("{} threads: {:.0f} calls/s".format(
+            threads, run(threads, calls)))
+
+
+if __name__ == "__main__":
+    main()
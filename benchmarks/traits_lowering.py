@@ -0,0 +1,55 @@
+"""
+Compare validating values with Traits traits and with the native validators
+they are lowered to.
+
+Usage: python benchmarks/traits_lowering.py
+
+Run from the repository root with typen importable, e.g. with
+``PYTHONPATH=.``.
+"""
+import timeit
+
+from traits.api import Either, Enum, Float, Instance, Int, Range, Str, Tuple
+
+try:
+    from traits.trait_converters import trait_for
+except ImportError:  # Traits < 6
+    from traits.traits import trait_for
+
+from typen._hints import compile_hint
+
+
+class Example:
+    pass
+
+
+CASES = [
+    ("Either(Str, Int)", Either(Str, Int), 1),
+    ("Either(Str, Instance)", Either(Str, Instance(Example)), Example()),
+    ("Enum", Enum("a", "b", "c", "d", "e"), "e"),
+    ("Tuple(Int, Str, Float)", Tuple(Int, Str, Float), (1, "a", 1.0)),
+    ("Range(0, 100)", Range(0, 100), 50),
+    ("Range(0.0, 1.0)", Range(0.0, 1.0), 0.5),
+]
+
+
+def main():
+    for name, trait, value in CASES:
+        ctrait = trait_for(trait)
+        lowered = compile_hint(trait)
+        timings = []
+        for validator in (ctrait, lowered):
+            timings.append(min(timeit.repeat(
+                lambda: validator.validate(None, None, value),
+                number=100000, repeat=5,
+            )))
+        print("{:>24}: {:.0f}ns trait, {:.0f}ns lowered ({})".format(
+            name,
+            timings[0] / 100000 * 1e9,
+            timings[1] / 100000 * 1e9,
+            type(lowered).__name__,
+        ))
+
+
+if __name__ == "__main__":
+    main()
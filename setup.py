@@ -22,6 +22,6 @@ setuptools.setup(
         "Topic :: Software Development",
     ],
     license="MIT",
-    install_requires=["traits"],
+    install_requires=["traits", "contextvars; python_version < '3.7'"],
     python_requires='>=3.6',
 )
@@ -1,4 +1,22 @@
 from ._decorators import (  # noqa: F401
+    cached_type_hints,
+    compile_type_hints,
+    enforce_class_type_hints,
     enforce_type_hints,
+    record_type_hints,
+    strict_class_type_hints,
     strict_type_hints,
 )
+from ._attributes import slotted_type_hints  # noqa: F401
+from ._dispatch import dispatch_type_hints  # noqa: F401
+from ._metrics import (  # noqa: F401
+    disable_metrics,
+    enable_metrics,
+    export_metrics,
+    reset_metrics,
+)
+from ._scope import trusted_scope  # noqa: F401
+from ._import_hook import (  # noqa: F401
+    enforce_module_type_hints,
+    install_import_hook,
+)
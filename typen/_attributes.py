@@ -0,0 +1,183 @@
+import sys
+import typing
+from functools import wraps
+
+from typen import _hints
+from typen._enforcer import _describe_invalid
+from typen._hints import TraitCache
+from typen._scope import trusted
+from typen._typing import _instance_classes
+from typen.exceptions import AttributeTypeError, UnresolvedTypeHintError
+
+
+def slotted_type_hints(cls):
+    """
+    Store the annotated attributes of the decorated class in ``__slots__``,
+    and enforce their type hints when they are assigned.
+
+    The decorated class is replaced by a copy with the slots, as with
+    ``dataclass(slots=True)``. Reading attributes has no overhead, as they
+    are read from the slots directly. Assignments are validated by the
+    class's ``__setattr__``, with the same validators as enforced functions.
+    Class attribute values of annotated attributes are defaults, which are
+    validated on decoration, unless their hint refers to a class that isn't
+    defined yet, and assigned before ``__init__`` runs.
+
+    ``ClassVar`` attributes are left as class attributes. Instances only
+    lack a ``__dict__`` if the base classes also define ``__slots__``, and
+    keep supporting weak references, as with
+    ``dataclass(slots=True, weakref_slot=True)``.
+
+    Raises
+    ------
+    AttributeTypeError
+        If a default value is invalid, or when an invalid value is assigned
+        to an instance
+    """
+    namespace = vars(sys.modules[cls.__module__])
+    annotations = cls.__dict__.get("__annotations__")
+    if annotations is None:
+        # Annotations are created lazily on Python >= 3.14, and are
+        # inherited from base classes before Python 3.10
+        annotations = {}
+        if sys.version_info >= (3, 10):
+            annotations = getattr(cls, "__annotations__", {})
+    inherited = {
+        name
+        for base in cls.__mro__[1:]
+        for name in _slot_names(base)
+    }
+    names = [
+        name for name, hint in annotations.items()
+        if not _is_class_var(hint)
+        and name not in inherited
+        and name not in _slot_names(cls)
+    ]
+
+    trait_cache = TraitCache()
+    validators = {
+        name: trait_cache.validator(annotations[name], namespace)
+        for name in names
+    }
+
+    cls_dict = dict(cls.__dict__)
+    for name in _slot_names(cls):
+        # Slot descriptors of the original class
+        cls_dict.pop(name, None)
+    defaults = {
+        name: cls_dict.pop(name) for name in names if name in cls_dict}
+    slots = cls.__dict__.get("__slots__", ())
+    if isinstance(slots, str):
+        slots = (slots,)
+    slots = tuple(slots) + tuple(names)
+    if (cls.__weakrefoffset__ and "__weakref__" not in slots
+            and not any(base.__weakrefoffset__ for base in cls.__bases__)):
+        slots += ("__weakref__",)
+    cls_dict["__slots__"] = slots
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    _replace_class_cells(new_cls, cls)
+
+    # Attributes validated by InstanceValidators are checked directly with
+    # isinstance, and only check for a trusted scope when invalid
+    instance_checks = {}
+    other_validators = {}
+    for name, validator in validators.items():
+        classes = _instance_classes(validator)
+        if classes is not None:
+            instance_checks[name] = classes
+        else:
+            other_validators[name] = validator
+    base_setattr = new_cls.__setattr__
+
+    def __setattr__(self, name, value):
+        classes = instance_checks.get(name)
+        if classes is not None:
+            if not isinstance(value, classes) and not trusted.get():
+                raise _attribute_error(
+                    type(self), name, annotations[name], value, None)
+        elif name in other_validators and not trusted.get():
+            try:
+                other_validators[name].validate(None, None, value)
+            except _hints.VALIDATION_ERRORS as error:
+                raise _attribute_error(
+                    type(self), name, annotations[name], value, error,
+                ) from None
+        base_setattr(self, name, value)
+
+    new_cls.__setattr__ = __setattr__
+
+    for name, value in defaults.items():
+        try:
+            validators[name].validate(None, None, value)
+        except UnresolvedTypeHintError:
+            # Refers to a class that isn't defined yet, e.g. this class
+            pass
+        except _hints.VALIDATION_ERRORS as error:
+            raise _attribute_error(
+                new_cls, name, annotations[name], value, error) from None
+
+    if defaults:
+        init = new_cls.__init__
+
+        @wraps(init)
+        def __init__(self, *args, **kwargs):
+            for name, value in defaults.items():
+                base_setattr(self, name, value)
+            init(self, *args, **kwargs)
+
+        new_cls.__init__ = __init__
+
+    return new_cls
+
+
+def _slot_names(cls):
+    slots = cls.__dict__.get("__slots__", ())
+    if isinstance(slots, str):
+        slots = (slots,)
+    return [name for name in slots if name not in ("__dict__", "__weakref__")]
+
+
+def _is_class_var(hint):
+    if isinstance(hint, str):
+        return hint.startswith(("ClassVar", "typing.ClassVar"))
+    return hint is typing.ClassVar or (
+        getattr(hint, "__origin__", None) is typing.ClassVar)
+
+
+def _replace_class_cells(new_cls, cls):
+    """
+    Make methods that use ``super()`` or ``__class__`` refer to the new
+    class.
+    """
+    functions = []
+    for value in vars(new_cls).values():
+        if isinstance(value, (staticmethod, classmethod)):
+            functions.append(value.__func__)
+        elif isinstance(value, property):
+            functions.extend([value.fget, value.fset, value.fdel])
+        else:
+            functions.append(value)
+
+    for function in functions:
+        for cell in getattr(function, "__closure__", None) or ():
+            try:
+                if cell.cell_contents is cls:
+                    cell.cell_contents = new_cls
+            except ValueError:  # Empty cell
+                pass
+
+
+def _attribute_error(cls, name, hint, value, error):
+    msg = "The {!r} attribute of {!r} must be {!r}, but {}."
+    return AttributeTypeError(
+        msg.format(
+            name,
+            cls.__name__,
+            hint,
+            _describe_invalid(error, value, "specified"),
+        )
+    )
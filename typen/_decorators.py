@@ -1,25 +1,73 @@
-from functools import wraps
+import threading
+from functools import lru_cache, wraps
+from itertools import cycle
+from types import FunctionType, MethodType
+from weakref import WeakSet
 
-from typen._enforcer import Enforcer
+from typen._enforcer import cached_enforcer, TraitCache
+from typen._scope import trusted
 
+#: Decorated functions whose enforcers haven't been built yet
+_pending = WeakSet()
 
-def enforce_type_hints(func):
+#: Wrappers built by typen to enforce functions. Other wrappers made with
+#: ``functools.wraps`` copy their attributes, so they are told apart by
+#: identity.
+_wrappers = WeakSet()
+
+#: Guards ``_pending`` and publishing the enforcers of decorated functions
+_lock = threading.Lock()
+
+
+def enforce_type_hints(func=None, outermost_only=False, coerce=False):
     """
     Enforce type hints on the parameters and return types of the decorated
     function.
+
+    Can be used as ``@enforce_type_hints``, or with options as e.g.
+    ``@enforce_type_hints(outermost_only=True)``.
+
+    Parameters
+    ----------
+    outermost_only : bool
+        Only validate calls that aren't made from within another call of the
+        function in the same thread, e.g. only the entry into a recursion
+    coerce : bool
+        Pass the values returned by the validators to the function, and
+        return the value returned by the return validator, rather than the
+        original values. For example, ``Float`` hints convert ints to floats
+        and ``Array`` hints convert sequences to arrays.
     """
-    return EnforceTypeHints(func, require_args=False, require_return=False)
+    if func is None:
+        return lambda func: enforce_type_hints(
+            func, outermost_only=outermost_only, coerce=coerce)
+    return EnforceTypeHints(
+        func,
+        require_args=False,
+        require_return=False,
+        outermost_only=outermost_only,
+        coerce=coerce,
+    )
 
 
-def strict_type_hints(func):
+def strict_type_hints(func=None, outermost_only=False, coerce=False):
     """
     Enforce type hints on the parameters and return types of the decorated
     function.
 
     Also require type hints to be provided for all parmeters and the return
-    value.
+    value. Options are as for ``enforce_type_hints``.
     """
-    return EnforceTypeHints(func, require_args=True, require_return=True)
+    if func is None:
+        return lambda func: strict_type_hints(
+            func, outermost_only=outermost_only, coerce=coerce)
+    return EnforceTypeHints(
+        func,
+        require_args=True,
+        require_return=True,
+        outermost_only=outermost_only,
+        coerce=coerce,
+    )
 
 
 def strict_parameter_hints(func):
@@ -48,19 +96,303 @@ def strict_return_hint(func):
     return EnforceTypeHints(func, require_args=False, require_return=True)
 
 
+def record_type_hints(sample_every=1):
+    """
+    Enforce type hints on the parameters and return types of the decorated
+    function, and record the concrete types it is called with and returns.
+
+    Suggested type hints are available from the ``recorder`` attribute of
+    the decorated function once it has been called.
+
+    Can be used as ``@record_type_hints`` or e.g.
+    ``@record_type_hints(sample_every=10)``.
+
+    Parameters
+    ----------
+    sample_every : int
+        Only record the types of one in this many calls
+    """
+    if callable(sample_every):
+        return record_type_hints()(sample_every)
+
+    from typen._recorder import TypeRecorder
+
+    def decorator(func):
+        return EnforceTypeHints(
+            func,
+            require_args=False,
+            require_return=False,
+            recorder=TypeRecorder(sample_every=sample_every),
+        )
+    return decorator
+
+
+def cached_type_hints(maxsize=128):
+    """
+    Memoise the decorated function like ``functools.lru_cache``, and enforce
+    its type hints when the result isn't cached.
+
+    Parameters are only validated the first time a cache key is seen, and
+    the return value only when it's computed, so cache hits only cost the
+    lookup. Invalid calls raise and aren't cached. The ``cache_info`` and
+    ``cache_clear`` methods are as for ``lru_cache``.
+
+    Can be used as ``@cached_type_hints`` or e.g.
+    ``@cached_type_hints(maxsize=None)``.
+
+    Parameters
+    ----------
+    maxsize : int or None
+        Maximum number of cached results, or None for no limit
+
+    Notes
+    -----
+    Arguments of different types are always cached separately, as with
+    ``lru_cache(typed=True)``, so that e.g. ``1.0`` is validated even if
+    ``1`` is already cached. Only the types of the arguments themselves are
+    part of the key, not the types of their items, so e.g. ``(1.0,)`` is
+    not validated against ``Tuple[int, ...]`` if the equal ``(1,)`` is
+    already cached.
+    """
+    if callable(maxsize):
+        return cached_type_hints()(maxsize)
+
+    def decorator(func):
+        hints = EnforceTypeHints(
+            func, require_args=False, require_return=False)
+
+        @wraps(hints.func)
+        def checked(*args, **kwargs):
+            return hints(*args, **kwargs)
+
+        cached = lru_cache(maxsize=maxsize, typed=True)(checked)
+        cached.unchecked = hints.func
+        cached._typen_hints = hints
+        return cached
+    return decorator
+
+
+def enforce_class_type_hints(cls):
+    """
+    Enforce type hints on the parameters and return types of all methods,
+    class methods, static methods and properties of the decorated class.
+
+    Validators are shared between all methods with identical type hints.
+    """
+    return _decorate_class(cls, require_args=False, require_return=False)
+
+
+def strict_class_type_hints(cls):
+    """
+    Enforce type hints on the parameters and return types of all methods,
+    class methods, static methods and properties of the decorated class.
+
+    Also require type hints to be provided for all parameters and return
+    values. Property setters and deleters don't require a return type hint.
+    """
+    return _decorate_class(cls, require_args=True, require_return=True)
+
+
+def _decorate_class(cls, require_args, require_return):
+    trait_cache = TraitCache()
+
+    def enforce(func, ignore_self=True, require_return=require_return):
+        hints = EnforceTypeHints(
+            func,
+            require_args=require_args,
+            require_return=require_return,
+            trait_cache=trait_cache,
+        )
+        hints.decorate(ignore_self=ignore_self)
+        return hints.decorated_func
+
+    for name, value in list(vars(cls).items()):
+        if isinstance(value, FunctionType):
+            new_value = enforce(value)
+        elif isinstance(value, staticmethod):
+            # __new__ is an implicit static method that takes the class
+            new_value = staticmethod(
+                enforce(value.__func__, ignore_self=name == "__new__"))
+        elif isinstance(value, classmethod):
+            new_value = classmethod(enforce(value.__func__))
+        elif isinstance(value, property):
+            new_value = property(
+                value.fget and enforce(value.fget),
+                value.fset and enforce(value.fset, require_return=False),
+                value.fdel and enforce(value.fdel, require_return=False),
+                value.__doc__,
+            )
+        else:
+            continue
+        setattr(cls, name, new_value)
+
+    return cls
+
+
+def compile_type_hints(target=None):
+    """
+    Build the enforcers of decorated functions now, rather than on their
+    first call.
+
+    This can be used e.g. before forking worker processes, so that the
+    first call of each function doesn't pay for building its enforcer and
+    the built enforcers are shared between the workers.
+
+    Parameters
+    ----------
+    target : module or class, optional
+        Only build the enforcers of functions in this module, or of methods
+        of this class. By default, all enforcers that haven't been built yet
+        are built.
+
+    Returns
+    -------
+    int
+        The number of enforcers that were built
+
+    Raises
+    ------
+    UnspecifiedParameterTypeError
+        If a parameter type hint is required but not provided
+    UnspecifiedReturnTypeError
+        If a return type hint is required but not provided
+    """
+    with _lock:
+        all_pending = set(_pending)
+    if target is None:
+        pending = list(all_pending)
+    elif isinstance(target, type):
+        pending = []
+        for value in vars(target).values():
+            if isinstance(value, (staticmethod, classmethod)):
+                value = value.__func__
+            if isinstance(value, property):
+                pending.extend([value.fget, value.fset, value.fdel])
+            else:
+                pending.append(value)
+        # Wrappers such as those of cached_type_hints and the import hook
+        pending = [getattr(value, "_typen_hints", value) for value in pending]
+        pending = [
+            hints for hints in pending
+            if isinstance(hints, EnforceTypeHints) and hints in all_pending
+        ]
+    else:
+        pending = [
+            hints for hints in all_pending
+            if getattr(hints.func, "__module__", None) == target.__name__
+        ]
+
+    for hints in pending:
+        hints.compile()
+    return len(pending)
+
+
 class EnforceTypeHints:
-    def __init__(self, func, require_args, require_return):
+    """
+    Lazily enforce type hints on a function, building its enforcer on the
+    first call.
+
+    If the function is already enforced by typen, the policies are merged
+    so that each call is only validated once: the function is unwrapped and
+    enforced with the union of the required hints. If typen enforcement is
+    found further down a ``__wrapped__`` chain, e.g. below a
+    ``functools.wraps``-based decorator, validation is left to it and only
+    the required hints are checked here.
+    """
+    __slots__ = (
+        "func",
+        "validated_by",
+        "enforcer",
+        "decorated_func",
+        "require_args",
+        "require_return",
+        "recorder",
+        "trait_cache",
+        "ignore_self",
+        "sample_every",
+        "outermost_only",
+        "coerce",
+        "__weakref__",
+    )
+
+    def __init__(
+            self, func, require_args, require_return,
+            recorder=None,
+            trait_cache=None,
+            ignore_self=False,
+            sample_every=1,
+            outermost_only=False,
+            coerce=False):
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+
+        layer, original = _find_enforcement(func)
+        self.validated_by = None
+        if layer is func:
+            # Directly stacked: merge both into one enforcer
+            if isinstance(layer, EnforceTypeHints):
+                with _lock:
+                    _pending.discard(layer)
+                require_args = require_args or layer.require_args
+                require_return = require_return or layer.require_return
+                recorder = recorder or layer.recorder
+                ignore_self = ignore_self or layer.ignore_self
+                sample_every = min(sample_every, layer.sample_every)
+                outermost_only = outermost_only or layer.outermost_only
+                coerce = coerce or layer.coerce
+            else:
+                enforcer = layer._typen_enforcer
+                require_args = require_args or enforcer.require_args
+                require_return = require_return or enforcer.require_return
+                recorder = recorder or getattr(layer, "recorder", None)
+                ignore_self = (
+                    ignore_self or enforcer.ignored_self_name is not None)
+                outermost_only = (
+                    outermost_only or hasattr(layer, "_typen_recursion"))
+                coerce = coerce or hasattr(layer, "_typen_coerce")
+            func = original
+        elif layer is not None:
+            # Validated by an enforced function inside another wrapper
+            if coerce:
+                raise ValueError(
+                    "coerce can't be used on a function enforced by typen "
+                    "inside another wrapper")
+            self.validated_by = original
+
+        if outermost_only and (recorder is not None or sample_every > 1):
+            raise ValueError(
+                "outermost_only can't be combined with recording or sampling")
+        if coerce and (
+                outermost_only or recorder is not None or sample_every > 1):
+            raise ValueError(
+                "coerce can't be combined with outermost_only, recording or "
+                "sampling")
+
         self.func = func
         self.enforcer = None
         self.require_args = require_args
         self.require_return = require_return
+        self.recorder = recorder
+        self.trait_cache = trait_cache
+        self.ignore_self = ignore_self
+        self.sample_every = sample_every
+        self.outermost_only = outermost_only
+        self.coerce = coerce
+        with _lock:
+            _pending.add(self)
 
     def __call__(self, *args, **kwargs):
         if self.enforcer is None:
-            self.decorate()
+            self.decorate(ignore_self=self.ignore_self, replace=False)
 
         return self.decorated_func(*args, **kwargs)
 
+    def __get__(self, instance, owner=None):
+        # Bind like a function when added to a class after its creation
+        if instance is None:
+            return self
+        return MethodType(self, instance)
+
     def __set_name__(self, owner, name):
         # This is called on class creation so we can distinguish methods
         # from non-methods
@@ -85,19 +417,165 @@ class EnforceTypeHints:
             self.decorated_func = desc(self.decorated_func)
         setattr(owner, name, self.decorated_func)
 
-    def decorate(self, ignore_self=False):
-        self.enforcer = Enforcer(
-            self.func,
+    @property
+    def unchecked(self):
+        """
+        The decorated function, without type hint enforcement.
+        """
+        return self.func
+
+    def compile(self):
+        """
+        Build the enforcer now if it hasn't been built yet.
+        """
+        if self.enforcer is None:
+            self.decorate(ignore_self=self.ignore_self, replace=False)
+
+    def decorate(self, ignore_self=False, replace=True):
+        # Built without holding the lock, so threads making the first calls
+        # at the same time may each build an enforcer, but only one is used
+        # unless replacing it, e.g. once the class of a method is created
+        enforcer, decorated_func = self._build(ignore_self)
+        with _lock:
+            if self.enforcer is not None and not replace:
+                return
+            if self.recorder is not None and self.validated_by is None:
+                self.recorder.bind(self.func, ignore_self=ignore_self)
+            _wrappers.add(decorated_func)
+            # Calls only read the wrapper once the enforcer is set
+            self.decorated_func = decorated_func
+            self.enforcer = enforcer
+            # Only needed to build the enforcer
+            self.trait_cache = None
+            _pending.discard(self)
+
+    def _build(self, ignore_self):
+        func = self.func
+
+        if self.validated_by is not None:
+            # Only check that the required hints are given
+            enforcer = cached_enforcer(
+                self.validated_by,
+                require_args=self.require_args,
+                require_return=self.require_return,
+                ignore_self=ignore_self,
+                trait_cache=self.trait_cache,
+            )
+            return enforcer, func
+
+        enforcer = cached_enforcer(
+            func,
             require_args=self.require_args,
             require_return=self.require_return,
             ignore_self=ignore_self,
+            trait_cache=self.trait_cache,
         )
 
-        @wraps(self.func)
-        def new_func(*args, **kwargs):
-            self.enforcer.verify_args(args, kwargs)
-            result = self.func(*args, **kwargs)
-            self.enforcer.verify_result(result)
-            return result
+        # The wrapper doesn't refer back to this object, so that there are no
+        # reference cycles keeping decorated functions alive
+        recorder = self.recorder
+        if self.outermost_only:
+            recursion = _Recursion()
+
+            @wraps(func)
+            def new_func(*args, **kwargs):
+                if recursion.active or trusted.get():
+                    return func(*args, **kwargs)
+                enforcer.verify_args(args, kwargs)
+                recursion.active = True
+                try:
+                    result = func(*args, **kwargs)
+                finally:
+                    recursion.active = False
+                enforcer.verify_result(result)
+                return result
+
+            new_func._typen_recursion = recursion
+        elif self.coerce:
+            @wraps(func)
+            def new_func(*args, **kwargs):
+                if trusted.get():
+                    return func(*args, **kwargs)
+                args, kwargs = enforcer.coerce_args(args, kwargs)
+                return enforcer.coerce_result(func(*args, **kwargs))
+
+            new_func._typen_coerce = True
+        elif recorder is None and self.sample_every > 1:
+            # Only validate one in every `sample_every` calls of each thread
+            samples = _Samples(self.sample_every)
+
+            @wraps(func)
+            def new_func(*args, **kwargs):
+                if not samples.next() or trusted.get():
+                    return func(*args, **kwargs)
+                enforcer.verify_args(args, kwargs)
+                result = func(*args, **kwargs)
+                enforcer.verify_result(result)
+                return result
+        elif recorder is None:
+            @wraps(func)
+            def new_func(*args, **kwargs):
+                if trusted.get():
+                    return func(*args, **kwargs)
+                enforcer.verify_args(args, kwargs)
+                result = func(*args, **kwargs)
+                enforcer.verify_result(result)
+                return result
+        else:
+            @wraps(func)
+            def new_func(*args, **kwargs):
+                if trusted.get():
+                    return func(*args, **kwargs)
+                sampled = recorder.observe_args(args, kwargs)
+                enforcer.verify_args(args, kwargs)
+                result = func(*args, **kwargs)
+                if sampled:
+                    recorder.observe_result(result)
+                enforcer.verify_result(result)
+                return result
 
-        self.decorated_func = new_func
+            new_func.recorder = recorder
+
+        new_func._typen_enforcer = enforcer
+        new_func.unchecked = func
+        return enforcer, new_func
+
+
+class _Recursion(threading.local):
+    #: Whether a call of the function is in progress in this thread
+    active = False
+
+
+class _Samples(threading.local):
+    def __init__(self, sample_every):
+        #: Whether the next call of the function in this thread is validated
+        self.next = cycle([True] + [False] * (sample_every - 1)).__next__
+
+
+def _find_enforcement(func):
+    """
+    Find typen enforcement of a function, following ``__wrapped__`` chains.
+
+    Returns
+    -------
+    layer : EnforceTypeHints, Callable or None
+        The enforced function or ``EnforceTypeHints`` object, or None if the
+        function isn't enforced by typen
+    original : Callable or None
+        The function enforced by the layer
+    """
+    seen = set()
+    while id(func) not in seen:
+        seen.add(id(func))
+        if isinstance(func, EnforceTypeHints):
+            return func, func.func
+        if type(func) is FunctionType and func in _wrappers:
+            return func, func.__wrapped__
+        hints = getattr(func, "_typen_hints", None)
+        if isinstance(hints, EnforceTypeHints):
+            return hints, hints.func
+        try:
+            func = func.__wrapped__
+        except AttributeError:
+            break
+    return None, None
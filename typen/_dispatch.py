@@ -0,0 +1,179 @@
+from functools import update_wrapper
+from types import MethodType
+
+from typen._enforcer import cached_enforcer, TraitCache
+from typen._hints import cache_type_result, InstanceValidator
+from typen._lowering import FloatValidator, IntValidator
+from typen._scope import trusted
+from typen._typing import AnnotatedValidator, AnyValidator, UnionValidator
+from typen.exceptions import ParameterTypeError
+
+# Validators whose result only depends on the type of the value
+_TYPE_VALIDATORS = (InstanceValidator, AnyValidator, IntValidator,
+                    FloatValidator)
+
+
+def dispatch_type_hints(func):
+    """
+    Dispatch calls of the decorated function to one of several
+    implementations, chosen by their type hints.
+
+    Further implementations are registered with the ``register`` method of
+    the decorated function. Each call runs the first implementation, in
+    order of registration, whose parameter type hints accept the arguments,
+    and its return value is validated against that implementation's return
+    type hint.
+
+    When the hints of an implementation only depend on the types of the
+    arguments, e.g. class hints, whether it accepts arguments is cached for
+    each tuple of argument types. Once warmed up, calls with positional
+    arguments are dispatched with a dict lookup. Implementations with hints
+    that depend on values, such as ``Range`` or ``List[int]``, are tried in
+    order on every call, checking the parameters that are cheapest to
+    check, or that most often reject arguments, first.
+
+    Raises
+    ------
+    ParameterTypeError
+        When called with arguments that no implementation accepts
+    """
+    return TypeDispatcher(func)
+
+
+class TypeDispatcher:
+    """
+    A function that dispatches calls to implementations by their type
+    hints. See ``dispatch_type_hints``.
+
+    Enforcers of the implementations are built on the first call.
+    """
+    def __init__(self, func):
+        update_wrapper(self, func)
+        self.funcs = [func]
+        self._implementations = None
+        # Implementations to try for each tuple of argument types, bounded
+        # as validator caches are
+        self._plans = {}
+
+    def register(self, func):
+        """
+        Register an implementation, to be tried after those already
+        registered.
+
+        Parameters
+        ----------
+        func : Callable
+            The implementation
+
+        Returns
+        -------
+        Callable
+            The implementation, unchanged
+        """
+        self.funcs.append(func)
+        self._implementations = None
+        self._plans = {}
+        return func
+
+    def __call__(self, *args, **kwargs):
+        implementations = self._implementations
+        if implementations is None:
+            implementations = self._compile()
+
+        if kwargs:
+            implementation = _first_accepting(implementations, args, kwargs)
+        else:
+            key = tuple(map(type, args))
+            try:
+                plan = self._plans[key]
+            except KeyError:
+                plan = _plan(implementations, args)
+                cache_type_result(self._plans, key, plan)
+            implementation = _first_accepting(plan, args, kwargs)
+
+        if implementation is None:
+            msg = "No implementation of {!r} accepts arguments of types {}."
+            types = [type(arg).__name__ for arg in args] + [
+                "{}={}".format(key, type(value).__name__)
+                for key, value in kwargs.items()
+            ]
+            raise ParameterTypeError(
+                msg.format(self.__name__, "({})".format(", ".join(types))))
+
+        result = implementation.func(*args, **kwargs)
+        if not trusted.get():
+            implementation.enforcer.verify_result(result)
+        return result
+
+    def __get__(self, instance, owner=None):
+        # Bind like a function when used as a method
+        if instance is None:
+            return self
+        return MethodType(self, instance)
+
+    def _compile(self):
+        trait_cache = TraitCache()
+        implementations = self._implementations = [
+            _Implementation(
+                func,
+                cached_enforcer(
+                    func, trait_cache=trait_cache, adaptive_order=True),
+            )
+            for func in self.funcs
+        ]
+        return implementations
+
+
+class _Implementation:
+    __slots__ = ("func", "enforcer", "by_type")
+
+    def __init__(self, func, enforcer):
+        self.func = func
+        self.enforcer = enforcer
+        #: Whether the hints only depend on the types of arguments
+        self.by_type = all(
+            _depends_on_type(arg.validator)
+            for arg in enforcer.args + [
+                enforcer.packed_args, enforcer.packed_kwargs]
+            if arg is not None and arg.validator is not None
+        )
+
+
+def _plan(implementations, args):
+    """
+    Get the implementations to try for arguments of the same types as some
+    positional arguments.
+
+    Implementations whose hints only depend on types and reject the
+    arguments are left out, and the first one that accepts them is last.
+    """
+    plan = []
+    for implementation in implementations:
+        if not implementation.by_type:
+            plan.append(implementation)
+        elif implementation.enforcer.accepts_args(args, {}):
+            plan.append(implementation)
+            break
+    return plan
+
+
+def _first_accepting(implementations, args, kwargs):
+    for implementation in implementations:
+        # Implementations that depend on types are only in plans for types
+        # they accept
+        if kwargs or not implementation.by_type:
+            if not implementation.enforcer.accepts_args(args, kwargs):
+                continue
+        return implementation
+    return None
+
+
+def _depends_on_type(validator):
+    if type(validator) in _TYPE_VALIDATORS:
+        return True
+    if type(validator) is UnionValidator:
+        return all(map(_depends_on_type, validator.validators))
+    if type(validator) is AnnotatedValidator:
+        return (not validator.value_constraints
+                and _depends_on_type(validator.base))
+    return False
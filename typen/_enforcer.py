@@ -1,7 +1,12 @@
-import inspect
-
-from traits.api import HasTraits, TraitError
-
+import copy
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import FunctionType
+
+from typen import _hints, _metrics
+from typen._hints import TraitCache
 from typen.exceptions import (
     ParameterTypeError,
     ReturnTypeError,
@@ -14,6 +19,111 @@ UNSPECIFIED = object()
 #: List of methods exempt from strict return type annotation
 RETURN_EXEMPT = ["__init__"]
 
+# Code object flags, as in the inspect module
+CO_VARARGS = 0x04
+CO_VARKEYWORDS = 0x08
+
+#: Maximum number of validation plans kept by ``cached_enforcer``
+ENFORCER_CACHE_SIZE = 512
+
+#: Number of failures of a parameter after which ``adaptive_order`` stops
+#: counting them, so that enforcers are no longer changed by calls
+MAX_FAILURES = 1000
+
+_enforcer_cache = OrderedDict()
+_enforcer_cache_lock = threading.Lock()
+
+
+def cached_enforcer(
+        func,
+        require_args=False,
+        require_return=False,
+        ignore_self=False,
+        trait_cache=None,
+        adaptive_order=False):
+    """
+    Get an ``Enforcer`` for a function, reusing the validation plan of a
+    previous enforcer for the same code object with equal annotations and
+    options.
+
+    This makes repeatedly decorating functions created by a factory or
+    closure cheap. The most recently used ``ENFORCER_CACHE_SIZE`` plans are
+    kept. Functions with unhashable annotations or that wrap another
+    function, and callables other than functions, such as bound methods,
+    always get a new enforcer. Plans of functions with string annotations
+    or forward references are only shared between functions with the same
+    globals, in which they are resolved, and no closure.
+
+    Parameters are as for ``Enforcer``.
+    """
+    try:
+        annotations = tuple(func.__annotations__.items())
+        namespace = None
+        if any(_hints.has_forward_ref(hint) for _, hint in annotations):
+            namespace = id(func.__globals__)
+        key = (
+            func.__code__,
+            annotations,
+            namespace,
+            require_args,
+            require_return,
+            ignore_self,
+            adaptive_order,
+        )
+        hash(key)
+    except (AttributeError, TypeError):
+        key = None
+
+    if (key is not None and namespace is not None
+            and getattr(func, "__closure__", None)):
+        # Hints are also resolved in variables that differ between closures
+        key = None
+
+    if (key is None or type(func) is not FunctionType
+            or hasattr(func, "__wrapped__")):
+        return Enforcer(
+            func,
+            require_args=require_args,
+            require_return=require_return,
+            ignore_self=ignore_self,
+            trait_cache=trait_cache,
+            adaptive_order=adaptive_order,
+        )
+
+    with _enforcer_cache_lock:
+        plan = _enforcer_cache.get(key)
+        if plan is not None:
+            _enforcer_cache.move_to_end(key)
+
+    if plan is not None:
+        return plan.for_function(func)
+
+    enforcer = Enforcer(
+        func,
+        require_args=require_args,
+        require_return=require_return,
+        ignore_self=ignore_self,
+        trait_cache=trait_cache,
+        adaptive_order=adaptive_order,
+    )
+    # The cached plan doesn't keep the function alive
+    plan = copy.copy(enforcer)
+    plan.func = None
+    plan.default_kwargs = None
+    with _enforcer_cache_lock:
+        _enforcer_cache[key] = plan
+        while len(_enforcer_cache) > ENFORCER_CACHE_SIZE:
+            _enforcer_cache.popitem(last=False)
+    return enforcer
+
+
+def clear_enforcer_cache():
+    """
+    Remove all validation plans kept by ``cached_enforcer``.
+    """
+    with _enforcer_cache_lock:
+        _enforcer_cache.clear()
+
 
 class Enforcer:
     """
@@ -32,6 +142,20 @@ class Enforcer:
     ignore_self : bool
         If type hints are required, ignore the self-reference paramter of
         methods
+    trait_cache : TraitCache, optional
+        Cache of trait validators to share with other enforcers. If not
+        given, validators are only shared between this function's hints.
+    adaptive_order : bool
+        Count how often each parameter makes ``accepts_args`` fail, up to
+        ``MAX_FAILURES``, and check parameters that often fail earlier
+
+    Notes
+    -----
+    ``accepts_args`` checks parameters in order of the estimated cost of
+    their validators, so that e.g. an ``int`` parameter is checked before
+    a ``List[int]`` parameter. ``verify_args`` checks them in declaration
+    order, as it reports the first invalid parameter of the signature,
+    and must validate the parameters before it in any order.
 
     Raises
     ------
@@ -40,68 +164,107 @@ class Enforcer:
     UnspecifiedReturnTypeError
         If the return type hint is required but not provided
     """
+    __slots__ = (
+        "func",
+        "label",
+        "require_args",
+        "require_return",
+        "default_kwargs",
+        "ignored_self_name",
+        "packed_args",
+        "packed_args_pos",
+        "packed_kwargs",
+        "has_packed_kwargs",
+        "num_positional",
+        "keyword_names",
+        "returns",
+        "args",
+        "checks",
+        "adaptive_order",
+        "result_validator",
+        "__weakref__",
+    )
+
     def __init__(
             self, func,
             require_args=False,
             require_return=False,
-            ignore_self=False):
+            ignore_self=False,
+            trait_cache=None,
+            adaptive_order=False):
         self.func = func
-        spec = func.__annotations__
-        params = dict(inspect.signature(func).parameters)
+        self.label = "{}.{}".format(func.__module__, func.__qualname__)
+        self.require_args = require_args
+        self.require_return = require_return
+        spec = dict(func.__annotations__)
+        (
+            names,
+            num_positional_only,
+            num_positional,
+            packed_args_name,
+            packed_kwargs_name,
+            self.default_kwargs,
+        ) = _signature_layout(func)
 
+        # If this is a method of some kind, ignore the first argument
+        # (usually "self")
+        self.ignored_self_name = None
         if ignore_self:
             require_return = require_return and func.__name__ not in RETURN_EXEMPT
+            if num_positional:
+                self.ignored_self_name = names[0]
+                names = names[1:]
+                num_positional -= 1
+                num_positional_only = max(num_positional_only - 1, 0)
+                spec.pop(self.ignored_self_name, None)
 
         # Support for annotations on arg and kwarg packing
         self.packed_args = None
         self.packed_args_pos = None
         self.packed_kwargs = None
-        self.num_normal_keywords = None
-        for i, (name, param) in enumerate(list(params.items())):
-            if param.kind == inspect.Parameter.VAR_POSITIONAL:
-                self.packed_args_pos = i
-                if name in spec:
-                    self.packed_args = Arg(name, spec.pop(name))
-                elif require_args:
-                    msg = (
-                        "Packed positional argument {!r} must be given a type "
-                        "hint"
-                    )
-                    raise UnspecifiedParameterTypeError(msg.format(name))
-                params.pop(name)
-            elif param.kind == inspect.Parameter.VAR_KEYWORD:
-                if name in spec:
-                    self.packed_kwargs = Arg(name, spec.pop(name))
-                elif require_args:
-                    msg = (
-                        "Packed keyword argument {!r} must be given a type "
-                        "hint"
-                    )
-                    raise UnspecifiedParameterTypeError(msg.format(name))
-                params.pop(name)
-                self.num_normal_keywords = len(params)
+        #: Whether the function packs keyword arguments, with or without a
+        #: type hint. ``packed_args_pos`` is None unless it packs positional
+        #: arguments.
+        self.has_packed_kwargs = packed_kwargs_name is not None
+        if packed_args_name is not None:
+            self.packed_args_pos = num_positional
+            if packed_args_name in spec:
+                self.packed_args = Arg(
+                    packed_args_name, spec.pop(packed_args_name))
+            elif require_args:
+                msg = (
+                    "Packed positional argument {!r} must be given a type "
+                    "hint"
+                )
+                raise UnspecifiedParameterTypeError(
+                    msg.format(packed_args_name))
+        if packed_kwargs_name is not None:
+            if packed_kwargs_name in spec:
+                self.packed_kwargs = Arg(
+                    packed_kwargs_name, spec.pop(packed_kwargs_name))
+            elif require_args:
+                msg = (
+                    "Packed keyword argument {!r} must be given a type "
+                    "hint"
+                )
+                raise UnspecifiedParameterTypeError(
+                    msg.format(packed_kwargs_name))
 
-        # If this is a method of some kind, ignore the first argument
-        # (usually "self")
-        self.ignored_self_name = None
-        if ignore_self:
-            self.ignored_self_name = list(params.keys())[0]
+        #: Number of parameters that can be passed positionally
+        self.num_positional = num_positional
 
-        if self.ignored_self_name is not None:
-            params.pop(self.ignored_self_name)
-            if self.ignored_self_name in spec:
-                spec.pop(self.ignored_self_name)
+        #: Parameters that can be passed by keyword, as opposed to being
+        #: packed into the keyword argument packing
+        self.keyword_names = frozenset(names[num_positional_only:])
 
-        unspecified = {key: UNSPECIFIED for key in params.keys() if key not in spec}
+        unspecified = [name for name in names if name not in spec]
         if unspecified and require_args:
             msg = "The following parameters of {!r} must be given type hints: {!r}"
             raise UnspecifiedParameterTypeError(
-                msg.format(func.__name__, list(unspecified.keys()))
+                msg.format(func.__name__, unspecified)
             )
 
-        spec.update(unspecified)
-
-        if "return" in spec.keys():
+        if "return" in spec:
             self.returns = spec.pop("return")
         else:
             self.returns = UNSPECIFIED
@@ -109,32 +272,58 @@ class Enforcer:
                 msg = "A return type hint must be specified for {!r}."
                 raise UnspecifiedReturnTypeError(msg.format(func.__name__))
 
-        # Restore order of args
-        self.args = [Arg(k, spec[k]) for k in params.keys()]
+        self.args = [Arg(name, spec.get(name, UNSPECIFIED)) for name in names]
 
-        # Store defaults to be validated if they're used
-        self.default_kwargs = {
-            k: v.default for k, v in params.items()
-            if v.default is not inspect.Parameter.empty
-        }
+        if trait_cache is None:
+            trait_cache = TraitCache()
 
-        fs = FunctionSignature()
-        rt = FunctionSignature()
+        # String hints are resolved in the function's module and closure
+        namespace = _module_globals(func)
+        localns = _closure_variables(func)
 
         for arg in self.args:
-            fs.add_trait(arg.name, arg.type)
-            arg.validator = fs.trait(arg.name)
+            if arg.type is not UNSPECIFIED:
+                arg.validator = trait_cache.validator(
+                    arg.type, namespace, localns)
+
+        #: Pairs of the indices and parameters with type hints, in the order
+        #: they are checked
+        self.checks = _check_order(self.args)
+        self.adaptive_order = adaptive_order
 
         if self.packed_args is not None:
-            fs.add_trait(self.packed_args.name, self.packed_args.type)
-            self.packed_args.validator = fs.trait(self.packed_args.name)
+            self.packed_args.validator = trait_cache.validator(
+                self.packed_args.type, namespace, localns)
 
         if self.packed_kwargs is not None:
-            fs.add_trait(self.packed_kwargs.name, self.packed_kwargs.type)
-            self.packed_kwargs.validator = fs.trait(self.packed_kwargs.name)
+            self.packed_kwargs.validator = trait_cache.validator(
+                self.packed_kwargs.type, namespace, localns)
+
+        self.result_validator = None
+        if self.returns is not UNSPECIFIED:
+            self.result_validator = trait_cache.validator(
+                self.returns, namespace, localns)
 
-        rt.add_trait("result", self.returns)
-        self.result_validator = rt.trait("result")
+    def for_function(self, func):
+        """
+        Create an enforcer for another function with the same code and
+        annotations as this enforcer's function, sharing its validators.
+
+        Parameters
+        ----------
+        func : Callable
+            A function with the same code object and annotations
+
+        Returns
+        -------
+        Enforcer
+            An enforcer for the function
+        """
+        enforcer = copy.copy(self)
+        enforcer.func = func
+        enforcer.label = "{}.{}".format(func.__module__, func.__qualname__)
+        enforcer.default_kwargs = _default_kwargs(func)
+        return enforcer
 
     def verify_args(self, passed_args, passed_kwargs):
         """
@@ -152,6 +341,9 @@ class Enforcer:
         ParameterTypeError
             If an input parameter is not valid based on is type hint
         """
+        if _metrics.enabled:
+            _metrics.record_call(self.label)
+
         if self.ignored_self_name is not None:
             # Handle the corner case that self is passed as a kwarg
             if self.ignored_self_name in passed_kwargs:
@@ -169,12 +361,8 @@ class Enforcer:
             passed_args = passed_args[:self.packed_args_pos]
         if self.packed_kwargs is not None:
             packed_kwargs = {
-                key: passed_kwargs[key] for key in
-                list(passed_kwargs.keys())[self.num_normal_keywords-1:]
-            }
-            passed_kwargs = {
-                key: passed_kwargs[key] for key in
-                list(passed_kwargs.keys())[:self.num_normal_keywords-1]
+                key: value for key, value in passed_kwargs.items()
+                if key not in self.keyword_names
             }
 
         for i, arg in enumerate(self.args):
@@ -192,53 +380,174 @@ class Enforcer:
 
             try:
                 arg.validator.validate(None, None, value)
-            except TraitError:
-                msg = (
-                    "The {!r} parameter of {!r} must be {!r}, "
-                    "but a value of {!r} {!r} was specified."
-                )
-                raise ParameterTypeError(
-                    msg.format(
-                        arg.name, self.func.__name__, arg.type, value, type(value))
-                ) from None
+            except _hints.VALIDATION_ERRORS as error:
+                raise self._parameter_error(arg, value, error) from None
 
         if self.packed_args is not None:
             for value in packed_args:
                 try:
                     self.packed_args.validator.validate(None, None, value)
-                except TraitError:
-                    msg = (
-                        "The {!r} parameters of {!r} must be {!r}, "
-                        "but a value of {!r} {!r} was specified."
-                    )
-                    raise ParameterTypeError(
-                        msg.format(
-                            self.packed_args.name,
-                            self.func.__name__,
-                            self.packed_args.type,
-                            value,
-                            type(value)
-                        )
-                    ) from None
+                except _hints.VALIDATION_ERRORS as error:
+                    raise self._packed_args_error(value, error) from None
         if self.packed_kwargs is not None:
             for key, value in packed_kwargs.items():
                 try:
                     self.packed_kwargs.validator.validate(None, None, value)
-                except TraitError:
-                    msg = (
-                        "The {!r} keywords of {!r} must have values of type "
-                        "{!r}, but {!r}:{!r} {!r} was specified."
-                    )
-                    raise ParameterTypeError(
-                        msg.format(
-                            self.packed_kwargs.name,
-                            self.func.__name__,
-                            self.packed_kwargs.type,
-                            key,
-                            value,
-                            type(value),
-                        )
-                    ) from None
+                except _hints.VALIDATION_ERRORS:
+                    raise self._packed_kwargs_error(key, value) from None
+
+    def coerce_args(self, passed_args, passed_kwargs):
+        """
+        Validate input args to a function, and convert them to the values
+        returned by their validators, e.g. arrays for ``Array`` hints.
+
+        Default values are validated, but not converted.
+
+        Parameters
+        ----------
+        passed_args : list
+            List of args passed to the function
+        passed_kwargs : dict
+            Dict of kwargs passed to the function
+
+        Returns
+        -------
+        args : list
+            The converted args
+        kwargs : dict
+            The converted kwargs
+
+        Raises
+        ------
+        ParameterTypeError
+            If an input parameter is not valid based on is type hint
+        """
+        if _metrics.enabled:
+            _metrics.record_call(self.label)
+
+        args = list(passed_args)
+        kwargs = dict(passed_kwargs)
+
+        # Position of the first arg after the ignored self-reference
+        offset = 0
+        if (self.ignored_self_name is not None
+                and self.ignored_self_name not in kwargs):
+            offset = 1
+        num_passed = len(args) - offset
+        if self.packed_args is not None:
+            num_passed = min(num_passed, self.packed_args_pos)
+
+        for i, arg in enumerate(self.args):
+            if arg.type is UNSPECIFIED:
+                continue
+
+            if i < num_passed:
+                value = args[offset + i]
+            elif arg.name in kwargs:
+                value = kwargs[arg.name]
+            elif arg.name in self.default_kwargs:
+                value = self.default_kwargs[arg.name]
+            else:
+                continue
+
+            try:
+                coerced = arg.validator.validate(None, None, value)
+            except _hints.VALIDATION_ERRORS as error:
+                raise self._parameter_error(arg, value, error) from None
+            if i < num_passed:
+                args[offset + i] = coerced
+            elif arg.name in kwargs:
+                kwargs[arg.name] = coerced
+
+        if self.packed_args is not None:
+            validate = self.packed_args.validator.validate
+            for i in range(offset + self.packed_args_pos, len(args)):
+                try:
+                    args[i] = validate(None, None, args[i])
+                except _hints.VALIDATION_ERRORS as error:
+                    raise self._packed_args_error(args[i], error) from None
+        if self.packed_kwargs is not None:
+            validate = self.packed_kwargs.validator.validate
+            for key, value in kwargs.items():
+                if (key in self.keyword_names
+                        or key == self.ignored_self_name):
+                    continue
+                try:
+                    kwargs[key] = validate(None, None, value)
+                except _hints.VALIDATION_ERRORS:
+                    raise self._packed_kwargs_error(key, value) from None
+
+        return args, kwargs
+
+    def accepts_args(self, passed_args, passed_kwargs):
+        """
+        Check whether input args are valid for the function, without raising
+        or recording violations.
+
+        Parameters
+        ----------
+        passed_args : list
+            List of args passed to the function
+        passed_kwargs : dict
+            Dict of kwargs passed to the function
+
+        Returns
+        -------
+        bool
+            Whether all args are valid based on their type hints
+        """
+        if self.ignored_self_name is not None:
+            if self.ignored_self_name in passed_kwargs:
+                passed_kwargs = {
+                    k: v for k, v in passed_kwargs.items()
+                    if k != self.ignored_self_name
+                }
+            else:
+                passed_args = passed_args[1:]
+
+        try:
+            if self.packed_args_pos is not None:
+                if self.packed_args is not None:
+                    validate = self.packed_args.validator.validate
+                    for value in passed_args[self.packed_args_pos:]:
+                        validate(None, None, value)
+                passed_args = passed_args[:self.packed_args_pos]
+            elif len(passed_args) > self.num_positional:
+                return False
+
+            for key, value in passed_kwargs.items():
+                if key in self.keyword_names:
+                    continue
+                if not self.has_packed_kwargs:
+                    return False
+                if self.packed_kwargs is not None:
+                    self.packed_kwargs.validator.validate(None, None, value)
+
+            for i, arg in enumerate(self.args):
+                if (i >= len(passed_args)
+                        and arg.name not in passed_kwargs
+                        and arg.name not in self.default_kwargs):
+                    # A required argument is missing
+                    return False
+        except _hints.VALIDATION_ERRORS:
+            return False
+
+        # Cheap and often failing checks first
+        for i, arg in self.checks:
+            if i < len(passed_args):
+                value = passed_args[i]
+            elif arg.name in passed_kwargs:
+                value = passed_kwargs[arg.name]
+            else:
+                value = self.default_kwargs[arg.name]
+            try:
+                arg.validator.validate(None, None, value)
+            except _hints.VALIDATION_ERRORS:
+                if self.adaptive_order and arg.failures < MAX_FAILURES:
+                    arg.failures += 1
+                    self.checks = _check_order(self.args)
+                return False
+        return True
 
     def verify_result(self, value):
         """
@@ -261,23 +570,280 @@ class Enforcer:
 
         try:
             self.result_validator.validate(None, None, value)
-        except TraitError:
-            msg = (
-                "The return type of {!r} must be {!r}, "
-                "but a value of {!r} {!r} was returned."
+        except _hints.VALIDATION_ERRORS as error:
+            raise self._return_error(value, error) from None
+
+    def coerce_result(self, value):
+        """
+        Validate the return value of the function call, and convert it to
+        the value returned by its validator.
+
+        Parameters
+        ----------
+        value : Any
+            The return value of the function
+
+        Returns
+        -------
+        Any
+            The converted return value
+
+        Raises
+        ------
+        ReturnTypeError
+            As for ``verify_result``
+        """
+        if self.returns is UNSPECIFIED:
+            return value
+
+        try:
+            return self.result_validator.validate(None, None, value)
+        except _hints.VALIDATION_ERRORS as error:
+            raise self._return_error(value, error) from None
+
+    def _parameter_error(self, arg, value, error):
+        self._record_violation(arg.name, value)
+        msg = "The {!r} parameter of {!r} must be {!r}, but {}."
+        return ParameterTypeError(
+            msg.format(
+                arg.name,
+                self.func.__name__,
+                arg.type,
+                _describe_invalid(error, value, "specified"),
+            )
+        )
+
+    def _packed_args_error(self, value, error):
+        self._record_violation(self.packed_args.name, value)
+        msg = "The {!r} parameters of {!r} must be {!r}, but {}."
+        return ParameterTypeError(
+            msg.format(
+                self.packed_args.name,
+                self.func.__name__,
+                self.packed_args.type,
+                _describe_invalid(error, value, "specified"),
+            )
+        )
+
+    def _packed_kwargs_error(self, key, value):
+        self._record_violation(self.packed_kwargs.name, value)
+        msg = (
+            "The {!r} keywords of {!r} must have values of type "
+            "{!r}, but {!r}:{!r} {!r} was specified."
+        )
+        return ParameterTypeError(
+            msg.format(
+                self.packed_kwargs.name,
+                self.func.__name__,
+                self.packed_kwargs.type,
+                key,
+                value,
+                type(value),
             )
-            exception = ReturnTypeError(
-                msg.format(self.func.__name__, self.returns, value, type(value)))
-            exception.return_value = value
-            raise exception from None
+        )
+
+    def _return_error(self, value, error):
+        self._record_violation(_metrics.RETURN_LABEL, value)
+        msg = "The return type of {!r} must be {!r}, but {}."
+        exception = ReturnTypeError(
+            msg.format(
+                self.func.__name__,
+                self.returns,
+                _describe_invalid(error, value, "returned"),
+            )
+        )
+        exception.return_value = value
+        return exception
+
+    def _record_violation(self, name, value):
+        if _metrics.enabled:
+            _metrics.record_violation(self.label, name, value)
+
+
+def _describe_invalid(error, value, verb):
+    """
+    Describe an invalid value for an error message. Errors within containers
+    describe the invalid item and its path, e.g. ``['users'][1]['id']``,
+    rather than the whole value.
+    """
+    path = getattr(error, "path", ())
+    if not path:
+        return "a value of {!r} {!r} was {}".format(value, type(value), verb)
 
+    location = "".join("[{!r}]".format(key) for key in path)
+    if error.value is _hints.MISSING:
+        return "the item at {} is missing".format(location)
+    return "the item at {} was {!r} {!r}".format(
+        location, error.value, type(error.value))
 
-class FunctionSignature(HasTraits):
-    pass
+
+def _signature_layout(func):
+    """
+    Get the parameter layout of a function.
+
+    This is read directly from the code object of plain functions, which is
+    much faster than ``inspect.signature``.
+
+    Returns
+    -------
+    names : list of str
+        Names of the parameters, excluding packed parameters
+    num_positional_only : int
+        Number of parameters that can only be passed positionally
+    num_positional : int
+        Number of parameters that can be passed positionally
+    packed_args_name : str or None
+        Name of the packed positional parameter, if any
+    packed_kwargs_name : str or None
+        Name of the packed keyword parameter, if any
+    default_kwargs : dict
+        Default values of parameters
+    """
+    # Bound methods and other callables forward the code object of the
+    # function they wrap, whose parameters differ from theirs
+    if type(func) is not FunctionType or hasattr(func, "__wrapped__"):
+        return _inspect_signature_layout(func)
+    code = func.__code__
+
+    num_positional = code.co_argcount
+    num_names = num_positional + code.co_kwonlyargcount
+    names = list(code.co_varnames[:num_names])
+
+    packed_args_name = None
+    packed_kwargs_name = None
+    if code.co_flags & CO_VARARGS:
+        packed_args_name = code.co_varnames[num_names]
+        num_names += 1
+    if code.co_flags & CO_VARKEYWORDS:
+        packed_kwargs_name = code.co_varnames[num_names]
+
+    return (
+        names,
+        getattr(code, "co_posonlyargcount", 0),
+        num_positional,
+        packed_args_name,
+        packed_kwargs_name,
+        _default_kwargs(func),
+    )
+
+
+def _inspect_signature_layout(func):
+    import inspect
+
+    names = []
+    num_positional_only = 0
+    num_positional = 0
+    packed_args_name = None
+    packed_kwargs_name = None
+    default_kwargs = {}
+    for name, param in inspect.signature(func).parameters.items():
+        if param.kind == inspect.Parameter.VAR_POSITIONAL:
+            packed_args_name = name
+            continue
+        if param.kind == inspect.Parameter.VAR_KEYWORD:
+            packed_kwargs_name = name
+            continue
+        names.append(name)
+        if param.kind == inspect.Parameter.POSITIONAL_ONLY:
+            num_positional_only += 1
+        if param.kind != inspect.Parameter.KEYWORD_ONLY:
+            num_positional += 1
+        if param.default is not inspect.Parameter.empty:
+            default_kwargs[name] = param.default
+    return (
+        names,
+        num_positional_only,
+        num_positional,
+        packed_args_name,
+        packed_kwargs_name,
+        default_kwargs,
+    )
+
+
+def _module_globals(func):
+    namespace = getattr(func, "__globals__", None)
+    if namespace is None or hasattr(func, "__wrapped__"):
+        # Wrappers copy their module and annotations from the wrapped
+        # function, but have the globals of the decorator's module
+        module = sys.modules.get(getattr(func, "__module__", None))
+        namespace = vars(module) if module is not None else {}
+    return namespace
+
+
+def _closure_variables(func):
+    """
+    Get the variables of the closure of a function, or of the function it
+    wraps, or None if it has no closure.
+    """
+    for _ in range(100):  # Guard against cycles of __wrapped__
+        wrapped = getattr(func, "__wrapped__", None)
+        if wrapped is None:
+            break
+        func = wrapped
+    func = getattr(func, "__func__", func)
+    closure = getattr(func, "__closure__", None)
+    if not closure:
+        return None
+    return _ClosureVariables(func.__code__.co_freevars, closure)
+
+
+class _ClosureVariables(Mapping):
+    """
+    Read-only mapping of the variables of a closure, with their current
+    values, so that variables assigned after the function is created are
+    found.
+    """
+    def __init__(self, names, cells):
+        self._cells = dict(zip(names, cells))
+
+    def __getitem__(self, name):
+        try:
+            return self._cells[name].cell_contents
+        except ValueError:  # Empty cell
+            raise KeyError(name) from None
+
+    def __iter__(self):
+        return iter(self._cells)
+
+    def __len__(self):
+        return len(self._cells)
+
+
+def _default_kwargs(func):
+    code = func.__code__
+    default_kwargs = {}
+    if func.__defaults__:
+        names = code.co_varnames[:code.co_argcount]
+        default_kwargs.update(
+            zip(names[-len(func.__defaults__):], func.__defaults__))
+    if func.__kwdefaults__:
+        default_kwargs.update(func.__kwdefaults__)
+    return default_kwargs
+
+
+def _check_order(args):
+    """
+    Order the parameters with type hints by the estimated cost of their
+    checks, divided by the number of times they failed plus one. Ties are
+    kept in declaration order.
+    """
+    checks = [
+        (i, arg) for i, arg in enumerate(args) if arg.type is not UNSPECIFIED]
+    checks.sort(
+        key=lambda check: (
+            _hints.validation_cost(check[1].validator)
+            / (check[1].failures + 1)
+        )
+    )
+    return checks
 
 
 class Arg:
+    __slots__ = ("name", "type", "validator", "failures")
+
     def __init__(self, name, type):
         self.name = name
         self.type = type
         self.validator = None
+        #: Number of times the check of the parameter failed, if counted
+        self.failures = 0
@@ -0,0 +1,399 @@
+import sys
+import types
+import warnings
+import weakref
+
+from typen.exceptions import (
+    UnresolvedTypeHintError,
+    UnresolvedTypeHintWarning,
+)
+
+
+class ValidationError(Exception):
+    """
+    Raised by typen's own validators when a value is invalid.
+
+    Errors within a container, such as an item of a list or schema, have the
+    ``path`` of keys and indices from the container to the invalid ``value``.
+    """
+    path = ()
+    value = None
+
+
+class _Missing:
+    def __repr__(self):
+        return "<missing>"
+
+
+#: Value of a ``ValidationError`` for a required key that is missing
+MISSING = _Missing()
+
+
+#: Exceptions raised by validators when a value is invalid. ``TraitError``
+#: is added once Traits has been imported to build a trait validator.
+VALIDATION_ERRORS = (ValidationError,)
+
+#: Estimated relative cost of validating a value with a validator that has
+#: no ``cost`` attribute, such as a trait
+TRAIT_COST = 10
+
+#: Estimated relative cost of validating a collection, whose actual cost
+#: depends on its length
+COLLECTION_COST = 100
+
+#: Maximum number of types whose results a validator or dispatcher caches.
+#: A full cache is emptied, so that it neither grows without bound nor keeps
+#: classes that are no longer used alive for long.
+TYPE_CACHE_SIZE = 256
+
+NoneType = type(None)
+
+# Classes that Traits validates with coercion rather than as instances, and
+# the types it accepts for them. Other classes also accept None.
+_COERCED_TYPES = {
+    str: (str,),
+    int: (int,),
+    float: (float, int),
+    complex: (complex, float, int),
+    list: (list,),
+    tuple: (tuple,),
+    dict: (dict,),
+    types.FunctionType: (types.FunctionType,),
+    types.MethodType: (types.MethodType,),
+    type: (type,),
+    NoneType: (NoneType,),
+}
+
+
+# Modules defining the types of typing hints, e.g. List[int] or int | None
+_TYPING_MODULES = frozenset(["typing", "typing_extensions", "types"])
+
+# String hints, e.g. from postponed evaluation of annotations, resolved in
+# the globals of modules. Keyed by module name and expression, with a weak
+# reference to the module, as modules can be replaced, e.g. when reloaded.
+_resolved_hints = {}
+
+# Validators of plain class hints are immutable, so they are shared by all
+# enforcers in the process. Only classes defined at module level are kept,
+# so that locally created classes can be garbage collected.
+_class_validators = {}
+
+
+class TraitCache:
+    """
+    Build validators for type hints, sharing one validator between all
+    identical hints.
+
+    Plain classes and ``None`` are validated natively, with the same rules as
+    Traits, as are ``typing`` hints such as ``List[int]``. Traits is only
+    imported once another kind of hint is used.
+    Hints that can't be hashed get a validator of their own.
+
+    String hints, as with ``from __future__ import annotations``, and
+    forward references within ``typing`` hints, such as ``List["Node"]``,
+    are resolved in the globals of the function's module and the variables
+    of its closure. Names that aren't defined yet, e.g. the class a method
+    is being defined in, are resolved when the first value is validated.
+    """
+    def __init__(self):
+        self._validators = {}
+
+    def validator(self, hint, namespace=None, localns=None):
+        """
+        Get a validator for a type hint.
+
+        Parameters
+        ----------
+        hint : Any
+            A type hint that is a class, ``None``, a ``typing`` hint or a
+            trait definition, or a string expression of one
+        namespace : dict, optional
+            Globals of the function's module, in which string hints are
+            resolved
+        localns : dict, optional
+            Variables of the function's closure, which take precedence over
+            the globals
+
+        Returns
+        -------
+        validator
+            An object whose ``validate(object, name, value)`` method returns
+            the value if it is valid, and otherwise raises one of
+            ``VALIDATION_ERRORS``
+        """
+        if isinstance(hint, str):
+            try:
+                hint = resolve_hint(hint, namespace, localns)
+            except UnresolvedTypeHintError:
+                return LazyValidator(hint, namespace, localns)
+
+        if has_forward_ref(hint):
+            # Depends on the namespace
+            return compile_hint(hint, namespace, localns)
+
+        try:
+            return self._validators[hint]
+        except KeyError:
+            validator = self._validators[hint] = compile_hint(hint)
+        except TypeError:
+            validator = compile_hint(hint)
+        return validator
+
+
+def compile_hint(hint, namespace=None, localns=None):
+    """
+    Build a validator for a type hint. See ``TraitCache.validator``.
+
+    Validators of ``None``, plain classes defined at module level and
+    ``typing`` hints without forward references are built once per process
+    and shared.
+    """
+    if hint is None:
+        hint = NoneType
+
+    # NewType hints are validated as their supertype
+    while _is_new_type(hint):
+        hint = hint.__supertype__
+
+    if is_typing_hint(hint):
+        from typen._typing import compile_typing_hint
+        validator = compile_typing_hint(hint, namespace, localns)
+        if validator is not None:
+            return validator
+
+    if isinstance(hint, type):
+        try:
+            return _class_validators[hint]
+        except KeyError:
+            pass
+
+        if not is_trait_class(hint):
+            if hint in _COERCED_TYPES:
+                validator = InstanceValidator(
+                    _COERCED_TYPES[hint], allow_none=False)
+            else:
+                validator = InstanceValidator((hint,), allow_none=True)
+            if "<locals>" not in hint.__qualname__:
+                _class_validators[hint] = validator
+            return validator
+
+    return _trait_for(hint)
+
+
+def resolve_hint(expression, namespace, localns=None):
+    """
+    Resolve a string type hint in the globals of a module, and optionally
+    the variables of a function's closure.
+
+    Hints resolved in the globals of an imported module alone are cached
+    for each module and expression, so each is only evaluated once.
+
+    Raises
+    ------
+    UnresolvedTypeHintError
+        If the hint refers to a name that isn't defined
+    """
+    if namespace is None:
+        namespace = {}
+    name = namespace.get("__name__")
+    module = sys.modules.get(name)
+    cacheable = (
+        module is not None and vars(module) is namespace and not localns)
+
+    key = (name, expression)
+    if cacheable:
+        try:
+            module_ref, hint = _resolved_hints[key]
+        except KeyError:
+            pass
+        else:
+            if module_ref() is module:
+                return hint
+
+    try:
+        hint = eval(expression, namespace, localns)
+    except NameError as error:
+        msg = "Can't resolve type hint {!r}: {}"
+        raise UnresolvedTypeHintError(msg.format(expression, error)) from None
+
+    if cacheable:
+        _resolved_hints[key] = (weakref.ref(module), hint)
+    return hint
+
+
+def has_forward_ref(hint):
+    """
+    Whether a hint is a string, or a ``typing`` hint that may contain
+    forward references, whose validators depend on the namespace.
+    """
+    if isinstance(hint, str):
+        return True
+    if not is_typing_hint(hint):
+        return False
+    if type(hint).__name__ == "ForwardRef":
+        return True
+    try:
+        args = hint.__args__
+    except AttributeError:
+        return False
+    # Literal strings are counted too, which only prevents caching
+    return any(has_forward_ref(arg) for arg in args or ())
+
+
+class LazyValidator:
+    """
+    Validator of a string hint that is resolved when the first value is
+    validated, e.g. because it refers to a class that is defined later.
+
+    If the hint still can't be resolved once its module has been imported,
+    e.g. because it names a class local to another function, an
+    ``UnresolvedTypeHintWarning`` is issued and no values are validated
+    against it. Within a module being imported, an
+    ``UnresolvedTypeHintError`` is raised instead, as the name may still be
+    defined.
+    """
+    __slots__ = ("expression", "namespace", "localns", "nested", "validator")
+
+    def __init__(self, expression, namespace, localns=None, nested=False):
+        self.expression = expression
+        self.namespace = {} if namespace is None else namespace
+        self.localns = localns
+        #: Whether the hint is within a ``typing`` hint, so that classes
+        #: don't accept None
+        self.nested = nested
+        self.validator = None
+
+    @property
+    def cost(self):
+        if self.validator is None:
+            return TRAIT_COST
+        return validation_cost(self.validator)
+
+    def validate(self, object, name, value):
+        validator = self.validator
+        if validator is None:
+            namespace = self.namespace
+            if namespace is None:
+                # Resolved by another thread since reading the validator
+                validator = self.validator
+            else:
+                validator = self.validator = self._resolve(namespace)
+                self.namespace = self.localns = None
+        return validator.validate(object, name, value)
+
+    def _resolve(self, namespace):
+        try:
+            hint = resolve_hint(self.expression, namespace, self.localns)
+        except UnresolvedTypeHintError as error:
+            if _importing(namespace):
+                raise
+            msg = "{} Values aren't validated against it.".format(error)
+            warnings.warn(msg, UnresolvedTypeHintWarning, stacklevel=4)
+            from typen._typing import AnyValidator
+            return AnyValidator()
+        if self.nested:
+            from typen._typing import _compile_arg
+            return _compile_arg(hint, namespace, self.localns)
+        return compile_hint(hint, namespace, self.localns)
+
+
+def _importing(namespace):
+    """
+    Whether the module with some globals is being imported.
+    """
+    module = sys.modules.get(namespace.get("__name__"))
+    if module is None or vars(module) is not namespace:
+        return False
+    spec = getattr(module, "__spec__", None)
+    return bool(getattr(spec, "_initializing", False))
+
+
+class InstanceValidator:
+    """
+    Validate that values are instances of some types, and optionally None.
+    """
+    __slots__ = ("types", "allow_none")
+
+    cost = 1
+
+    def __init__(self, types, allow_none):
+        self.types = types
+        self.allow_none = allow_none
+
+    def validate(self, object, name, value):
+        if isinstance(value, self.types):
+            return value
+        if value is None and self.allow_none:
+            return value
+        raise ValidationError()
+
+
+def validation_cost(validator):
+    """
+    Estimate the relative cost of validating a value with a validator, e.g.
+    1 for an isinstance check.
+    """
+    # Traits return None for undefined attributes
+    cost = getattr(validator, "cost", None)
+    return TRAIT_COST if cost is None else cost
+
+
+def cache_type_result(cache, key, result):
+    """
+    Store the result for a type, or tuple of types, in a per-type cache.
+
+    The cache is emptied first if it holds ``TYPE_CACHE_SIZE`` results.
+    Both changes are single dict operations, so threads reading the cache
+    at the same time see either the old or the new content.
+
+    Parameters
+    ----------
+    cache : dict
+        The cache
+    key : Hashable
+        The type or tuple of types
+    result : Any
+        The result for the key
+    """
+    if len(cache) >= TYPE_CACHE_SIZE:
+        cache.clear()
+    cache[key] = result
+
+
+def is_typing_hint(hint):
+    """
+    Whether a hint is a ``typing`` construct, rather than a plain class or
+    trait.
+    """
+    return type(hint).__module__ in _TYPING_MODULES
+
+
+def _is_new_type(hint):
+    # Functions before Python 3.10. Traits return None for any attribute.
+    return (
+        type(hint).__module__ in _TYPING_MODULES
+        or isinstance(hint, types.FunctionType)
+    ) and getattr(hint, "__supertype__", None) is not None
+
+
+def is_trait_class(cls):
+    # Trait type classes can only exist once Traits has been imported
+    trait_type = sys.modules.get("traits.trait_type")
+    if trait_type is not None and issubclass(cls, trait_type.TraitType):
+        return True
+    return hasattr(cls, "as_ctrait")
+
+
+def _trait_for(hint):
+    global VALIDATION_ERRORS
+
+    from traits.api import TraitError
+    try:
+        from traits.trait_converters import trait_for
+    except ImportError:  # Traits < 6.1
+        from traits.traits import trait_for
+
+    VALIDATION_ERRORS = (ValidationError, TraitError)
+
+    from typen._lowering import lower_trait
+    return lower_trait(trait_for(hint))
@@ -0,0 +1,219 @@
+import sys
+from fnmatch import fnmatchcase
+from functools import wraps
+from types import FunctionType
+
+from typen._decorators import EnforceTypeHints
+
+#: Validate every call
+ENFORCE = "enforce"
+
+#: Validate one in every ``sample_every`` calls
+SAMPLE = "sample"
+
+#: Leave imported modules unchanged
+DISABLED = "disabled"
+
+MODES = (ENFORCE, SAMPLE, DISABLED)
+
+
+def install_import_hook(
+        include,
+        exclude=(),
+        mode=ENFORCE,
+        sample_every=100,
+        strict=False):
+    """
+    Enforce type hints on all annotated functions and methods of modules
+    that are imported from now on.
+
+    Enforcers are only built when each function is first called, so import
+    time isn't increased by analysing signatures.
+
+    Parameters
+    ----------
+    include : list of str
+        Glob patterns of module names to enforce, e.g. ``["mypackage.*"]``
+    exclude : list of str
+        Glob patterns of module names not to enforce, even if included
+    mode : str
+        ``"enforce"`` to validate every call, ``"sample"`` to validate one in
+        every ``sample_every`` calls, or ``"disabled"`` to leave modules
+        unchanged
+    sample_every : int
+        How often calls are validated in ``"sample"`` mode
+    strict : bool
+        Require type hints on all parameters and return values of annotated
+        functions
+
+    Returns
+    -------
+    TypenImportHook
+        The installed hook. Call its ``uninstall`` method to remove it.
+    """
+    hook = TypenImportHook(
+        include,
+        exclude=exclude,
+        mode=mode,
+        sample_every=sample_every,
+        strict=strict,
+    )
+    sys.meta_path.insert(0, hook)
+    return hook
+
+
+def enforce_module_type_hints(module, sample_every=1, strict=False):
+    """
+    Enforce type hints on all annotated functions and methods defined in an
+    already imported module.
+
+    Functions are replaced by wrappers with their name, docstring and
+    signature, so that they can still be inspected and pickled. The
+    ``EnforceTypeHints`` object of a wrapper is its ``_typen_hints``
+    attribute.
+
+    Parameters
+    ----------
+    module : module
+        The module to enforce
+    sample_every : int
+        Validate one in every this many calls
+    strict : bool
+        Require type hints on all parameters and return values of annotated
+        functions
+    """
+    def enforce(func, ignore_self):
+        hints = EnforceTypeHints(
+            func,
+            require_args=strict,
+            require_return=strict,
+            ignore_self=ignore_self,
+            sample_every=sample_every,
+        )
+
+        @wraps(func)
+        def checked(*args, **kwargs):
+            return hints(*args, **kwargs)
+
+        checked.unchecked = func
+        checked._typen_hints = hints
+        return checked
+
+    for name, value in list(vars(module).items()):
+        if _is_hinted(value, module):
+            setattr(module, name, enforce(value, ignore_self=False))
+        elif isinstance(value, type) and value.__module__ == module.__name__:
+            _enforce_class(value, module, enforce)
+
+
+class TypenImportHook:
+    """
+    Meta path finder that enforces type hints on matching modules as they
+    are imported. See ``install_import_hook``.
+    """
+    def __init__(
+            self,
+            include,
+            exclude=(),
+            mode=ENFORCE,
+            sample_every=100,
+            strict=False):
+        if mode not in MODES:
+            msg = "mode must be one of {!r}, not {!r}."
+            raise ValueError(msg.format(MODES, mode))
+        if isinstance(include, str):
+            include = [include]
+        if isinstance(exclude, str):
+            exclude = [exclude]
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.mode = mode
+        self.sample_every = sample_every if mode == SAMPLE else 1
+        self.strict = strict
+
+    def matches(self, fullname):
+        """
+        Whether the named module should have type hints enforced.
+        """
+        return (
+            any(fnmatchcase(fullname, pattern) for pattern in self.include)
+            and not any(
+                fnmatchcase(fullname, pattern) for pattern in self.exclude)
+        )
+
+    def find_spec(self, fullname, path, target=None):
+        if self.mode == DISABLED or not self.matches(fullname):
+            return None
+
+        # Find the module with the remaining finders, then wrap its loader
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if not hasattr(spec.loader, "exec_module"):
+            return spec
+
+        spec.loader = _EnforcingLoader(spec.loader, self)
+        return spec
+
+    def uninstall(self):
+        """
+        Stop enforcing type hints on newly imported modules. Modules that
+        were already imported keep their enforcement.
+        """
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+
+class _EnforcingLoader:
+    def __init__(self, loader, hook):
+        self._loader = loader
+        self._hook = hook
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._loader.exec_module(module)
+        enforce_module_type_hints(
+            module,
+            sample_every=self._hook.sample_every,
+            strict=self._hook.strict,
+        )
+
+
+def _is_hinted(value, module):
+    return (
+        isinstance(value, FunctionType)
+        and value.__module__ == module.__name__
+        and bool(value.__annotations__)
+        and not hasattr(value, "_typen_enforcer")
+        and not hasattr(value, "_typen_hints")
+    )
+
+
+def _enforce_class(cls, module, enforce):
+    for name, value in list(vars(cls).items()):
+        if _is_hinted(value, module):
+            new_value = enforce(value, ignore_self=True)
+        elif isinstance(value, staticmethod):
+            if not _is_hinted(value.__func__, module):
+                continue
+            # __new__ is an implicit static method that takes the class
+            new_value = staticmethod(
+                enforce(value.__func__, name == "__new__"))
+        elif isinstance(value, classmethod):
+            if not _is_hinted(value.__func__, module):
+                continue
+            new_value = classmethod(enforce(value.__func__, True))
+        else:
+            continue
+        setattr(cls, name, new_value)
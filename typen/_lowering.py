@@ -0,0 +1,235 @@
+import operator
+
+from typen._hints import InstanceValidator, ValidationError
+from typen._typing import union_validator
+
+# Kinds of the validation specifications of CTraits, as in traits.ctraits
+TYPE = 0
+INSTANCE = 1
+FLOAT_RANGE = 4
+ENUM = 5
+COMPLEX = 7
+COERCE = 11
+INT = 20
+FLOAT = 21
+
+# Bits of the exclusion mask of range specifications
+EXCLUDE_LOW = 1
+EXCLUDE_HIGH = 2
+
+
+def lower_trait(ctrait):
+    """
+    Lower a trait to a specialised native validator, if it is a composite or
+    simple trait whose validation can be reproduced exactly.
+
+    Traits validate through generic handler dispatch. Common traits are
+    instead validated with e.g. a lookup of the exact type of values for
+    ``Either(Str, Int)``, a frozenset lookup for ``Enum`` values and direct
+    comparisons for ``Range``. ``Tuple`` traits are left to Traits, whose C
+    validation of their items is faster than validating each item in
+    Python.
+
+    Parameters
+    ----------
+    ctrait : CTrait
+        The trait to lower
+
+    Returns
+    -------
+    validator
+        A native validator, or the trait itself if it can't be lowered
+    """
+    validator = _lower_validate(ctrait.get_validate())
+    return ctrait if validator is None else validator
+
+
+def _lower_validate(validate):
+    if isinstance(validate, tuple):
+        return _lower_spec(validate)
+
+    # Python level validation by a trait type handler
+    handler = getattr(validate, "__self__", None)
+    if handler is None:
+        return None
+
+    if getattr(handler, "_validate", None) == "int_validate":
+        return _lower_int_range(handler)
+
+    ctraits = getattr(handler, "list_ctrait_instances", None)
+    if ctraits is not None and type(handler).__name__ == "Union":
+        # Items that can't be lowered are validated by their trait
+        return union_validator([lower_trait(ctrait) for ctrait in ctraits])
+
+    return None
+
+
+def _lower_spec(spec):
+    kind = spec[0]
+
+    if kind in (TYPE, INSTANCE):
+        allow_none = len(spec) == 3 and spec[1] is None
+        types = spec[-1]
+        if not isinstance(types, tuple):
+            types = (types,)
+        return InstanceValidator(types, allow_none=allow_none)
+
+    if kind == COERCE:
+        types = tuple(t for t in spec[1:] if t is not None)
+        return InstanceValidator(types, allow_none=False)
+
+    if kind == INT:
+        return IntValidator()
+
+    if kind == FLOAT:
+        return FloatValidator()
+
+    if kind == FLOAT_RANGE:
+        _, low, high, exclude = spec
+        return RangeValidator(
+            _as_float,
+            low,
+            high,
+            bool(exclude & EXCLUDE_LOW),
+            bool(exclude & EXCLUDE_HIGH),
+        )
+
+    if kind == ENUM:
+        return EnumValidator(spec[1])
+
+    if kind == COMPLEX:
+        validators = [_lower_spec(item) for item in spec[1]]
+        if None in validators:
+            return None
+        return union_validator(validators)
+
+    return None
+
+
+def _lower_int_range(handler):
+    # Dynamic ranges have bounds named by other traits
+    if handler._low_name or handler._high_name:
+        return None
+    return RangeValidator(
+        _as_int,
+        handler._low,
+        handler._high,
+        handler._exclude_low,
+        handler._exclude_high,
+    )
+
+
+def _as_int(value):
+    if type(value) is int:
+        return value
+    try:
+        return int(operator.index(value))
+    except TypeError:
+        raise ValidationError() from None
+
+
+def _as_float(value):
+    if type(value) is float:
+        return value
+    # Only numbers are converted, as opposed to float("1")
+    cls = type(value)
+    if not (hasattr(cls, "__float__") or hasattr(cls, "__index__")):
+        raise ValidationError()
+    try:
+        return float(value)
+    except TypeError:
+        raise ValidationError() from None
+
+
+class IntValidator:
+    """
+    Validate values like the ``Int`` trait: ints and objects with an
+    ``__index__`` method.
+    """
+    __slots__ = ()
+
+    cost = 1
+
+    #: Types whose values are accepted unchanged, see ``UnionValidator``
+    exact_types = (int,)
+
+    def validate(self, object, name, value):
+        if type(value) is int:
+            return value
+        return _as_int(value)
+
+
+class FloatValidator:
+    """
+    Validate values like the ``Float`` trait: floats and objects that can be
+    converted to a float with ``__float__`` or ``__index__``.
+    """
+    __slots__ = ()
+
+    cost = 1
+
+    #: Types whose values are accepted unchanged, see ``UnionValidator``
+    exact_types = (float,)
+
+    def validate(self, object, name, value):
+        if type(value) is float:
+            return value
+        return _as_float(value)
+
+
+class RangeValidator:
+    """
+    Validate values like a static ``Range`` trait.
+    """
+    __slots__ = ("convert", "low", "high", "exclude_low", "exclude_high")
+
+    cost = 2
+
+    def __init__(self, convert, low, high, exclude_low, exclude_high):
+        self.convert = convert
+        self.low = low
+        self.high = high
+        self.exclude_low = exclude_low
+        self.exclude_high = exclude_high
+
+    def validate(self, object, name, value):
+        value = self.convert(value)
+        # As in Traits, NaN is in any float range
+        low = self.low
+        if low is not None:
+            if value < low or (self.exclude_low and value == low):
+                raise ValidationError()
+        high = self.high
+        if high is not None:
+            if value > high or (self.exclude_high and value == high):
+                raise ValidationError()
+        return value
+
+
+class EnumValidator:
+    """
+    Validate that values are equal to one of some values, like the ``Enum``
+    trait.
+    """
+    __slots__ = ("values", "hashed")
+
+    cost = 1
+
+    def __init__(self, values):
+        self.values = values
+        try:
+            self.hashed = frozenset(values)
+        except TypeError:
+            self.hashed = frozenset()
+
+    def validate(self, object, name, value):
+        try:
+            if value in self.hashed:
+                return value
+        except TypeError:  # Unhashable
+            pass
+        # Values that are equal without having equal hashes, or unhashable
+        # values, are compared with each value in turn
+        if value in self.values:
+            return value
+        raise ValidationError()
@@ -0,0 +1,184 @@
+import os
+import threading
+
+#: Whether enforcers should record counters. Checked on every validated call.
+enabled = False
+
+CALLS = "calls"
+PARAMETER_VIOLATIONS = "parameter_violations"
+TYPE_VIOLATIONS = "type_violations"
+
+#: Label used for the return value in violation counters
+RETURN_LABEL = "return"
+
+_METRICS = (
+    (
+        CALLS,
+        "typen_calls_validated_total",
+        "Number of function calls validated by typen.",
+        ("function",),
+    ),
+    (
+        PARAMETER_VIOLATIONS,
+        "typen_parameter_violations_total",
+        "Number of type hint violations by function and parameter.",
+        ("function", "parameter"),
+    ),
+    (
+        TYPE_VIOLATIONS,
+        "typen_type_violations_total",
+        "Number of type hint violations by offending value type.",
+        ("function", "parameter", "type"),
+    ),
+)
+
+# Each thread counts into its own shard, so no lock is taken when counting.
+# The lock only guards registration of new shards.
+_shards = []
+_shards_lock = threading.Lock()
+_local = threading.local()
+
+
+def enable_metrics():
+    """
+    Start counting validated calls and type hint violations.
+    """
+    global enabled
+    enabled = True
+
+
+def disable_metrics():
+    """
+    Stop counting validated calls and type hint violations. Existing counts
+    are kept until ``reset_metrics`` is called.
+    """
+    global enabled
+    enabled = False
+
+
+def reset_metrics():
+    """
+    Clear all recorded counters.
+    """
+    with _shards_lock:
+        for shard in _shards:
+            shard.clear()
+
+
+def record_call(function):
+    """
+    Count a validated call of the function with the given label.
+    """
+    shard = _get_shard()
+    key = (CALLS, function)
+    shard[key] = shard.get(key, 0) + 1
+
+
+def record_violation(function, parameter, value):
+    """
+    Count a type hint violation by the given value on the given parameter
+    of the function with the given label.
+    """
+    shard = _get_shard()
+    key = (PARAMETER_VIOLATIONS, function, parameter)
+    shard[key] = shard.get(key, 0) + 1
+    value_type = type(value)
+    key = (
+        TYPE_VIOLATIONS,
+        function,
+        parameter,
+        value_type.__module__ + "." + value_type.__qualname__,
+    )
+    shard[key] = shard.get(key, 0) + 1
+
+
+def collect_metrics():
+    """
+    Merge the counters recorded by all threads.
+
+    Returns
+    -------
+    dict
+        Mapping of counter keys to counts. The first element of each key is
+        the kind of counter, followed by its label values.
+    """
+    with _shards_lock:
+        shards = [shard.copy() for shard in _shards]
+
+    merged = {}
+    for shard in shards:
+        for key, count in shard.items():
+            merged[key] = merged.get(key, 0) + count
+    return merged
+
+
+def export_metrics(path=None):
+    """
+    Export the recorded counters in Prometheus text exposition format.
+
+    Parameters
+    ----------
+    path : str, optional
+        If given, the metrics are atomically written to this file, e.g. for
+        the node-exporter textfile collector.
+
+    Returns
+    -------
+    str
+        The exported metrics.
+    """
+    merged = collect_metrics()
+
+    lines = []
+    for kind, name, help_text, label_names in _METRICS:
+        lines.append("# HELP {} {}".format(name, help_text))
+        lines.append("# TYPE {} counter".format(name))
+        samples = sorted(
+            (key[1:], count) for key, count in merged.items()
+            if key[0] == kind
+        )
+        for label_values, count in samples:
+            labels = ",".join(
+                '{}="{}"'.format(label, _escape(value))
+                for label, value in zip(label_names, label_values)
+            )
+            lines.append("{}{{{}}} {}".format(name, labels, count))
+    text = "\n".join(lines) + "\n"
+
+    if path is not None:
+        _write_atomic(path, text)
+
+    return text
+
+
+def _get_shard():
+    try:
+        return _local.shard
+    except AttributeError:
+        shard = _local.shard = {}
+        with _shards_lock:
+            _shards.append(shard)
+        return shard
+
+
+def _escape(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _write_atomic(path, text):
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fh:
+            fh.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,195 @@
+import inspect
+
+#: Key used for the return value in observations
+RETURN = "return"
+
+NoneType = type(None)
+
+
+class TypeRecorder:
+    """
+    Record the concrete types passed to and returned from a function, in
+    order to suggest type hints based on live traffic.
+
+    Only every ``sample_every``-th call is observed, and observations are
+    counted per concrete type, so the recording overhead of unsampled calls
+    is a single counter decrement.
+
+    Parameters
+    ----------
+    sample_every : int
+        Observe one in this many calls
+    """
+    def __init__(self, sample_every=1):
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self.sample_every = sample_every
+        self.signature = None
+        self.ignored_self_name = None
+
+        #: Mapping of parameter name to the type of its default value
+        self.default_types = {}
+        self.num_sampled = 0
+
+        #: Mapping of parameter name to a mapping of observed types to
+        #: observation counts
+        self.observed = {}
+
+        self._countdown = 1
+
+    def bind(self, func, ignore_self=False):
+        """
+        Set the function whose calls are observed.
+
+        Parameters
+        ----------
+        func : Callable
+            The function that is being observed
+        ignore_self : bool
+            Don't observe the self-reference parameter of methods
+        """
+        self.signature = inspect.signature(func)
+        params = self.signature.parameters
+        self.observed = {name: {} for name in params}
+        self.observed[RETURN] = {}
+        self.default_types = {
+            name: type(param.default) for name, param in params.items()
+            if param.default is not param.empty
+        }
+        self.ignored_self_name = None
+        if ignore_self and params:
+            self.ignored_self_name = next(iter(params))
+            del self.observed[self.ignored_self_name]
+
+    def observe_args(self, args, kwargs):
+        """
+        Observe the types of the parameters of a call, if it is sampled.
+
+        Parameters
+        ----------
+        args : tuple
+            Args passed to the function
+        kwargs : dict
+            Kwargs passed to the function
+
+        Returns
+        -------
+        bool
+            Whether the call was sampled. The result of the call should only
+            be observed if it was.
+        """
+        self._countdown -= 1
+        if self._countdown > 0:
+            return False
+        self._countdown = self.sample_every
+
+        try:
+            bound = self.signature.bind(*args, **kwargs)
+        except TypeError:
+            # The call itself will fail
+            return False
+
+        self.num_sampled += 1
+        params = self.signature.parameters
+        for name, value in bound.arguments.items():
+            if name == self.ignored_self_name:
+                continue
+            kind = params[name].kind
+            if kind == inspect.Parameter.VAR_POSITIONAL:
+                for item in value:
+                    self._observe(name, item)
+            elif kind == inspect.Parameter.VAR_KEYWORD:
+                for item in value.values():
+                    self._observe(name, item)
+            else:
+                self._observe(name, value)
+        return True
+
+    def observe_result(self, value):
+        """
+        Observe the type of the return value of a sampled call.
+        """
+        self._observe(RETURN, value)
+
+    def suggest_hints(self):
+        """
+        Suggest type hints based on the observed types.
+
+        Returns
+        -------
+        dict
+            Mapping of parameter names, and ``"return"``, to suggested type
+            hints. Parameters that were never observed are omitted. A single
+            observed type is suggested as-is, and multiple observed types as
+            an ``Either`` trait, most common first. The type of the default
+            value of a parameter is always accepted, as it is validated too.
+        """
+        hints = {}
+        for name, counts in self.observed.items():
+            if not counts:
+                continue
+            hints[name] = _hint_for(self._types(name))
+        return hints
+
+    def suggested_signature(self):
+        """
+        Format the suggested type hints as a function signature.
+
+        Returns
+        -------
+        str
+            The signature with suggested hints, e.g.
+            ``"(a: int, b: Either(str, None)) -> float"``
+        """
+        counts = self.observed
+        parts = []
+        for name, param in self.signature.parameters.items():
+            if param.kind == inspect.Parameter.VAR_POSITIONAL:
+                formatted = "*" + name
+            elif param.kind == inspect.Parameter.VAR_KEYWORD:
+                formatted = "**" + name
+            else:
+                formatted = name
+            if counts.get(name):
+                formatted += ": " + _format_hint(self._types(name))
+            parts.append(formatted)
+
+        signature = "({})".format(", ".join(parts))
+        if counts[RETURN]:
+            signature += " -> " + _format_hint(self._types(RETURN))
+        return signature
+
+    def _types(self, name):
+        # Observed types, most common first, then the type of the default
+        counts = self.observed[name]
+        types = sorted(counts, key=counts.get, reverse=True)
+        default_type = self.default_types.get(name)
+        if default_type is not None and default_type not in counts:
+            types.append(default_type)
+        return types
+
+    def _observe(self, name, value):
+        counts = self.observed[name]
+        value_type = type(value)
+        counts[value_type] = counts.get(value_type, 0) + 1
+
+
+def _hint_for(types):
+    hints = [None if t is NoneType else t for t in types]
+    if len(hints) == 1:
+        return hints[0]
+
+    from traits.api import Either
+    return Either(*hints)
+
+
+def _format_hint(types):
+    names = [
+        "None" if t is NoneType else
+        t.__qualname__ if t.__module__ == "builtins" else
+        "{}.{}".format(t.__module__, t.__qualname__)
+        for t in types
+    ]
+    if len(names) == 1:
+        return names[0]
+    return "Either({})".format(", ".join(names))
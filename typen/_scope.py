@@ -0,0 +1,33 @@
+from contextvars import ContextVar
+
+#: Whether calls in the current context skip validation. Checked on every
+#: call of a decorated function.
+trusted = ContextVar("typen_trusted", default=False)
+
+
+def trusted_scope():
+    """
+    Context manager in which calls of decorated functions aren't validated.
+
+    This is meant for hot loops whose inputs have already been validated.
+    The scope only applies to the current thread or asyncio task, and to
+    tasks created within it.
+
+    Example
+    -------
+    >>> with trusted_scope():
+    ...     for row in rows:
+    ...         process(row)
+    """
+    return _TrustedScope()
+
+
+class _TrustedScope:
+    __slots__ = ("_token",)
+
+    def __enter__(self):
+        self._token = trusted.set(True)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        trusted.reset(self._token)
@@ -0,0 +1,703 @@
+import collections
+import collections.abc
+import sys
+import types
+import typing
+
+from typen import _hints
+from typen.constraints import Constraint
+from typen._hints import (
+    _COERCED_TYPES,
+    _is_new_type,
+    cache_type_result,
+    COLLECTION_COST,
+    InstanceValidator,
+    LazyValidator,
+    has_forward_ref,
+    MISSING,
+    NoneType,
+    resolve_hint,
+    validation_cost,
+    ValidationError,
+)
+from typen.exceptions import UnresolvedTypeHintError
+
+# Generic classes whose items are validated. Other generic classes, such as
+# iterators, are only validated with isinstance, as checking their items
+# could consume them.
+_COLLECTIONS = (
+    list,
+    set,
+    frozenset,
+    collections.deque,
+    collections.abc.Sequence,
+    collections.abc.MutableSequence,
+    collections.abc.Set,
+    collections.abc.MutableSet,
+)
+_MAPPINGS = (
+    dict,
+    collections.OrderedDict,
+    collections.defaultdict,
+    collections.abc.Mapping,
+    collections.abc.MutableMapping,
+)
+
+_UNION_TYPES = (typing.Union,)
+if hasattr(types, "UnionType"):  # Python >= 3.10
+    _UNION_TYPES += (types.UnionType,)
+
+_MISSING = object()
+
+_LITERAL = getattr(typing, "Literal", None)  # Python >= 3.8
+_FORWARD_REF = getattr(typing, "ForwardRef", None)  # Python >= 3.7
+_WRAPPERS = tuple(
+    getattr(typing, name, None)
+    for name in ["ClassVar", "Final", "Required", "NotRequired", "ReadOnly"]
+)
+
+# Attributes of protocol classes that aren't members of the protocol, as in
+# the typing module
+_PROTOCOL_SPECIAL_NAMES = frozenset([
+    "__abstractmethods__", "__annotations__", "__annotate__",
+    "__class_getitem__", "__dict__", "__doc__", "__firstlineno__",
+    "__init__", "__module__", "__new__", "__non_callable_proto_members__",
+    "__orig_bases__", "__parameters__", "__protocol_attrs__", "__qualname__",
+    "__slots__", "__static_attributes__", "__subclasshook__",
+    "__type_params__", "__weakref__", "_is_protocol", "_is_runtime_protocol",
+])
+
+# Translated hints, shared by all enforcers in the process. As with plain
+# classes, hints involving locally defined classes aren't kept, nor are
+# hints with forward references, which depend on the namespace.
+_typing_validators = {}
+
+# Validators of schemas whose fields are being compiled, so that recursive
+# schemas refer to their own validator
+_compiling_schemas = {}
+
+
+def compile_typing_hint(hint, namespace=None, localns=None):
+    """
+    Build a validator for a ``typing`` module hint, such as ``List[int]``,
+    ``Dict[str, float]``, ``Optional[X]``, ``Union[...]``, ``Tuple[...]``
+    or ``Literal[...]``.
+
+    Unlike bare class hints, which are validated like Traits ``Instance``
+    traits, classes within ``typing`` hints don't accept ``None`` unless it
+    is part of the hint, e.g. with ``Optional``.
+
+    ``Annotated`` hints are validated with their base type and the
+    ``typen.constraints.Constraint`` objects in their metadata. Other
+    metadata is ignored.
+
+    ``Protocol`` classes are validated structurally: values must provide
+    every attribute of the protocol, whether or not the protocol is
+    ``runtime_checkable``.
+
+    ``TypedDict`` classes are compiled to schema validators of dicts, which
+    check their required and optional keys. Errors within schemas, lists,
+    tuples and mappings have the path to the invalid item.
+
+    Forward references, e.g. ``Optional["Node"]``, are resolved in
+    ``namespace`` and ``localns`` as for string hints.
+
+    Returns
+    -------
+    validator or None
+        The validator, or None if the hint isn't supported
+    """
+    if has_forward_ref(hint):
+        return _translate(hint, namespace, localns)
+
+    try:
+        return _typing_validators[hint]
+    except KeyError:
+        pass
+    except TypeError:
+        return _translate(hint)
+
+    validator = _translate(hint)
+    if validator is not None and "<locals>" not in repr(hint):
+        _typing_validators[hint] = validator
+    return validator
+
+
+def _translate(hint, namespace=None, localns=None):
+    if hint is typing.Any:
+        return AnyValidator()
+
+    if isinstance(hint, typing.TypeVar):
+        if hint.__bound__ is not None:
+            return _compile_arg(hint.__bound__, namespace, localns)
+        if hint.__constraints__:
+            return _union(hint.__constraints__, namespace, localns)
+        return AnyValidator()
+
+    if _FORWARD_REF is not None and isinstance(hint, _FORWARD_REF):
+        return _compile_forward_ref(
+            hint.__forward_arg__, namespace, localns, nested=False)
+
+    # Annotated hints of both typing and typing_extensions
+    metadata = getattr(hint, "__metadata__", None)
+    if metadata is not None:
+        base = _compile_arg(hint.__origin__, namespace, localns)
+        constraints = [c for c in metadata if isinstance(c, Constraint)]
+        if not constraints:
+            return base
+        return AnnotatedValidator(base, constraints)
+
+    if _is_protocol(hint):
+        return ProtocolValidator(hint)
+
+    if _is_typed_dict(hint):
+        return _schema(hint)
+
+    origin = _get_origin(hint)
+    args = _get_args(hint)
+
+    if _is_protocol(origin):  # Generic protocols, e.g. SupportsAbs[int]
+        return ProtocolValidator(origin)
+
+    if origin is None:
+        # Plain classes are validated as bare class hints
+        return None
+
+    if origin in _UNION_TYPES:
+        return _union(args, namespace, localns)
+
+    if origin is _LITERAL:
+        return LiteralValidator(args)
+
+    if origin in _WRAPPERS:
+        if not args:
+            return AnyValidator()
+        return _compile_arg(args[0], namespace, localns)
+
+    if not isinstance(origin, type):
+        return None
+
+    if origin is tuple:
+        if hint is typing.Tuple:
+            return InstanceValidator((tuple,), allow_none=False)
+        if args == ((),):  # Tuple[()] before Python 3.11
+            args = ()
+        if len(args) == 2 and args[1] is Ellipsis:
+            return CollectionValidator(
+                (tuple,), _compile_arg(args[0], namespace, localns))
+        return TupleValidator([
+            _compile_arg(arg, namespace, localns) for arg in args])
+
+    if origin is type:
+        if args and isinstance(args[0], type):
+            return SubclassValidator(args[0])
+        return InstanceValidator((type,), allow_none=False)
+
+    if args and origin in _MAPPINGS:
+        return MappingValidator(
+            origin,
+            _compile_arg(args[0], namespace, localns),
+            _compile_arg(args[1], namespace, localns),
+        )
+
+    if args and origin in _COLLECTIONS:
+        return CollectionValidator(
+            (origin,), _compile_arg(args[0], namespace, localns))
+
+    return InstanceValidator((origin,), allow_none=False)
+
+
+def _compile_arg(arg, namespace=None, localns=None):
+    """
+    Build a validator for a hint within a ``typing`` hint.
+    """
+    if _FORWARD_REF is not None and isinstance(arg, _FORWARD_REF):
+        arg = arg.__forward_arg__
+    if isinstance(arg, str):
+        return _compile_forward_ref(arg, namespace, localns, nested=True)
+    while _is_new_type(arg):
+        arg = arg.__supertype__
+    if arg is None or arg is NoneType:
+        return InstanceValidator((NoneType,), allow_none=False)
+    if arg is typing.Any:
+        return AnyValidator()
+    if (isinstance(arg, type)
+            and _get_origin(arg) is None
+            and not _is_protocol(arg)
+            and not _is_typed_dict(arg)
+            and not _hints.is_trait_class(arg)):
+        return InstanceValidator(
+            _COERCED_TYPES.get(arg, (arg,)), allow_none=False)
+    return _hints.compile_hint(arg, namespace, localns)
+
+
+def _compile_forward_ref(expression, namespace, localns, nested):
+    """
+    Build a validator for a forward reference, which is resolved when the
+    first value is validated if it can't be resolved yet.
+    """
+    try:
+        hint = resolve_hint(expression, namespace, localns)
+    except UnresolvedTypeHintError:
+        return LazyValidator(expression, namespace, localns, nested=nested)
+    if nested:
+        return _compile_arg(hint, namespace, localns)
+    return _hints.compile_hint(hint, namespace, localns)
+
+
+def _schema(typed_dict):
+    """
+    Build a validator for a ``TypedDict`` class.
+    """
+    try:
+        return _compiling_schemas[typed_dict]
+    except KeyError:
+        pass
+
+    validator = _compiling_schemas[typed_dict] = SchemaValidator()
+    try:
+        fields = _schema_fields(typed_dict)
+        required = getattr(typed_dict, "__required_keys__", None)
+        if required is None:  # Python < 3.9
+            required = fields if typed_dict.__total__ else ()
+        validator.set_fields([
+            (key, key in required, _compile_field(field, typed_dict))
+            for key, field in fields.items()
+        ])
+    finally:
+        del _compiling_schemas[typed_dict]
+    return validator
+
+
+def _schema_fields(typed_dict):
+    try:
+        try:
+            return typing.get_type_hints(typed_dict, include_extras=True)
+        except TypeError:  # Python < 3.9
+            return typing.get_type_hints(typed_dict)
+    except NameError:
+        # Forward references to names that aren't defined yet are resolved
+        # when the first value is validated
+        return dict(typed_dict.__annotations__)
+
+
+def _compile_field(field, typed_dict):
+    module = sys.modules.get(typed_dict.__module__)
+    namespace = vars(module) if module is not None else None
+    return _compile_arg(field, namespace)
+
+
+def _instance_classes(validator):
+    """
+    Get the classes that an InstanceValidator accepts, including NoneType if
+    it accepts None, or None for other validators.
+    """
+    if type(validator) is not InstanceValidator:
+        return None
+    if validator.allow_none:
+        return validator.types + (NoneType,)
+    return validator.types
+
+
+def _exact_types(members):
+    """
+    Get the types whose values a union of members accepts unchanged, without
+    trying the members in turn.
+
+    Members after the first one that isn't an InstanceValidator might be
+    preceded by a member that converts values, so their types are left out.
+    Validators other than InstanceValidators give the types they accept
+    unchanged as ``exact_types``.
+    """
+    types = set()
+    for classes, validator in members:
+        if classes is not None:
+            types.update(classes)
+            continue
+        # Traits give None for attributes they don't have
+        types.update(getattr(validator, "exact_types", None) or ())
+        break
+    return frozenset(types)
+
+
+def _item_error(error, collection, item):
+    """
+    Build the error of an invalid item of a collection, with the index of
+    the item if the collection is a sequence.
+    """
+    if not isinstance(collection, collections.abc.Sequence):
+        return ValidationError()
+    for index, candidate in enumerate(collection):
+        if candidate is item:
+            return _nested_error(error, index, item)
+    return ValidationError()
+
+
+def _nested_error(error, key, value):
+    """
+    Build the error of an invalid item of a container, given the error of
+    the item.
+    """
+    nested = ValidationError()
+    path = getattr(error, "path", ())
+    nested.path = (key,) + path
+    nested.value = error.value if path else value
+    return nested
+
+
+def _union(members, namespace=None, localns=None):
+    return union_validator([
+        _compile_arg(member, namespace, localns) for member in members])
+
+
+def union_validator(validators):
+    """
+    Combine validators into one that accepts values valid for any of them.
+    """
+    # Unions of classes can be validated with a single isinstance check
+    if all(type(validator) is InstanceValidator for validator in validators):
+        classes = []
+        for validator in validators:
+            classes.extend(t for t in validator.types if t not in classes)
+        return InstanceValidator(
+            tuple(classes),
+            allow_none=any(validator.allow_none for validator in validators),
+        )
+    return UnionValidator(validators)
+
+
+def _is_typed_dict(hint):
+    return (
+        isinstance(hint, type)
+        and issubclass(hint, dict)
+        and hasattr(hint, "__total__")
+    )
+
+
+def _is_protocol(hint):
+    return isinstance(hint, type) and getattr(hint, "_is_protocol", False)
+
+
+def _protocol_members(protocol):
+    """
+    Get the names of the attributes that values of a protocol must provide.
+    """
+    members = getattr(protocol, "__protocol_attrs__", None)  # Python >= 3.12
+    if members is not None:
+        return tuple(sorted(members))
+
+    members = set()
+    for base in protocol.__mro__[:-1]:  # Except object
+        if base.__name__ in ("Protocol", "Generic"):
+            continue
+        names = list(vars(base)) + list(getattr(base, "__annotations__", {}))
+        members.update(
+            name for name in names
+            if name not in _PROTOCOL_SPECIAL_NAMES
+            and not name.startswith("_abc_")
+        )
+    return tuple(sorted(members))
+
+
+def _get_origin(hint):
+    try:
+        return typing.get_origin(hint)
+    except AttributeError:  # Python < 3.8
+        return getattr(hint, "__origin__", None)
+
+
+def _get_args(hint):
+    try:
+        return typing.get_args(hint)
+    except AttributeError:  # Python < 3.8
+        return getattr(hint, "__args__", None) or ()
+
+
+class AnyValidator:
+    """
+    Accept any value.
+    """
+    __slots__ = ()
+
+    cost = 0
+
+    def validate(self, object, name, value):
+        return value
+
+
+class CollectionValidator:
+    """
+    Validate that values are instances of collection types whose items are
+    all valid.
+    """
+    __slots__ = ("types", "item")
+
+    cost = COLLECTION_COST
+
+    def __init__(self, types, item):
+        self.types = types
+        self.item = item
+
+    def validate(self, object, name, value):
+        if not isinstance(value, self.types):
+            raise ValidationError()
+        validate = self.item.validate
+        try:
+            for item in value:
+                validate(None, None, item)
+        except _hints.VALIDATION_ERRORS as error:
+            raise _item_error(error, value, item) from None
+        return value
+
+
+class MappingValidator:
+    """
+    Validate that values are mappings whose keys and values are all valid.
+    """
+    __slots__ = ("type", "key", "value")
+
+    cost = COLLECTION_COST
+
+    def __init__(self, type, key, value):
+        self.type = type
+        self.key = key
+        self.value = value
+
+    def validate(self, object, name, value):
+        if not isinstance(value, self.type):
+            raise ValidationError()
+        validate_key = self.key.validate
+        validate_value = self.value.validate
+        try:
+            for key, item in value.items():
+                validate_key(None, None, key)
+                validate_value(None, None, item)
+        except _hints.VALIDATION_ERRORS as error:
+            try:
+                validate_key(None, None, key)
+            except _hints.VALIDATION_ERRORS:
+                # Invalid keys have no path
+                raise ValidationError() from None
+            raise _nested_error(error, key, item) from None
+        return value
+
+
+class TupleValidator:
+    """
+    Validate that values are tuples with one valid item per validator.
+    """
+    __slots__ = ("items",)
+
+    def __init__(self, items):
+        self.items = items
+
+    @property
+    def cost(self):
+        return 1 + sum(map(validation_cost, self.items))
+
+    def validate(self, object, name, value):
+        if not isinstance(value, tuple) or len(value) != len(self.items):
+            raise ValidationError()
+        for index, (validator, item) in enumerate(zip(self.items, value)):
+            try:
+                validator.validate(None, None, item)
+            except _hints.VALIDATION_ERRORS as error:
+                raise _nested_error(error, index, item) from None
+        return value
+
+
+class SchemaValidator:
+    """
+    Validate that values are dicts with valid items for the keys of a
+    ``TypedDict``, and all of its required keys. Other keys are allowed.
+
+    Items validated with isinstance, such as ``int`` or ``str`` fields, are
+    checked without calling their validator, which halves the time to
+    validate typical records.
+    """
+    __slots__ = ("fields",)
+
+    cost = COLLECTION_COST
+
+    def __init__(self):
+        # Tuples of the key, whether it's required, the classes of the item
+        # or None, and the item validator. Set once the fields are compiled.
+        self.fields = ()
+
+    def set_fields(self, fields):
+        self.fields = tuple(
+            (key, required, _instance_classes(validator), validator)
+            for key, required, validator in fields
+        )
+
+    def validate(self, object, name, value):
+        if not isinstance(value, dict):
+            raise ValidationError()
+        get = value.get
+        for key, required, classes, validator in self.fields:
+            item = get(key, MISSING)
+            if item is MISSING:
+                if required:
+                    raise _nested_error(ValidationError(), key, MISSING)
+            elif classes is not None:
+                if not isinstance(item, classes):
+                    raise _nested_error(ValidationError(), key, item)
+            else:
+                try:
+                    validator.validate(None, None, item)
+                except _hints.VALIDATION_ERRORS as error:
+                    raise _nested_error(error, key, item) from None
+        return value
+
+
+class UnionValidator:
+    """
+    Validate that values are valid for at least one of several validators.
+
+    Validators are tried in order. Class members are checked with isinstance
+    directly, rather than by catching their validation errors. Values of
+    types that the first members accept unchanged, such as ints for an
+    ``IntValidator`` after class members, are accepted by a single lookup.
+    """
+    __slots__ = ("validators", "members", "exact_types")
+
+    def __init__(self, validators):
+        self.validators = validators
+        # Pairs of the classes of InstanceValidators, or None, and validators
+        self.members = [
+            (_instance_classes(validator), validator)
+            for validator in validators
+        ]
+        self.exact_types = _exact_types(self.members)
+
+    @property
+    def cost(self):
+        return sum(map(validation_cost, self.validators))
+
+    def validate(self, object, name, value):
+        if type(value) in self.exact_types:
+            return value
+        for classes, validator in self.members:
+            if classes is not None:
+                if isinstance(value, classes):
+                    return value
+                continue
+            try:
+                return validator.validate(None, None, value)
+            except _hints.VALIDATION_ERRORS:
+                pass
+        raise ValidationError()
+
+
+class ProtocolValidator:
+    """
+    Validate that values provide the attributes of a protocol class.
+
+    The attributes that each type provides are found when the first value of
+    the type is validated, and cached. Only attributes the type lacks, such
+    as instance attributes, are then looked up on each value. Attributes
+    added to a class later are found, but attributes deleted from a class
+    after one of its values has been validated are not noticed.
+
+    At most ``TYPE_CACHE_SIZE`` types are cached, see ``cache_type_result``.
+    """
+    __slots__ = ("protocol", "members", "missing")
+
+    cost = 2
+
+    def __init__(self, protocol):
+        self.protocol = protocol
+        self.members = _protocol_members(protocol)
+        self.missing = {}
+
+    def validate(self, object, name, value):
+        cls = type(value)
+        try:
+            missing = self.missing[cls]
+        except KeyError:
+            missing = tuple(
+                member for member in self.members
+                if getattr(cls, member, _MISSING) is _MISSING
+            )
+            cache_type_result(self.missing, cls, missing)
+        for member in missing:
+            if not hasattr(value, member):
+                raise ValidationError()
+        return value
+
+
+class LiteralValidator:
+    """
+    Validate that values are equal to, and of the same type as, one of some
+    literal values.
+    """
+    __slots__ = ("values",)
+
+    cost = 1
+
+    def __init__(self, values):
+        self.values = frozenset((type(value), value) for value in values)
+
+    def validate(self, object, name, value):
+        try:
+            if (type(value), value) in self.values:
+                return value
+        except TypeError:  # Unhashable
+            pass
+        raise ValidationError()
+
+
+class SubclassValidator:
+    """
+    Validate that values are subclasses of a class.
+    """
+    __slots__ = ("cls",)
+
+    cost = 1
+
+    def __init__(self, cls):
+        self.cls = cls
+
+    def validate(self, object, name, value):
+        if isinstance(value, type) and issubclass(value, self.cls):
+            return value
+        raise ValidationError()
+
+
+class AnnotatedValidator:
+    """
+    Validate values with a base validator and constraints.
+
+    Constraints that only depend on the type of values are checked once per
+    type, and the result is cached. As for ``ProtocolValidator``, the cache
+    is bounded.
+    """
+    __slots__ = ("base", "type_constraints", "value_constraints", "type_valid")
+
+    def __init__(self, base, constraints):
+        self.base = base
+        self.type_constraints = [c for c in constraints if not c.needs_value]
+        self.value_constraints = [
+            c.check for c in constraints if c.needs_value]
+        self.type_valid = {}
+
+    @property
+    def cost(self):
+        return (validation_cost(self.base) + len(self.type_constraints)
+                + len(self.value_constraints))
+
+    def validate(self, object, name, value):
+        value = self.base.validate(object, name, value)
+        if self.type_constraints:
+            cls = type(value)
+            try:
+                valid = self.type_valid[cls]
+            except KeyError:
+                valid = all(c.check_type(cls) for c in self.type_constraints)
+                cache_type_result(self.type_valid, cls, valid)
+            if not valid:
+                raise ValidationError()
+        for check in self.value_constraints:
+            if not check(value):
+                raise ValidationError()
+        return value
@@ -0,0 +1,149 @@
+"""
+Constraints for ``Annotated`` type hints, e.g.
+``Annotated[int, Range(0, 100)]``.
+
+Constraints are checked after the base type of the hint, in the same
+validator. New constraints can be defined by subclassing ``Constraint``, or
+``TypeConstraint`` if the check only depends on the type of the value.
+"""
+
+
+class Constraint:
+    """
+    Base class of constraints that check values.
+
+    Subclasses implement ``check``.
+    """
+    #: Whether the check needs the value, rather than only its type
+    needs_value = True
+
+    def check(self, value):
+        """
+        Check a value that is valid for the base type of the hint.
+
+        Parameters
+        ----------
+        value : Any
+            The value to check
+
+        Returns
+        -------
+        bool
+            Whether the value satisfies the constraint
+        """
+        raise NotImplementedError()
+
+
+class TypeConstraint(Constraint):
+    """
+    Base class of constraints that only depend on the type of values.
+
+    Subclasses implement ``check_type``. Its result is cached for each type,
+    so it must not change for a given type.
+    """
+    needs_value = False
+
+    def check_type(self, cls):
+        """
+        Check the type of a value that is valid for the base type of the
+        hint.
+
+        Parameters
+        ----------
+        cls : type
+            The type of the value
+
+        Returns
+        -------
+        bool
+            Whether values of the type satisfy the constraint
+        """
+        raise NotImplementedError()
+
+    def check(self, value):
+        return self.check_type(type(value))
+
+
+class Range(Constraint):
+    """
+    Require values to be within a range.
+
+    Parameters
+    ----------
+    low, high : optional
+        The bounds of the range. If not given, the range is unbounded on
+        that side.
+    exclude_low, exclude_high : bool
+        Whether the bounds are excluded from the range
+    """
+    def __init__(self, low=None, high=None, exclude_low=False,
+                 exclude_high=False):
+        self.low = low
+        self.high = high
+        self.exclude_low = exclude_low
+        self.exclude_high = exclude_high
+
+    def check(self, value):
+        low = self.low
+        if low is not None:
+            if value < low or (self.exclude_low and value == low):
+                return False
+        high = self.high
+        if high is not None:
+            if value > high or (self.exclude_high and value == high):
+                return False
+        return True
+
+    def __repr__(self):
+        args = [repr(self.low), repr(self.high)]
+        if self.exclude_low:
+            args.append("exclude_low=True")
+        if self.exclude_high:
+            args.append("exclude_high=True")
+        return "Range({})".format(", ".join(args))
+
+
+class Shape(Constraint):
+    """
+    Require values, e.g. numpy arrays, to have a shape.
+
+    Parameters
+    ----------
+    *dimensions : int or None
+        The length of each dimension, or None for any length
+    """
+    def __init__(self, *dimensions):
+        self.dimensions = dimensions
+
+    def check(self, value):
+        shape = getattr(value, "shape", None)
+        if shape is None or len(shape) != len(self.dimensions):
+            return False
+        return all(
+            expected is None or expected == actual
+            for expected, actual in zip(self.dimensions, shape)
+        )
+
+    def __repr__(self):
+        return "Shape({})".format(", ".join(map(repr, self.dimensions)))
+
+
+class ExcludeTypes(TypeConstraint):
+    """
+    Reject values that are instances of some types, e.g. ``bool`` values of
+    ``int`` hints.
+
+    Parameters
+    ----------
+    *types : type
+        The types to reject
+    """
+    def __init__(self, *types):
+        self.types = types
+
+    def check_type(self, cls):
+        return not issubclass(cls, self.types)
+
+    def __repr__(self):
+        return "ExcludeTypes({})".format(
+            ", ".join(cls.__qualname__ for cls in self.types))
@@ -26,6 +26,27 @@ class ReturnTypeError(Exception):
     pass
 
 
+class AttributeTypeError(Exception):
+    """
+    Assigned attribute value is invalid
+    """
+    pass
+
+
+class UnresolvedTypeHintError(NameError):
+    """
+    String type hint refers to a name that isn't defined
+    """
+    pass
+
+
+class UnresolvedTypeHintWarning(UserWarning):
+    """
+    String type hint can't be resolved, so values aren't validated against it
+    """
+    pass
+
+
 class TypenError(Exception):
     """
     General Typen error.
@@ -0,0 +1,127 @@
+import inspect
+import unittest
+import weakref
+from typing import ClassVar, List, Optional
+
+from traits.api import Range
+
+from typen._attributes import slotted_type_hints
+from typen._scope import trusted_scope
+from typen.exceptions import AttributeTypeError
+
+
+@slotted_type_hints
+class Point:
+    dimensions: ClassVar[int] = 2
+    x: float
+    y: float = 0.0
+    label: Optional[str] = None
+
+    def __init__(self, x, **kwargs):
+        self.x = x
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return "Point" + super().__repr__()
+
+
+@slotted_type_hints
+class LabelledPoint(Point):
+    tags: List[str]
+    size: Range(0, 10) = 1
+
+
+@slotted_type_hints
+class Node:
+    next: "Optional[Node]" = None
+
+
+class TestSlottedTypeHints(unittest.TestCase):
+    def test_slots(self):
+        self.assertEqual(
+            Point.__slots__, ("x", "y", "label", "__weakref__"))
+        self.assertEqual(LabelledPoint.__slots__, ("tags", "size"))
+        self.assertFalse(hasattr(Point(1), "__dict__"))
+        self.assertEqual(Point.dimensions, 2)
+        self.assertEqual(Point.__qualname__, "Point")
+
+    def test_weak_references(self):
+        point = LabelledPoint(1)
+        self.assertIs(weakref.ref(point)(), point)
+
+        @slotted_type_hints
+        class NoWeakReferences:
+            __slots__ = ()
+            a: int = 1
+
+        with self.assertRaises(TypeError):
+            weakref.ref(NoWeakReferences())
+
+    def test_signature(self):
+        self.assertEqual(str(inspect.signature(Point)), "(x, **kwargs)")
+        self.assertEqual(Point.__init__.__name__, "__init__")
+
+    def test_defaults(self):
+        point = Point(1.0)
+        self.assertEqual((point.x, point.y, point.label), (1.0, 0.0, None))
+        self.assertEqual(LabelledPoint(1).size, 1)
+
+    def test_validation(self):
+        point = Point(1, y=2.0, label="a")
+        point.x = 3.0
+        point.label = None
+        with self.assertRaises(AttributeTypeError) as err:
+            point.y = "a"
+        self.assertIn("'y' attribute of 'Point'", str(err.exception))
+        self.assertEqual(point.y, 2.0)
+
+        with self.assertRaises(AttributeTypeError):
+            Point("a")
+
+    def test_subclass(self):
+        point = LabelledPoint(1, tags=["a"])
+        with self.assertRaises(AttributeTypeError):
+            point.x = "a"
+        with self.assertRaises(AttributeTypeError) as err:
+            point.tags = ["a", 1]
+        self.assertIn("[1] was 1", str(err.exception))
+        with self.assertRaises(AttributeTypeError):
+            point.size = 11
+
+    def test_unannotated_attributes(self):
+        with self.assertRaises(AttributeError):
+            Point(1).other = 1
+
+        @slotted_type_hints
+        class WithDict:
+            __slots__ = ("__dict__", "a")
+            b: int
+
+        value = WithDict()
+        value.a = "a"
+        value.other = "a"
+        value.b = 1
+        with self.assertRaises(AttributeTypeError):
+            value.b = "a"
+
+    def test_invalid_default(self):
+        with self.assertRaises(AttributeTypeError):
+            @slotted_type_hints
+            class Invalid:
+                a: int = "a"
+
+    def test_super(self):
+        self.assertTrue(repr(Point(1)).startswith("Point<"))
+
+    def test_trusted_scope(self):
+        point = Point(1)
+        with trusted_scope():
+            point.x = "a"
+        self.assertEqual(point.x, "a")
+
+    def test_string_annotations(self):
+        node = Node()
+        node.next = Node()
+        with self.assertRaises(AttributeTypeError):
+            node.next = Point(1)
@@ -0,0 +1,129 @@
+import unittest
+
+import numpy as np
+
+from typen._decorators import enforce_type_hints
+from typen._hints import InstanceValidator
+from typen._typing import AnnotatedValidator, compile_typing_hint
+from typen.constraints import (
+    Constraint,
+    ExcludeTypes,
+    Range,
+    Shape,
+    TypeConstraint,
+)
+from typen.exceptions import ParameterTypeError, ReturnTypeError
+
+try:
+    from typing import Annotated
+except ImportError:  # Python < 3.9
+    Annotated = None
+
+
+class CountingTypeConstraint(TypeConstraint):
+    def __init__(self):
+        self.checked = []
+
+    def check_type(self, cls):
+        self.checked.append(cls)
+        return cls is not bool
+
+
+class Even(Constraint):
+    def check(self, value):
+        return value % 2 == 0
+
+
+class TestConstraints(unittest.TestCase):
+    def test_range(self):
+        self.assertTrue(Range(0, 10).check(0))
+        self.assertTrue(Range(0, 10).check(10))
+        self.assertFalse(Range(0, 10).check(11))
+        self.assertFalse(Range(0, 10).check(-1))
+        self.assertTrue(Range(0).check(1e9))
+        self.assertTrue(Range(high=0).check(-1e9))
+        self.assertFalse(Range(0, 10, exclude_low=True).check(0))
+        self.assertFalse(Range(0, 10, exclude_high=True).check(10))
+        self.assertTrue(Range(0, 10, exclude_high=True).check(9.9))
+
+    def test_shape(self):
+        self.assertTrue(Shape(None, 2).check(np.zeros((3, 2))))
+        self.assertFalse(Shape(None, 2).check(np.zeros((3, 3))))
+        self.assertFalse(Shape(None, 2).check(np.zeros(2)))
+        self.assertFalse(Shape(2).check([1, 2]))
+
+    def test_exclude_types(self):
+        self.assertTrue(ExcludeTypes(bool).check(1))
+        self.assertFalse(ExcludeTypes(bool).check(True))
+        self.assertFalse(ExcludeTypes(bool, str).check("a"))
+
+    def test_repr(self):
+        self.assertEqual(repr(Range(0, 1)), "Range(0, 1)")
+        self.assertEqual(
+            repr(Range(0, exclude_low=True)),
+            "Range(0, None, exclude_low=True)",
+        )
+        self.assertEqual(repr(Shape(None, 2)), "Shape(None, 2)")
+        self.assertEqual(repr(ExcludeTypes(bool)), "ExcludeTypes(bool)")
+
+
+@unittest.skipIf(Annotated is None, "Annotated requires Python 3.9")
+class TestAnnotatedHints(unittest.TestCase):
+    def test_fused_validator(self):
+        validator = compile_typing_hint(
+            Annotated[int, Range(0, 100), ExcludeTypes(bool)])
+        self.assertIsInstance(validator, AnnotatedValidator)
+
+    def test_other_metadata_ignored(self):
+        validator = compile_typing_hint(Annotated[int, "documentation"])
+        self.assertIsInstance(validator, InstanceValidator)
+        self.assertEqual(validator.types, (int,))
+
+    def test_type_constraints_checked_once_per_type(self):
+        constraint = CountingTypeConstraint()
+
+        @enforce_type_hints
+        def example_function(a: Annotated[int, constraint, Even()]):
+            return a
+
+        for value in [2, 4, 6]:
+            example_function(value)
+        with self.assertRaises(ParameterTypeError):
+            example_function(True)
+        with self.assertRaises(ParameterTypeError):
+            example_function(False)
+        with self.assertRaises(ParameterTypeError):
+            example_function(3)
+        self.assertEqual(constraint.checked, [int, bool])
+
+    def test_enforced(self):
+        @enforce_type_hints
+        def example_function(
+                a: Annotated[int, Range(0, 100)],
+                b: Annotated[np.ndarray, Shape(None, 2)],
+                ) -> Annotated[float, Range(0, exclude_low=True)]:
+            return a / b.shape[0]
+
+        self.assertEqual(example_function(10, np.zeros((5, 2))), 2.0)
+
+        with self.assertRaises(ParameterTypeError) as err:
+            example_function(101, np.zeros((5, 2)))
+        self.assertIn("Range(0, 100)", str(err.exception))
+
+        with self.assertRaises(ParameterTypeError):
+            example_function(10, np.zeros((5, 3)))
+
+        with self.assertRaises(ParameterTypeError):
+            example_function(10.0, np.zeros((5, 2)))
+
+        with self.assertRaises(ReturnTypeError):
+            example_function(0, np.zeros((5, 2)))
+
+    def test_nested(self):
+        @enforce_type_hints
+        def example_function(a: list[Annotated[int, Range(0)]]):
+            return a
+
+        example_function([0, 1])
+        with self.assertRaises(ParameterTypeError):
+            example_function([0, -1])
@@ -1,9 +1,29 @@
+import functools
+import gc
+import sys
+import threading
+import time
 import unittest
+import weakref
+from typing import Tuple
+from unittest import mock
+
+import numpy as np
+from traits.api import Array, Float, Int
 
 from typen._decorators import (
+    cached_type_hints,
+    compile_type_hints,
+    EnforceTypeHints,
+    enforce_class_type_hints,
     enforce_type_hints,
+    strict_class_type_hints,
+    strict_parameter_hints,
+    strict_return_hint,
     strict_type_hints,
 )
+from typen._enforcer import cached_enforcer, Enforcer
+from typen._scope import trusted_scope
 from typen.exceptions import (
     ParameterTypeError,
     ReturnTypeError,
@@ -73,6 +93,23 @@ class TestEnforceTypeHints(unittest.TestCase):
         self.assertEqual(result, 5)
         self.assertIsInstance(result, int)
 
+    def test_enforce_type_hints_in_factory(self):
+        def factory(offset):
+            @enforce_type_hints
+            def example_function(a: int, b: int = offset) -> int:
+                return a + b
+            return example_function
+
+        new_func1 = factory(1)
+        new_func2 = factory(2)
+
+        self.assertEqual(new_func1(1), 2)
+        self.assertEqual(new_func2(1), 3)
+        self.assertIs(new_func1.enforcer.args, new_func2.enforcer.args)
+
+        with self.assertRaises(ParameterTypeError):
+            factory("a")(1)
+
     def test_enforce_type_hints_defaults(self):
         def example_function(a: int = 5, b: int = 6) -> int:
             return a + b
@@ -607,6 +644,86 @@ class TestEnforceTypeHints(unittest.TestCase):
 
         inst.method6()
 
+    def test_bound_methods(self):
+        class ExClass:
+            def method(self, a: int, b: str = "b") -> int:
+                return a
+
+            @classmethod
+            def class_method(cls, a: int) -> int:
+                return a
+
+        for method in (ExClass().method, ExClass.class_method):
+            with self.subTest(method=method):
+                new_func = enforce_type_hints(method)
+                self.assertEqual(new_func(1), 1)
+                with self.assertRaises(ParameterTypeError) as err:
+                    new_func("x")
+                self.assertIn("'a' parameter", str(err.exception))
+
+        strict_func = strict_type_hints(ExClass().method)
+        self.assertEqual(strict_func(1, b="c"), 1)
+        with self.assertRaises(ParameterTypeError):
+            strict_func(1, b=2)
+
+    def test_outermost_only(self):
+        @enforce_type_hints(outermost_only=True)
+        def total(values: list, start: int = 0) -> int:
+            if start >= len(values):
+                # Invalid return value in the innermost call isn't checked
+                return None if start else 0
+            return values[start] + (total(values, start + 1) or 0)
+
+        with count_validations() as verify_args:
+            self.assertEqual(total([1, 2, 3]), 6)
+        self.assertEqual(verify_args.call_count, 1)
+
+        with self.assertRaises(ParameterTypeError):
+            total((1, 2, 3))
+        # The entry is still validated after a failing call
+        with self.assertRaises(ParameterTypeError):
+            total((1, 2, 3))
+
+    def test_outermost_only_return(self):
+        @enforce_type_hints(outermost_only=True)
+        def countdown(n: int) -> int:
+            return "done" if n == 0 else countdown(n - 1)
+
+        with self.assertRaises(ReturnTypeError):
+            countdown(3)
+
+    def test_outermost_only_per_thread(self):
+        results = []
+
+        @enforce_type_hints(outermost_only=True)
+        def example_function(a: int, call_in_thread: bool = False):
+            if call_in_thread:
+                def target():
+                    try:
+                        example_function("a")
+                    except ParameterTypeError:
+                        results.append("raised")
+                thread = threading.Thread(target=target)
+                thread.start()
+                thread.join()
+            return a
+
+        example_function(1, call_in_thread=True)
+        self.assertEqual(results, ["raised"])
+
+    def test_outermost_only_invalid_options(self):
+        def example_function(a: int):
+            return a
+
+        with self.assertRaises(ValueError):
+            EnforceTypeHints(
+                example_function,
+                require_args=False,
+                require_return=False,
+                sample_every=10,
+                outermost_only=True,
+            )
+
 
 class TestStrictTypeHints(unittest.TestCase):
     def test_strict_type_hints(self):
@@ -788,3 +905,588 @@ class TestStrictTypeHints(unittest.TestCase):
             err.exception.__cause__,
             UnspecifiedReturnTypeError
         )
+
+
+class TestClassTypeHints(unittest.TestCase):
+    def test_enforce_class_type_hints(self):
+        @enforce_class_type_hints
+        class ExClass:
+            def __init__(self, a: int):
+                self._a = a
+
+            def ex_method(self, b: int) -> int:
+                return self._a + b
+
+            @classmethod
+            def ex_class_method(cls, b: int) -> int:
+                return b
+
+            @staticmethod
+            def ex_static_method(b: int) -> int:
+                return b
+
+            @property
+            def a(self) -> int:
+                return self._a
+
+            @a.setter
+            def a(self, value: int):
+                self._a = value
+
+        inst = ExClass(1)
+        self.assertEqual(inst.ex_method(2), 3)
+        self.assertEqual(ExClass.ex_class_method(2), 2)
+        self.assertEqual(inst.ex_class_method(2), 2)
+        self.assertEqual(ExClass.ex_static_method(2), 2)
+        self.assertEqual(inst.ex_static_method(2), 2)
+        self.assertEqual(inst.a, 1)
+        inst.a = 5
+        self.assertEqual(inst.a, 5)
+
+        with self.assertRaises(ParameterTypeError) as err:
+            ExClass("a")
+        self.assertEqual(
+            "The 'a' parameter of '__init__' must be <class 'int'>, "
+            "but a value of 'a' <class 'str'> was specified.",
+            str(err.exception)
+        )
+
+        with self.assertRaises(ParameterTypeError):
+            inst.ex_method("a")
+        with self.assertRaises(ParameterTypeError):
+            ExClass.ex_class_method("a")
+        with self.assertRaises(ParameterTypeError):
+            inst.ex_static_method("a")
+        with self.assertRaises(ParameterTypeError):
+            inst.a = "a"
+
+        inst._a = "a"
+        with self.assertRaises(ReturnTypeError):
+            inst.a
+
+    def test_enforce_class_type_hints_shares_validators(self):
+        @enforce_class_type_hints
+        class ExClass:
+            def ex_method1(self, a: int) -> int:
+                return a
+
+            @staticmethod
+            def ex_method2(a: int, b: str) -> str:
+                return b
+
+        enforcer1 = ExClass.ex_method1._typen_enforcer
+        enforcer2 = ExClass.ex_method2._typen_enforcer
+
+        self.assertIs(enforcer1.args[0].validator, enforcer2.args[0].validator)
+        self.assertIs(enforcer1.result_validator, enforcer1.args[0].validator)
+        self.assertIs(enforcer2.result_validator, enforcer2.args[1].validator)
+
+    def test_strict_class_type_hints(self):
+        @strict_class_type_hints
+        class ExClass:
+            def __init__(self, a: int):
+                self._a = a
+
+            @property
+            def a(self) -> int:
+                return self._a
+
+            @a.setter
+            def a(self, value: int):
+                self._a = value
+
+        inst = ExClass(1)
+        inst.a = 2
+        self.assertEqual(inst.a, 2)
+
+    def test_class_type_hints_new(self):
+        @strict_class_type_hints
+        class ExClass:
+            def __new__(cls, a: int) -> object:
+                return super().__new__(cls)
+
+            def __init__(self, a: int):
+                self.a = a
+
+        self.assertEqual(ExClass(1).a, 1)
+        with self.assertRaises(ParameterTypeError) as err:
+            ExClass("a")
+        self.assertIn("'a' parameter", str(err.exception))
+
+    def test_strict_class_type_hints_missing(self):
+        with self.assertRaises(UnspecifiedParameterTypeError):
+            @strict_class_type_hints
+            class ExClass1:
+                def ex_method(self, a) -> int:
+                    return a
+
+        with self.assertRaises(UnspecifiedReturnTypeError):
+            @strict_class_type_hints
+            class ExClass2:
+                @classmethod
+                def ex_method(cls, a: int):
+                    return a
+
+        with self.assertRaises(UnspecifiedParameterTypeError):
+            @strict_class_type_hints
+            class ExClass3:
+                @staticmethod
+                def ex_method(self: int, a) -> int:
+                    return a
+
+
+class TestCompileTypeHints(unittest.TestCase):
+    def setUp(self):
+        # Free functions left pending by other tests, e.g. in classes that
+        # failed to be created
+        gc.collect()
+
+    def test_compile_all(self):
+        def example_function(a: int) -> int:
+            return a
+        new_func = enforce_type_hints(example_function)
+
+        self.assertIsNone(new_func.enforcer)
+        self.assertGreaterEqual(compile_type_hints(), 1)
+        self.assertIsNotNone(new_func.enforcer)
+        self.assertEqual(compile_type_hints(), 0)
+
+        with self.assertRaises(ParameterTypeError):
+            new_func("a")
+
+    def test_compile_module(self):
+        module = type(unittest)("typen_example_module")
+        exec("def example_function(a: int):\n    return a\n", vars(module))
+        new_func = enforce_type_hints(module.example_function)
+
+        def example_function(a: int):
+            return a
+        other_func = enforce_type_hints(example_function)
+
+        self.assertEqual(compile_type_hints(module), 1)
+        self.assertIsNotNone(new_func.enforcer)
+        self.assertIsNone(other_func.enforcer)
+
+    def test_compile_class(self):
+        class ExClass:
+            @enforce_type_hints
+            def decorated_method(self, a: int):
+                return a
+
+        def ex_method(self, a: int) -> int:
+            return a
+        ExClass.ex_method = EnforceTypeHints(
+            ex_method,
+            require_args=False,
+            require_return=False,
+            ignore_self=True,
+        )
+
+        self.assertEqual(compile_type_hints(ExClass), 1)
+        self.assertIsNotNone(ExClass.ex_method.enforcer)
+        self.assertEqual(ExClass().ex_method(1), 1)
+        with self.assertRaises(ParameterTypeError):
+            ExClass().ex_method("a")
+
+    def test_no_reference_cycles(self):
+        def example_function(a: int) -> int:
+            return a
+        new_func = enforce_type_hints(example_function)
+        new_func(1)
+        enforcer = weakref.ref(new_func.enforcer)
+        del example_function, new_func
+
+        gc.disable()
+        try:
+            self.assertIsNone(enforcer())
+        finally:
+            gc.enable()
+
+    def test_compile_strict_errors(self):
+        def example_function(a):
+            return a
+        new_func = strict_type_hints(example_function)
+
+        with self.assertRaises(UnspecifiedParameterTypeError):
+            compile_type_hints(sys.modules[__name__])
+
+        with self.assertRaises(UnspecifiedParameterTypeError):
+            new_func(1)
+
+    def test_concurrent_first_calls(self):
+        def example_function(a: int) -> int:
+            return a
+        new_func = enforce_type_hints(example_function)
+
+        def slow_cached_enforcer(*args, **kwargs):
+            # Let every thread start building an enforcer
+            time.sleep(0.01)
+            return cached_enforcer(*args, **kwargs)
+
+        barrier = threading.Barrier(8)
+        results = []
+
+        def target():
+            barrier.wait()
+            results.append((new_func(1), new_func.decorated_func))
+
+        with mock.patch(
+                "typen._decorators.cached_enforcer", slow_cached_enforcer):
+            threads = [threading.Thread(target=target) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(results), 8)
+        self.assertEqual(
+            results, [(1, new_func.decorated_func)] * 8)
+        with self.assertRaises(ParameterTypeError):
+            new_func("a")
+
+    def test_sampling_per_thread(self):
+        def example_function(a: int):
+            return a
+        new_func = EnforceTypeHints(
+            example_function,
+            require_args=False,
+            require_return=False,
+            sample_every=2,
+        )
+        new_func(1)
+        results = []
+
+        def target():
+            # The first call of each thread is validated
+            try:
+                new_func("a")
+            except ParameterTypeError:
+                results.append("raised")
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+        self.assertEqual(results, ["raised"])
+        self.assertEqual(new_func("a"), "a")
+
+
+def count_validations():
+    return mock.patch.object(
+        Enforcer,
+        "verify_args",
+        autospec=True,
+        side_effect=Enforcer.verify_args,
+    )
+
+
+def passthrough(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+    return wrapper
+
+
+class TestStackedTypeHints(unittest.TestCase):
+    def test_stacked_functions(self):
+        @enforce_type_hints
+        @enforce_type_hints
+        def example_function(a: int) -> int:
+            return a
+
+        with count_validations() as verify_args:
+            self.assertEqual(example_function(1), 1)
+        self.assertEqual(verify_args.call_count, 1)
+        with self.assertRaises(ParameterTypeError):
+            example_function("a")
+
+    def test_stacked_strictness_is_combined(self):
+        @strict_parameter_hints
+        @strict_return_hint
+        def example_function(a) -> int:
+            return a
+
+        with self.assertRaises(UnspecifiedParameterTypeError):
+            example_function(1)
+
+        @strict_parameter_hints
+        @strict_return_hint
+        def example_function(a: int):
+            return a
+
+        with self.assertRaises(UnspecifiedReturnTypeError):
+            example_function(1)
+
+    def test_stacked_methods(self):
+        class ExClass:
+            @strict_type_hints
+            @enforce_type_hints
+            def ex_method(self, a: int) -> int:
+                return a
+
+        with count_validations() as verify_args:
+            self.assertEqual(ExClass().ex_method(1), 1)
+        self.assertEqual(verify_args.call_count, 1)
+        with self.assertRaises(ParameterTypeError):
+            ExClass().ex_method("a")
+
+    def test_class_decorator_over_enforced_method(self):
+        @strict_class_type_hints
+        class ExClass:
+            @enforce_type_hints
+            def ex_method(self, a: int) -> int:
+                return a
+
+        with count_validations() as verify_args:
+            self.assertEqual(ExClass().ex_method(1), 1)
+        self.assertEqual(verify_args.call_count, 1)
+
+        with self.assertRaises(UnspecifiedReturnTypeError):
+            @strict_class_type_hints
+            class ExClass:
+                @enforce_type_hints
+                def ex_method(self, a: int):
+                    return a
+
+    def test_enforced_inside_other_wrapper(self):
+        @enforce_type_hints
+        @passthrough
+        @enforce_type_hints
+        def example_function(a: int) -> int:
+            return a
+
+        with count_validations() as verify_args:
+            self.assertEqual(example_function(1), 1)
+        self.assertEqual(verify_args.call_count, 1)
+        with self.assertRaises(ParameterTypeError):
+            example_function("a")
+
+        @strict_type_hints
+        @passthrough
+        @enforce_type_hints
+        def example_function(a):
+            return a
+
+        with self.assertRaises(UnspecifiedParameterTypeError):
+            example_function(1)
+
+    def test_class_decorator_over_wrapped_enforced_method(self):
+        calls = []
+
+        def logged(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                calls.append(args)
+                return func(*args, **kwargs)
+            return wrapper
+
+        class Base:
+            @enforce_type_hints
+            def ex_method(self, a: int) -> int:
+                return a
+
+        @enforce_class_type_hints
+        class ExClass:
+            ex_method = logged(Base.ex_method)
+
+        ex = ExClass()
+        with count_validations() as verify_args:
+            self.assertEqual(ex.ex_method(1), 1)
+        self.assertEqual(verify_args.call_count, 1)
+        self.assertEqual(calls, [(ex, 1)])
+        with self.assertRaises(ParameterTypeError):
+            ex.ex_method("a")
+
+
+class TestCachedTypeHints(unittest.TestCase):
+    def test_validated_on_miss(self):
+        calls = []
+
+        @cached_type_hints
+        def example_function(a: int) -> int:
+            calls.append(a)
+            return a * 2
+
+        with count_validations() as verify_args:
+            for _ in range(3):
+                self.assertEqual(example_function(2), 4)
+        self.assertEqual(verify_args.call_count, 1)
+        self.assertEqual(calls, [2])
+
+        info = example_function.cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 1))
+        self.assertEqual(info.maxsize, 128)
+
+        with self.assertRaises(ParameterTypeError):
+            example_function("a")
+
+    def test_invalid_calls_not_cached(self):
+        @cached_type_hints(maxsize=None)
+        def example_function(a) -> int:
+            return a
+
+        for _ in range(2):
+            with self.assertRaises(ReturnTypeError):
+                example_function("a")
+        self.assertEqual(example_function.cache_info().currsize, 0)
+
+    def test_equal_values_of_other_types(self):
+        @cached_type_hints
+        def example_function(a: int) -> int:
+            return a
+
+        example_function(1)
+        with self.assertRaises(ParameterTypeError):
+            example_function(1.0)
+
+    def test_equal_items_of_other_types(self):
+        @cached_type_hints
+        def example_function(a: Tuple[int, ...]) -> int:
+            return len(a)
+
+        with self.assertRaises(ParameterTypeError):
+            example_function((1.0,))
+        # Only the types of the arguments are part of the cache key, so an
+        # equal tuple of other items is a cache hit and isn't validated
+        self.assertEqual(example_function((1,)), 1)
+        with count_validations() as verify_args:
+            self.assertEqual(example_function((1.0,)), 1)
+        self.assertEqual(verify_args.call_count, 0)
+
+    def test_eviction(self):
+        @cached_type_hints(maxsize=2)
+        def example_function(a: int) -> int:
+            return a
+
+        with count_validations() as verify_args:
+            for value in [1, 2, 3, 1]:
+                example_function(value)
+        self.assertEqual(verify_args.call_count, 4)
+        self.assertEqual(example_function.cache_info().currsize, 2)
+
+        example_function.cache_clear()
+        self.assertEqual(example_function.cache_info().currsize, 0)
+
+    def test_methods(self):
+        class ExClass:
+            @cached_type_hints
+            def ex_method(self, a: int) -> int:
+                return a
+
+        inst = ExClass()
+        self.assertEqual(inst.ex_method(1), 1)
+        self.assertEqual(inst.ex_method(1), 1)
+        with self.assertRaises(ParameterTypeError):
+            inst.ex_method("a")
+
+    def test_enforced_again(self):
+        @enforce_type_hints
+        @cached_type_hints
+        def example_function(a: int) -> int:
+            return a
+
+        with count_validations() as verify_args:
+            example_function(1)
+            example_function(1)
+        self.assertEqual(verify_args.call_count, 1)
+
+
+class TestCoerceTypeHints(unittest.TestCase):
+    def test_arguments(self):
+        @enforce_type_hints(coerce=True)
+        def example_function(a: Float, b: Array(dtype=float)):
+            return a, b
+
+        a, b = example_function(1, [1, 2])
+        self.assertIs(type(a), float)
+        self.assertIsInstance(b, np.ndarray)
+        np.testing.assert_array_equal(b, [1.0, 2.0])
+
+        a, b = example_function(b=[1], a=2)
+        self.assertIs(type(a), float)
+        self.assertIsInstance(b, np.ndarray)
+
+        with self.assertRaises(ParameterTypeError):
+            example_function("a", [1])
+
+    def test_not_coerced_by_default(self):
+        @enforce_type_hints
+        def example_function(a: Float):
+            return a
+
+        self.assertIs(type(example_function(1)), int)
+
+    def test_return(self):
+        @strict_type_hints(coerce=True)
+        def example_function(a: Int) -> Float:
+            return a
+
+        self.assertIs(type(example_function(np.int64(1))), float)
+        self.assertIs(type(example_function(1)), float)
+
+        @strict_type_hints(coerce=True)
+        def invalid_function(a: Int) -> Float:
+            return "a"
+
+        with self.assertRaises(ReturnTypeError):
+            invalid_function(1)
+
+    def test_packed_arguments(self):
+        @enforce_type_hints(coerce=True)
+        def example_function(a: Float, *args: Float, **kwargs: Float):
+            return a, args, kwargs
+
+        a, args, kwargs = example_function(1, 2, 3, b=4)
+        self.assertEqual([type(a)] + [type(v) for v in args], [float] * 3)
+        self.assertIs(type(kwargs["b"]), float)
+
+    def test_defaults_not_converted(self):
+        @enforce_type_hints(coerce=True)
+        def example_function(a: Float = 1):
+            return a
+
+        self.assertIs(type(example_function()), int)
+
+    def test_method(self):
+        class ExClass:
+            @enforce_type_hints(coerce=True)
+            def ex_method(self, a: Float) -> Float:
+                return a
+
+        self.assertIs(type(ExClass().ex_method(1)), float)
+        self.assertIs(type(ExClass.ex_method(self=ExClass(), a=1)), float)
+
+    def test_trusted_scope(self):
+        @enforce_type_hints(coerce=True)
+        def example_function(a: Float):
+            return a
+
+        with trusted_scope():
+            self.assertIs(type(example_function(1)), int)
+
+    def test_stacked(self):
+        @enforce_type_hints
+        @enforce_type_hints(coerce=True)
+        def example_function(a: Float):
+            return a
+
+        self.assertIs(type(example_function(1)), float)
+
+        with self.assertRaises(ValueError):
+            enforce_type_hints(passthrough(example_function), coerce=True)
+
+    def test_invalid_options(self):
+        def example_function(a: Float):
+            return a
+
+        with self.assertRaises(ValueError):
+            enforce_type_hints(
+                example_function, coerce=True, outermost_only=True)
+
+        with self.assertRaises(ValueError):
+            EnforceTypeHints(
+                example_function,
+                require_args=False,
+                require_return=False,
+                sample_every=2,
+                coerce=True,
+            )
@@ -0,0 +1,189 @@
+import unittest
+from typing import List
+from unittest import mock
+
+from traits.api import Range
+
+from typen._dispatch import dispatch_type_hints
+from typen._enforcer import Enforcer
+from typen._scope import trusted_scope
+from typen.exceptions import ParameterTypeError, ReturnTypeError
+
+
+class Shape:
+    pass
+
+
+class Circle(Shape):
+    pass
+
+
+class Square(Shape):
+    pass
+
+
+@dispatch_type_hints
+def describe(shape: Circle) -> str:
+    return "circle"
+
+
+@describe.register
+def _(shape: Square) -> str:
+    return "square"
+
+
+@describe.register
+def _(shape: Shape, scale: float = 1.0) -> str:
+    return "shape"
+
+
+@describe.register
+def _(value: int, other: int) -> str:
+    return "ints"
+
+
+class TestDispatchTypeHints(unittest.TestCase):
+    def test_dispatch(self):
+        self.assertEqual(describe(Circle()), "circle")
+        self.assertEqual(describe(Square()), "square")
+        self.assertEqual(describe(Shape()), "shape")
+        self.assertEqual(describe(Circle(), 2.0), "shape")
+        self.assertEqual(describe(1, 2), "ints")
+
+    def test_keyword_arguments(self):
+        self.assertEqual(describe(shape=Circle()), "circle")
+        self.assertEqual(describe(Circle(), scale=2.0), "shape")
+        self.assertEqual(describe(value=1, other=2), "ints")
+
+    def test_no_implementation(self):
+        with self.assertRaises(ParameterTypeError) as err:
+            describe("a")
+        self.assertIn("(str)", str(err.exception))
+
+        with self.assertRaises(ParameterTypeError):
+            describe(Circle(), "a")
+
+        with self.assertRaises(ParameterTypeError):
+            describe(Circle(), unknown=1)
+
+    def test_cached_by_types(self):
+        @dispatch_type_hints
+        def example(a: int) -> int:
+            return a
+
+        @example.register
+        def _(a: str) -> str:
+            return a
+
+        with count_accepts() as accepts_args:
+            for _ in range(3):
+                example(1)
+                example("a")
+        # Checked once per tuple of types
+        self.assertEqual(accepts_args.call_count, 3)
+
+    def test_value_hints_tried_in_order(self):
+        @dispatch_type_hints
+        def example(a: Range(0, 10)) -> str:
+            return "small"
+
+        @example.register
+        def _(a: List[int]) -> str:
+            return "list"
+
+        @example.register
+        def _(a: int) -> str:
+            return "large"
+
+        self.assertEqual(example(1), "small")
+        self.assertEqual(example(100), "large")
+        self.assertEqual(example(5), "small")
+        self.assertEqual(example([1]), "list")
+        with self.assertRaises(ParameterTypeError):
+            example(["a"])
+
+    def test_register_clears_cache(self):
+        @dispatch_type_hints
+        def example(a: object) -> str:
+            return "object"
+
+        self.assertEqual(example(1), "object")
+
+        @example.register
+        def _(a: int) -> str:
+            return "int"
+
+        # Earlier implementations take precedence
+        self.assertEqual(example(1), "object")
+        self.assertEqual(len(example.funcs), 2)
+
+    def test_return_validated(self):
+        @dispatch_type_hints
+        def example(a: int) -> str:
+            return a
+
+        with self.assertRaises(ReturnTypeError):
+            example(1)
+
+        with trusted_scope():
+            self.assertEqual(example(1), 1)
+
+    def test_unannotated_packed_arguments(self):
+        @dispatch_type_hints
+        def example(a: int, *rest) -> str:
+            return "rest"
+
+        @example.register
+        def _(a: int, **kw) -> str:
+            return "kw"
+
+        @example.register
+        def _(a: int, *rest: str) -> str:
+            return "str"
+
+        self.assertEqual(example(1), "rest")
+        self.assertEqual(example(1, 2), "rest")
+        self.assertEqual(example(1, x=2), "kw")
+        with self.assertRaises(ParameterTypeError):
+            example("a", 2)
+
+    def test_annotated_packed_arguments(self):
+        @dispatch_type_hints
+        def example(a: int, *rest: str) -> str:
+            return "str"
+
+        @example.register
+        def _(a: int, *rest, **kw: int) -> str:
+            return "any"
+
+        self.assertEqual(example(1, "a"), "str")
+        self.assertEqual(example(1, 2), "any")
+        self.assertEqual(example(1, x=2), "any")
+        with self.assertRaises(ParameterTypeError):
+            example(1, x="a")
+
+    def test_method(self):
+        class Example:
+            @dispatch_type_hints
+            def method(self, a: int) -> str:
+                return "int"
+
+            @method.register
+            def _(self, a: str) -> str:
+                return "str"
+
+        self.assertEqual(Example().method(1), "int")
+        self.assertEqual(Example().method("a"), "str")
+
+    def test_wrapper_attributes(self):
+        self.assertEqual(describe.__name__, "describe")
+        self.assertEqual(describe.__wrapped__.__name__, "describe")
+
+
+def count_accepts():
+    return mock.patch.object(
+        Enforcer,
+        "accepts_args",
+        autospec=True,
+        side_effect=Enforcer.accepts_args,
+    )
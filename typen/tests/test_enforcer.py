@@ -1,4 +1,7 @@
+import functools
+import typing
 import unittest
+from unittest import mock
 
 from traits.api import (
     Either,
@@ -11,7 +14,13 @@ from traits.api import (
     Tuple,
 )
 
-from typen._enforcer import Enforcer
+from typen import _enforcer
+from typen._enforcer import (
+    cached_enforcer,
+    clear_enforcer_cache,
+    Enforcer,
+    TraitCache,
+)
 from typen.exceptions import (
     ParameterTypeError,
     ReturnTypeError,
@@ -55,6 +64,16 @@ class TestEnforcer(unittest.TestCase):
             return "asd"
         Enforcer(example_function)  # No errors
 
+    def test_instantiate_does_not_modify_annotations(self):
+        def example_function(a: int, *args: str, **kwargs: float) -> float:
+            return 1.0
+        Enforcer(example_function)
+
+        self.assertEqual(
+            example_function.__annotations__,
+            {"a": int, "args": str, "kwargs": float, "return": float},
+        )
+
     def test_validate_args_vanilla_function(self):
         def example_function(a, b, c="a", d=6):
             return 1.0
@@ -236,6 +255,70 @@ class TestEnforcer(unittest.TestCase):
             str(err.exception)
         )
 
+    def test_validate_keyword_only_args(self):
+        def example_function(a: int, *, b: str, c: int = "c"):
+            pass
+        enforcer = Enforcer(example_function)
+
+        enforcer.verify_args([1], {"b": "b", "c": 2})
+
+        with self.assertRaises(ParameterTypeError) as err:
+            enforcer.verify_args([1], {"b": 2, "c": 2})
+
+        self.assertIn("The 'b' parameter", str(err.exception))
+
+        with self.assertRaises(ParameterTypeError) as err:
+            enforcer.verify_args([1], {"b": "b"})
+
+        self.assertIn("The 'c' parameter", str(err.exception))
+
+    def test_validate_packed_kwargs_with_named_kwargs(self):
+        def example_function(a: int, b: str = "b", **kwargs: float):
+            pass
+        enforcer = Enforcer(example_function)
+
+        enforcer.verify_args([], {"b": "x", "c": 1.0, "a": 1})
+
+        with self.assertRaises(ParameterTypeError) as err:
+            enforcer.verify_args([], {"c": "x", "a": 1})
+
+        self.assertEqual(
+            "The 'kwargs' keywords of 'example_function' must have values of "
+            "type <class 'float'>, but 'c':'x' <class 'str'> was specified.",
+            str(err.exception)
+        )
+
+    def test_validate_packed_args_of_method(self):
+        def example_method(self, a, *args: int):
+            pass
+        enforcer = Enforcer(example_method, ignore_self=True)
+
+        enforcer.verify_args([None, "a", 1, 2], {})
+
+        with self.assertRaises(ParameterTypeError) as err:
+            enforcer.verify_args([None, "a", "b", 2], {})
+
+        self.assertEqual(
+            "The 'args' parameters of 'example_method' must be <class 'int'>, "
+            "but a value of 'b' <class 'str'> was specified.",
+            str(err.exception)
+        )
+
+    def test_validate_wrapped_function(self):
+        def example_function(a: int, b: str = "b"):
+            pass
+
+        @functools.wraps(example_function)
+        def wrapper(*args, **kwargs):
+            return example_function(*args, **kwargs)
+        enforcer = Enforcer(wrapper)
+
+        self.assertEqual([arg.name for arg in enforcer.args], ["a", "b"])
+        self.assertEqual(enforcer.default_kwargs, {"b": "b"})
+        self.assertIsNone(enforcer.packed_args)
+        with self.assertRaises(ParameterTypeError):
+            enforcer.verify_args(["a"], {})
+
 
 class TestStrictEnforcer(unittest.TestCase):
     def test_instantiate_with_missing_parameter_hints(self):
@@ -401,3 +484,197 @@ class TestEnforcerTraits(unittest.TestCase):
         enforcer = Enforcer(example_function)
 
         enforcer.verify_args([1, ["a", "b", "c"]], {})
+
+
+class TestTraitCache(unittest.TestCase):
+    def test_identical_hints_share_validator(self):
+        cache = TraitCache()
+        either = Either(Str, Int)
+
+        self.assertIs(cache.validator(int), cache.validator(int))
+        self.assertIs(cache.validator(either), cache.validator(either))
+        self.assertIsNot(cache.validator(int), cache.validator(str))
+        self.assertIsNot(
+            cache.validator(either), cache.validator(Either(Str, Int)))
+
+    def test_validators(self):
+        cache = TraitCache()
+
+        self.assertEqual(cache.validator(int).validate(None, None, 1), 1)
+        self.assertEqual(cache.validator(Str).validate(None, None, "a"), "a")
+
+    def test_enforcers_share_validators(self):
+        def example_function1(a: int, b: str) -> int:
+            pass
+
+        def example_function2(a: str, b: int):
+            pass
+
+        cache = TraitCache()
+        enforcer1 = Enforcer(example_function1, trait_cache=cache)
+        enforcer2 = Enforcer(example_function2, trait_cache=cache)
+
+        self.assertIs(enforcer1.args[0].validator, enforcer2.args[1].validator)
+        self.assertIs(enforcer1.args[1].validator, enforcer2.args[0].validator)
+        self.assertIs(enforcer1.result_validator, enforcer1.args[0].validator)
+
+
+class TestCachedEnforcer(unittest.TestCase):
+    def setUp(self):
+        clear_enforcer_cache()
+        self.addCleanup(clear_enforcer_cache)
+
+    def make_function(self, default):
+        def example_function(a: int, b: str = default) -> int:
+            return a
+        return example_function
+
+    def test_plan_reused_for_same_code(self):
+        func1 = self.make_function("a")
+        func2 = self.make_function("b")
+
+        enforcer1 = cached_enforcer(func1)
+        enforcer2 = cached_enforcer(func2)
+
+        self.assertIsNot(enforcer1, enforcer2)
+        self.assertIs(enforcer1.args, enforcer2.args)
+        self.assertIs(enforcer1.result_validator, enforcer2.result_validator)
+        self.assertIs(enforcer2.func, func2)
+        self.assertEqual(enforcer1.default_kwargs, {"b": "a"})
+        self.assertEqual(enforcer2.default_kwargs, {"b": "b"})
+
+    def test_reused_plan_validates_own_defaults(self):
+        cached_enforcer(self.make_function("a"))
+        enforcer = cached_enforcer(self.make_function(1))
+
+        with self.assertRaises(ParameterTypeError) as err:
+            enforcer.verify_args([1], {})
+
+        self.assertEqual(
+            "The 'b' parameter of 'example_function' must be <class 'str'>, "
+            "but a value of 1 <class 'int'> was specified.",
+            str(err.exception)
+        )
+
+    def test_plan_not_reused_for_other_options(self):
+        func = self.make_function("a")
+
+        enforcer1 = cached_enforcer(func)
+        enforcer2 = cached_enforcer(func, require_args=True)
+
+        self.assertIsNot(enforcer1.args, enforcer2.args)
+
+    def test_plan_not_reused_for_other_annotations(self):
+        def make_function(hint):
+            def example_function(a: hint):
+                pass
+            return example_function
+
+        enforcer1 = cached_enforcer(make_function(int))
+        enforcer2 = cached_enforcer(make_function(str))
+
+        self.assertIsNot(enforcer1.args, enforcer2.args)
+        enforcer2.verify_args(["a"], {})
+        with self.assertRaises(ParameterTypeError):
+            enforcer2.verify_args([1], {})
+
+    def test_unhashable_annotations(self):
+        def make_function():
+            def example_function(a: [int]):
+                pass
+            return example_function
+
+        enforcer1 = cached_enforcer(make_function())
+        enforcer2 = cached_enforcer(make_function())
+
+        self.assertIsNot(enforcer1.args, enforcer2.args)
+
+    def test_strict_errors_not_cached(self):
+        def make_function():
+            def example_function(a):
+                pass
+            return example_function
+
+        for _ in range(2):
+            with self.assertRaises(UnspecifiedParameterTypeError):
+                cached_enforcer(make_function(), require_args=True)
+
+    def test_cache_bounded(self):
+        def make_function(hint):
+            def example_function(a: hint):
+                pass
+            return example_function
+
+        size = _enforcer.ENFORCER_CACHE_SIZE
+        for i in range(size + 10):
+            cached_enforcer(make_function(i))
+
+        self.assertEqual(len(_enforcer._enforcer_cache), size)
+
+
+class TestCheckOrder(unittest.TestCase):
+    def test_cheap_checks_first(self):
+        def example_function(
+                a: typing.List[int], b, c: Tuple(Int, Int), d: int):
+            pass
+
+        enforcer = Enforcer(example_function)
+        self.assertEqual([i for i, _ in enforcer.checks], [3, 2, 0])
+
+    def test_cheap_checks_rejected_first(self):
+        def example_function(a: typing.List[int], b: int):
+            pass
+
+        enforcer = Enforcer(example_function)
+        list_validator = enforcer.args[0].validator
+        with mock.patch.object(
+                type(list_validator), "validate", autospec=True) as validate:
+            self.assertFalse(enforcer.accepts_args([[1] * 10, "b"], {}))
+            validate.assert_not_called()
+            self.assertTrue(enforcer.accepts_args([[1] * 10, 1], {}))
+            validate.assert_called_once()
+
+    def test_first_invalid_parameter_reported(self):
+        def example_function(a: typing.List[int], b: Float, c: int):
+            pass
+
+        enforcer = Enforcer(example_function)
+        with self.assertRaises(ParameterTypeError) as err:
+            enforcer.verify_args([["a"], "b", "c"], {})
+        self.assertIn("'a' parameter", str(err.exception))
+
+        with self.assertRaises(ParameterTypeError) as err:
+            enforcer.verify_args([[1]], {"b": "b", "c": "c"})
+        self.assertIn("'b' parameter", str(err.exception))
+
+    def test_adaptive_order(self):
+        def example_function(a: Tuple(Int, Int), b: int, c: str):
+            pass
+
+        enforcer = Enforcer(example_function, adaptive_order=True)
+        self.assertEqual([i for i, _ in enforcer.checks], [1, 2, 0])
+        for _ in range(2):
+            self.assertFalse(enforcer.accepts_args([(1, 1), 1, 1], {}))
+        self.assertEqual([i for i, _ in enforcer.checks], [2, 1, 0])
+
+        # Errors don't depend on the order
+        with self.assertRaises(ParameterTypeError) as err:
+            enforcer.verify_args([(1, 1), "b", 1], {})
+        self.assertIn("'b' parameter", str(err.exception))
+
+    def test_fixed_order_by_default(self):
+        def example_function(a: int, b: str):
+            pass
+
+        enforcer = Enforcer(example_function)
+        for _ in range(2):
+            self.assertFalse(enforcer.accepts_args([1, 1], {}))
+        self.assertEqual([i for i, _ in enforcer.checks], [0, 1])
+
+    def test_missing_argument_rejected(self):
+        def example_function(a: int, b: str, c: str = "c"):
+            pass
+
+        enforcer = Enforcer(example_function)
+        self.assertFalse(enforcer.accepts_args([1], {}))
+        self.assertTrue(enforcer.accepts_args([1], {"b": "b"}))
@@ -0,0 +1,316 @@
+import gc
+import subprocess
+import sys
+import types
+import typing
+import unittest
+import warnings
+import weakref
+from unittest import mock
+
+from traits.api import HasTraits, Int, Str, TraitError
+from traits.trait_converters import trait_for
+
+from typen import _hints
+from typen._decorators import enforce_type_hints
+from typen._hints import (
+    compile_hint,
+    InstanceValidator,
+    LazyValidator,
+    resolve_hint,
+    TraitCache,
+    ValidationError,
+)
+from typen._lowering import IntValidator
+from typen.exceptions import (
+    ParameterTypeError,
+    ReturnTypeError,
+    UnresolvedTypeHintError,
+    UnresolvedTypeHintWarning,
+)
+
+
+class ExClass:
+    pass
+
+
+class ExSubclass(ExClass):
+    pass
+
+
+class ExHasTraits(HasTraits):
+    pass
+
+
+class ExList(list):
+    pass
+
+
+VALUES = [
+    1, True, 1.0, 1 + 0j, "a", b"a", [1], ExList(), (1,), {}, None,
+    ExClass(), ExSubclass(), ExHasTraits(), len, ExClass, object(),
+]
+
+CLASS_HINTS = [
+    int, float, complex, str, bytes, bool, list, tuple, dict, type,
+    types.FunctionType, ExClass, ExSubclass, ExHasTraits, object,
+    type(None), None,
+]
+
+
+def is_valid(validator, value):
+    try:
+        validator.validate(None, None, value)
+    except (ValidationError, TraitError):
+        return False
+    return True
+
+
+class TestCompileHint(unittest.TestCase):
+    def test_class_hints_validated_natively(self):
+        for hint in CLASS_HINTS:
+            with self.subTest(hint=hint):
+                self.assertIsInstance(compile_hint(hint), InstanceValidator)
+
+    def test_class_hints_match_traits(self):
+        for hint in CLASS_HINTS:
+            native = compile_hint(hint)
+            trait = trait_for(hint)
+            for value in VALUES:
+                with self.subTest(hint=hint, value=value):
+                    self.assertEqual(
+                        is_valid(native, value), is_valid(trait, value))
+
+    def test_class_validators_shared(self):
+        self.assertIs(compile_hint(int), compile_hint(int))
+        self.assertIs(compile_hint(ExClass), compile_hint(ExClass))
+        self.assertIs(compile_hint(None), compile_hint(type(None)))
+        self.assertIsNot(compile_hint(Int), compile_hint(Int))
+
+    def test_local_class_validators_not_kept_alive(self):
+        class Temporary:
+            pass
+        self.assertIsNot(compile_hint(Temporary), compile_hint(Temporary))
+        temporary_ref = weakref.ref(Temporary)
+
+        del Temporary
+        gc.collect()
+
+        self.assertIsNone(temporary_ref())
+
+    def test_trait_hints(self):
+        self.assertIsInstance(compile_hint(Str), InstanceValidator)
+        self.assertIsInstance(compile_hint(Int()), IntValidator)
+        self.assertIn(TraitError, _hints.VALIDATION_ERRORS)
+
+    def test_native_validation_error(self):
+        with self.assertRaises(ValidationError):
+            compile_hint(int).validate(None, None, "a")
+
+
+POSTPONED_SOURCE = """
+from __future__ import annotations
+
+from typing import List, Optional
+
+from typen import enforce_type_hints
+
+
+@enforce_type_hints
+def make_nodes(number: int) -> List[Node]:
+    return [Node() for _ in range(number)]
+
+
+class Node:
+    @enforce_type_hints
+    def add(self, child: Node) -> Node:
+        return child
+
+    @enforce_type_hints
+    def missing(self, value: Undefined):
+        return value
+
+
+@enforce_type_hints
+def link(node: Optional[Node], nodes: List[Node] = []) -> Optional[Node]:
+    return node
+
+
+@enforce_type_hints
+def link_later(node: Optional[Later]):
+    return node
+"""
+
+
+class TestStringHints(unittest.TestCase):
+    def setUp(self):
+        self.module = types.ModuleType("typen_postponed_example")
+        sys.modules[self.module.__name__] = self.module
+        self.addCleanup(sys.modules.pop, self.module.__name__)
+        exec(POSTPONED_SOURCE, vars(self.module))
+
+    def test_postponed_annotations(self):
+        nodes = self.module.make_nodes(2)
+        self.assertEqual(len(nodes), 2)
+        with self.assertRaises(ParameterTypeError):
+            self.module.make_nodes("2")
+
+    def test_forward_reference_to_class_being_defined(self):
+        node = self.module.Node()
+        self.assertIs(node.add(node), node)
+        with self.assertRaises(ParameterTypeError) as err:
+            node.add(1)
+        self.assertIn("'Node'", str(err.exception))
+
+    def test_unresolved_name(self):
+        with self.assertWarns(UnresolvedTypeHintWarning) as warning:
+            self.assertEqual(self.module.Node().missing(1), 1)
+        self.assertIn("Undefined", str(warning.warning))
+
+        # Not validated, and not looked up again
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(self.module.Node().missing("a"), "a")
+
+    def test_unresolved_name_while_importing(self):
+        self.module.__spec__ = types.SimpleNamespace(_initializing=True)
+        with self.assertRaises(UnresolvedTypeHintError) as err:
+            self.module.Node().missing(1)
+        self.assertIn("Undefined", str(err.exception))
+
+        # Resolved once the name is defined
+        self.module.Undefined = int
+        self.module.Node().missing(1)
+        with self.assertRaises(ParameterTypeError):
+            self.module.Node().missing("a")
+
+    def test_nested_forward_references(self):
+        node = self.module.Node()
+        self.assertIs(self.module.link(node, [node]), node)
+        self.assertIsNone(self.module.link(None))
+        for args in [(1,), ([1],), (node, [1]), (node, [None])]:
+            with self.subTest(args=args):
+                with self.assertRaises(ParameterTypeError):
+                    self.module.link(*args)
+
+        # Resolved when the first value is validated
+        self.module.Later = ExClass
+        self.module.link_later(ExClass())
+        with self.assertRaises(ParameterTypeError):
+            self.module.link_later(1)
+
+    def test_local_classes(self):
+        def factory():
+            class Local:
+                pass
+
+            @enforce_type_hints
+            def uses_local(value: "Local") -> "Local":
+                return Local()
+
+            @enforce_type_hints
+            def unresolved(value: "Local", other: int):
+                return value
+
+            return Local, uses_local, unresolved
+
+        Local, uses_local, unresolved = factory()
+        uses_local(Local())
+        with self.assertRaises(ParameterTypeError):
+            uses_local(1)
+
+        # Names that are only in the function's annotations aren't in its
+        # closure, so the parameter is skipped with a warning
+        with self.assertWarns(UnresolvedTypeHintWarning):
+            self.assertEqual(unresolved(1, 2), 1)
+        with self.assertRaises(ParameterTypeError):
+            unresolved(1, "a")
+
+    def test_forward_reference_in_typing_hint(self):
+        namespace = {"ExClass": ExClass}
+        validator = TraitCache().validator(
+            typing.List["ExClass"], namespace)
+        validator.validate(None, None, [ExClass()])
+        with self.assertRaises(ValidationError):
+            validator.validate(None, None, [1])
+        with self.assertRaises(ValidationError):
+            validator.validate(None, None, [None])
+
+        # Not shared with other namespaces
+        validator = TraitCache().validator(
+            typing.List["ExClass"], {"ExClass": int})
+        validator.validate(None, None, [1])
+
+    def test_resolved_once_per_module(self):
+        namespace = vars(self.module)
+        hint = resolve_hint("List[Node]", namespace)
+        with mock.patch("builtins.eval") as mock_eval:
+            self.assertIs(resolve_hint("List[Node]", namespace), hint)
+        mock_eval.assert_not_called()
+
+    def test_other_namespaces_not_cached(self):
+        self.assertIs(resolve_hint("ExClass", {"ExClass": ExClass}), ExClass)
+        self.assertIs(
+            resolve_hint("ExClass", {"ExClass": ExSubclass}), ExSubclass)
+
+    def test_lazy_validator(self):
+        namespace = {}
+        validator = TraitCache().validator("LaterClass", namespace)
+        self.assertIsInstance(validator, LazyValidator)
+
+        namespace["LaterClass"] = ExClass
+        validator.validate(None, None, ExClass())
+        with self.assertRaises(ValidationError):
+            validator.validate(None, None, 1)
+
+    def test_return_hint(self):
+        @enforce_type_hints
+        def example_function(a) -> "int":
+            return a
+
+        example_function(1)
+        with self.assertRaises(ReturnTypeError):
+            example_function("a")
+
+
+class TestLazyTraitsImport(unittest.TestCase):
+    def run_python(self, code):
+        return subprocess.run(
+            [sys.executable, "-c", code],
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        ).stdout.strip()
+
+    def test_import_without_traits(self):
+        output = self.run_python(
+            "import sys, typen; print('traits' in sys.modules)")
+
+        self.assertEqual(output, "False")
+
+    def test_class_hints_without_traits(self):
+        output = self.run_python(
+            "import sys, typen\n"
+            "@typen.enforce_type_hints\n"
+            "def f(a: int, b: float = 1) -> str:\n"
+            "    return str(a + b)\n"
+            "f(1)\n"
+            "print('traits' in sys.modules)"
+        )
+
+        self.assertEqual(output, "False")
+
+    def test_traits_loaded_for_trait_hints(self):
+        output = self.run_python(
+            "import sys, typen\n"
+            "from traits.api import Str\n"
+            "@typen.enforce_type_hints\n"
+            "def f(a: Str):\n"
+            "    return a\n"
+            "try:\n"
+            "    f(1)\n"
+            "except typen.exceptions.ParameterTypeError:\n"
+            "    print('raised')\n"
+        )
+
+        self.assertEqual(output, "raised")
@@ -0,0 +1,228 @@
+import importlib
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+import textwrap
+import unittest
+
+from typen._decorators import compile_type_hints, EnforceTypeHints
+from typen._import_hook import (
+    enforce_module_type_hints,
+    install_import_hook,
+    TypenImportHook,
+)
+from typen.exceptions import (
+    ParameterTypeError,
+    ReturnTypeError,
+    UnspecifiedParameterTypeError,
+)
+
+MODULE_SOURCE = textwrap.dedent("""
+    from os.path import join
+
+
+    def hinted(a: int) -> int:
+        "Docstring of hinted."
+        return a
+
+
+    def unhinted(a):
+        return a
+
+
+    def partly_hinted(a, b: int):
+        return b
+
+
+    class ExClass:
+        def __init__(self, a: int):
+            self.a = a
+
+        def ex_method(self, b: int) -> int:
+            "Docstring of ex_method."
+            return self.a + b
+
+        @classmethod
+        def ex_class_method(cls, b: int) -> int:
+            return b
+
+        @staticmethod
+        def ex_static_method(b: int) -> int:
+            return b
+""")
+
+
+class TestImportHook(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        package_dir = os.path.join(tmp_dir.name, "typen_hook_pkg")
+        os.mkdir(package_dir)
+        with open(os.path.join(package_dir, "__init__.py"), "w") as fh:
+            fh.write("")
+        for name in ["enforced", "excluded"]:
+            with open(os.path.join(package_dir, name + ".py"), "w") as fh:
+                fh.write(MODULE_SOURCE)
+
+        sys.path.insert(0, tmp_dir.name)
+        self.addCleanup(sys.path.remove, tmp_dir.name)
+        self.addCleanup(self.unload)
+
+    def unload(self):
+        for name in list(sys.modules):
+            if name.startswith("typen_hook_pkg"):
+                del sys.modules[name]
+        importlib.invalidate_caches()
+
+    def install(self, *args, **kwargs):
+        hook = install_import_hook(*args, **kwargs)
+        self.addCleanup(hook.uninstall)
+        return hook
+
+    def test_enforce_matching_modules(self):
+        self.install(["typen_hook_pkg.*"], exclude=["*.excluded"])
+
+        from typen_hook_pkg import enforced, excluded
+
+        self.assertIsInstance(enforced.hinted._typen_hints, EnforceTypeHints)
+        self.assertIsInstance(
+            enforced.partly_hinted._typen_hints, EnforceTypeHints)
+        self.assertFalse(hasattr(enforced.unhinted, "_typen_hints"))
+        self.assertFalse(hasattr(enforced.join, "_typen_hints"))
+        self.assertFalse(hasattr(excluded.hinted, "_typen_hints"))
+
+        self.assertEqual(enforced.hinted(1), 1)
+        with self.assertRaises(ParameterTypeError):
+            enforced.hinted("a")
+        self.assertEqual(excluded.hinted("a"), "a")
+
+    def test_enforcers_built_lazily(self):
+        self.install(["typen_hook_pkg.enforced"])
+
+        from typen_hook_pkg import enforced
+
+        self.assertIsNone(enforced.hinted._typen_hints.enforcer)
+        enforced.hinted(1)
+        self.assertIsNotNone(enforced.hinted._typen_hints.enforcer)
+
+    def test_functions_keep_metadata(self):
+        self.install(["typen_hook_pkg.enforced"])
+
+        from typen_hook_pkg import enforced
+
+        for func, name in [
+                (enforced.hinted, "hinted"),
+                (enforced.ExClass.ex_method, "ExClass.ex_method")]:
+            with self.subTest(name=name):
+                self.assertEqual(func.__qualname__, name)
+                self.assertEqual(func.__module__, "typen_hook_pkg.enforced")
+                self.assertEqual(func.__doc__, "Docstring of {}.".format(
+                    name.split(".")[-1]))
+                self.assertIsNotNone(func.__wrapped__)
+
+        self.assertEqual(enforced.hinted.__name__, "hinted")
+        self.assertEqual(
+            str(inspect.signature(enforced.hinted)), "(a: int) -> int")
+        self.assertEqual(
+            str(inspect.signature(enforced.ExClass(1).ex_method)),
+            "(b: int) -> int")
+
+    def test_compile_hooked_class(self):
+        self.install(["typen_hook_pkg.enforced"])
+
+        from typen_hook_pkg import enforced
+
+        self.assertEqual(compile_type_hints(enforced.ExClass), 4)
+        self.assertIsNotNone(enforced.ExClass.ex_method._typen_hints.enforcer)
+
+    def test_functions_pickled_by_reference(self):
+        self.install(["typen_hook_pkg.enforced"])
+
+        from typen_hook_pkg import enforced
+
+        for func in [enforced.hinted, enforced.ExClass.ex_method]:
+            with self.subTest(func=func):
+                self.assertIs(pickle.loads(pickle.dumps(func)), func)
+
+    def test_enforce_methods(self):
+        self.install(["typen_hook_pkg.enforced"])
+
+        from typen_hook_pkg import enforced
+
+        inst = enforced.ExClass(1)
+        self.assertEqual(inst.ex_method(2), 3)
+        self.assertEqual(inst.ex_class_method(2), 2)
+        self.assertEqual(enforced.ExClass.ex_class_method(2), 2)
+        self.assertEqual(enforced.ExClass.ex_static_method(2), 2)
+
+        with self.assertRaises(ParameterTypeError):
+            enforced.ExClass("a")
+        with self.assertRaises(ParameterTypeError):
+            inst.ex_method("a")
+        with self.assertRaises(ParameterTypeError):
+            enforced.ExClass.ex_class_method("a")
+        with self.assertRaises(ParameterTypeError):
+            inst.ex_static_method("a")
+
+    def test_sample_mode(self):
+        self.install(["typen_hook_pkg.*"], mode="sample", sample_every=3)
+
+        from typen_hook_pkg import enforced
+
+        with self.assertRaises(ParameterTypeError):
+            enforced.hinted("a")
+        self.assertEqual(enforced.hinted("a"), "a")
+        self.assertEqual(enforced.hinted("a"), "a")
+        with self.assertRaises(ParameterTypeError):
+            enforced.hinted("a")
+
+    def test_disabled_mode(self):
+        self.install(["typen_hook_pkg.*"], mode="disabled")
+
+        from typen_hook_pkg import enforced
+
+        self.assertEqual(enforced.hinted("a"), "a")
+
+    def test_strict(self):
+        self.install(["typen_hook_pkg.*"], strict=True)
+
+        from typen_hook_pkg import enforced
+
+        with self.assertRaises(UnspecifiedParameterTypeError):
+            enforced.partly_hinted(1, 2)
+
+    def test_uninstall(self):
+        hook = self.install(["typen_hook_pkg.*"])
+        hook.uninstall()
+
+        from typen_hook_pkg import enforced
+
+        self.assertEqual(enforced.hinted("a"), "a")
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            TypenImportHook(["typen_hook_pkg"], mode="sometimes")
+
+
+class TestEnforceModuleTypeHints(unittest.TestCase):
+    def test_enforce_module(self):
+        module = type(sys)("typen_example_module")
+        exec(MODULE_SOURCE, vars(module))
+
+        enforce_module_type_hints(module)
+
+        with self.assertRaises(ParameterTypeError):
+            module.hinted("a")
+        with self.assertRaises(ParameterTypeError):
+            module.ExClass(1).ex_method("a")
+
+    def test_enforce_module_return(self):
+        module = type(sys)("typen_example_module")
+        exec("def give_int(a) -> int:\n    return a\n", vars(module))
+
+        enforce_module_type_hints(module)
+
+        with self.assertRaises(ReturnTypeError):
+            module.give_int("a")
@@ -0,0 +1,155 @@
+import decimal
+import fractions
+import unittest
+
+import numpy as np
+from traits.api import (
+    Any,
+    Bool,
+    Either,
+    Enum,
+    Float,
+    HasTraits,
+    Instance,
+    Int,
+    List,
+    Range,
+    Str,
+    TraitError,
+    Tuple,
+    Union,
+)
+from traits.trait_converters import trait_for
+
+from typen._hints import compile_hint, InstanceValidator, ValidationError
+from typen._lowering import (
+    EnumValidator,
+    lower_trait,
+    RangeValidator,
+)
+from typen._typing import UnionValidator
+
+
+class ExClass:
+    pass
+
+
+class ExHasTraits(HasTraits):
+    value = Int()
+
+
+class Index:
+    def __index__(self):
+        return 3
+
+
+class Floatable:
+    def __float__(self):
+        return 3.0
+
+
+class IntSubclass(int):
+    pass
+
+
+class FloatSubclass(float):
+    pass
+
+
+VALUES = [
+    0, 1, 2, 3, 5, 10, 11, -1, True, False,
+    0.0, 0.5, 1.0, 2.0, 10.0, 10.5, -0.5, float("nan"), float("inf"),
+    1j, "a", "foo", b"a", None, [1], [], (), (1,), ("a", 1), ("a", "b"),
+    ("a", 1, 2), {}, {1}, ExClass(), ExHasTraits(), Index(), Floatable(),
+    IntSubclass(2), FloatSubclass(2.0), np.int64(2), np.float64(0.5),
+    np.float32(2), np.bool_(True), decimal.Decimal(2), fractions.Fraction(1),
+]
+
+TRAITS = [
+    Int, Float, Str, Bool, Any,
+    Int(), Instance(ExClass), Instance(ExClass, allow_none=False),
+    Either(Str, Int),
+    Either(Str, Int, None),
+    Either(Float, Instance(ExClass)),
+    Either(List(Int), Str),
+    Either(Float, Int),
+    Either(Str, Float, Int),
+    Union(Str, Int),
+    Union(None, Float, Tuple(Int, Str)),
+    Enum(2, 5, "foo"),
+    Enum(1, [1], None),
+    Enum(0.5, True),
+    Tuple(Str, Either(Str, Int)),
+    Tuple(Int, Int, Int),
+    Tuple(List(Int)),
+    Tuple(),
+    Range(0, 10),
+    Range(0, 10, exclude_low=True, exclude_high=True),
+    Range(low=0),
+    Range(high=10),
+    Range(0.0, 10.0),
+    Range(0.0, 10.0, exclude_low=True),
+    Range(0.0, 10.0, exclude_high=True),
+    Range(low=0.0),
+]
+
+
+def result(validator, value):
+    try:
+        validator.validate(None, None, value)
+    except (ValidationError, TraitError):
+        return False
+    return True
+
+
+class TestLowerTrait(unittest.TestCase):
+    def test_same_results_as_traits(self):
+        for trait in TRAITS:
+            ctrait = trait_for(trait)
+            lowered = compile_hint(trait)
+            for value in VALUES:
+                with self.subTest(trait=trait, value=value):
+                    self.assertEqual(
+                        result(lowered, value), result(ctrait, value))
+
+    def test_either(self):
+        validator = compile_hint(Either(Str, Instance(ExClass)))
+        self.assertIsInstance(validator, InstanceValidator)
+        self.assertEqual(validator.types, (str, ExClass))
+        self.assertTrue(validator.allow_none)
+
+    def test_enum(self):
+        validator = compile_hint(Enum(2, 5, "foo"))
+        self.assertIsInstance(validator, EnumValidator)
+
+    def test_either_with_numbers(self):
+        validator = compile_hint(Either(Str, Int))
+        self.assertIsInstance(validator, UnionValidator)
+        self.assertEqual(validator.exact_types, {str, int})
+
+        # Ints are converted by the Float member before reaching Int
+        validator = compile_hint(Either(Str, Float, Int))
+        self.assertEqual(validator.exact_types, {str, float})
+        value = validator.validate(None, None, 1)
+        self.assertEqual(value, 1.0)
+        self.assertIs(type(value), float)
+
+    def test_range(self):
+        for trait in [Range(0, 10), Range(0.0, 1.0)]:
+            with self.subTest(trait=trait):
+                validator = compile_hint(trait)
+                self.assertIsInstance(validator, RangeValidator)
+
+    def test_not_lowered(self):
+        class ExHasTraitsRange(HasTraits):
+            low = Int(0)
+            value = Range(low="low", high=10)
+
+        for trait in [
+                List(Int),
+                Tuple(Str, Int),
+                ExHasTraitsRange.class_traits()["value"],
+        ]:
+            ctrait = trait_for(trait)
+            with self.subTest(trait=trait):
+                self.assertIs(lower_trait(ctrait), ctrait)
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from typen._decorators import enforce_type_hints
+from typen._metrics import (
+    collect_metrics,
+    disable_metrics,
+    enable_metrics,
+    export_metrics,
+    reset_metrics,
+)
+from typen.exceptions import ParameterTypeError, ReturnTypeError
+
+
+def example_function(a: int, *args: str, **kwargs: float) -> int:
+    return a
+
+
+LABEL = "{}.example_function".format(__name__)
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        reset_metrics()
+        enable_metrics()
+        self.addCleanup(disable_metrics)
+        self.addCleanup(reset_metrics)
+        self.func = enforce_type_hints(example_function)
+
+    def test_calls_counted(self):
+        self.func(1)
+        self.func(2)
+
+        self.assertEqual(collect_metrics(), {("calls", LABEL): 2})
+
+    def test_disabled_not_counted(self):
+        disable_metrics()
+        self.func(1)
+
+        self.assertEqual(collect_metrics(), {})
+
+    def test_violations_counted(self):
+        with self.assertRaises(ParameterTypeError):
+            self.func("a")
+        with self.assertRaises(ParameterTypeError):
+            self.func(1, 2)
+        with self.assertRaises(ParameterTypeError):
+            self.func(1, b="b")
+
+        metrics = collect_metrics()
+        self.assertEqual(metrics[("calls", LABEL)], 3)
+        self.assertEqual(metrics[("parameter_violations", LABEL, "a")], 1)
+        self.assertEqual(metrics[("parameter_violations", LABEL, "args")], 1)
+        self.assertEqual(
+            metrics[("parameter_violations", LABEL, "kwargs")], 1)
+        self.assertEqual(
+            metrics[("type_violations", LABEL, "a", "builtins.str")], 1)
+        self.assertEqual(
+            metrics[("type_violations", LABEL, "args", "builtins.int")], 1)
+
+    def test_return_violations_counted(self):
+        def give_int(a) -> int:
+            return a
+        func = enforce_type_hints(give_int)
+        label = "{}.{}".format(__name__, give_int.__qualname__)
+
+        with self.assertRaises(ReturnTypeError):
+            func(1.5)
+
+        metrics = collect_metrics()
+        self.assertEqual(
+            metrics[("parameter_violations", label, "return")], 1)
+        self.assertEqual(
+            metrics[("type_violations", label, "return", "builtins.float")],
+            1,
+        )
+
+    def test_thread_shards_merged(self):
+        def worker():
+            for _ in range(100):
+                self.func(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(collect_metrics(), {("calls", LABEL): 400})
+
+    def test_export_text_format(self):
+        self.func(1)
+        with self.assertRaises(ParameterTypeError):
+            self.func("a")
+
+        text = export_metrics()
+
+        self.assertIn(
+            "# TYPE typen_calls_validated_total counter\n"
+            'typen_calls_validated_total{{function="{}"}} 2\n'.format(LABEL),
+            text,
+        )
+        self.assertIn(
+            'typen_parameter_violations_total{{function="{}",'
+            'parameter="a"}} 1\n'.format(LABEL),
+            text,
+        )
+        self.assertIn(
+            'typen_type_violations_total{{function="{}",parameter="a",'
+            'type="builtins.str"}} 1\n'.format(LABEL),
+            text,
+        )
+
+    def test_export_to_file(self):
+        self.func(1)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "typen.prom")
+            text = export_metrics(path)
+
+            with open(path) as fh:
+                self.assertEqual(fh.read(), text)
+            self.assertEqual(os.listdir(tmp_dir), ["typen.prom"])
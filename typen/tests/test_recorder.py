@@ -0,0 +1,174 @@
+import unittest
+
+from traits.api import Either
+
+from typen._decorators import record_type_hints
+from typen._recorder import TypeRecorder
+from typen.exceptions import ParameterTypeError
+
+
+class TestTypeRecorder(unittest.TestCase):
+    def test_record_types(self):
+        def example_function(a, b, *args, **kwargs):
+            return a
+
+        recorder = TypeRecorder()
+        recorder.bind(example_function)
+
+        self.assertTrue(recorder.observe_args((1, "a", 2.0), {"c": None}))
+        recorder.observe_result(1)
+
+        self.assertEqual(
+            recorder.observed,
+            {
+                "a": {int: 1},
+                "b": {str: 1},
+                "args": {float: 1},
+                "kwargs": {type(None): 1},
+                "return": {int: 1},
+            },
+        )
+
+    def test_sampling(self):
+        def example_function(a):
+            return a
+
+        recorder = TypeRecorder(sample_every=3)
+        recorder.bind(example_function)
+
+        sampled = [recorder.observe_args((i,), {}) for i in range(7)]
+
+        self.assertEqual(
+            sampled, [True, False, False, True, False, False, True])
+        self.assertEqual(recorder.num_sampled, 3)
+        self.assertEqual(recorder.observed["a"], {int: 3})
+
+    def test_invalid_sample_every(self):
+        with self.assertRaises(ValueError):
+            TypeRecorder(sample_every=0)
+
+    def test_invalid_call_not_sampled(self):
+        def example_function(a):
+            return a
+
+        recorder = TypeRecorder()
+        recorder.bind(example_function)
+
+        self.assertFalse(recorder.observe_args((1, 2), {}))
+        self.assertEqual(recorder.num_sampled, 0)
+
+    def test_suggest_hints(self):
+        def example_function(a, b, c):
+            return a
+
+        recorder = TypeRecorder()
+        recorder.bind(example_function)
+        recorder.observe_args((1, None, "a"), {})
+        recorder.observe_args((2, 1.0, "b"), {})
+        recorder.observe_args((3, 2.0), {"c": "c"})
+
+        hints = recorder.suggest_hints()
+
+        self.assertEqual(set(hints), {"a", "b", "c"})
+        self.assertIs(hints["a"], int)
+        self.assertIsInstance(hints["b"], Either)
+        self.assertIs(hints["c"], str)
+        self.assertEqual(
+            recorder.suggested_signature(),
+            "(a: int, b: Either(float, None), c: str)",
+        )
+
+
+class TestRecordTypeHints(unittest.TestCase):
+    def test_record_function(self):
+        def example_function(a, b: int = 0):
+            return a + b
+
+        new_func = record_type_hints()(example_function)
+        new_func(1)
+        new_func(1.5, 2)
+
+        self.assertEqual(
+            new_func.recorder.suggested_signature(),
+            "(a: Either(int, float), b: int) -> Either(int, float)",
+        )
+
+    def test_bare_decorator(self):
+        @record_type_hints
+        def example_function(a: int):
+            return a
+
+        self.assertEqual(example_function(1), 1)
+        with self.assertRaises(ParameterTypeError):
+            example_function("a")
+        self.assertEqual(
+            example_function.recorder.observed["a"], {int: 1, str: 1})
+
+    def test_hints_still_enforced(self):
+        def example_function(a: int):
+            return a
+
+        new_func = record_type_hints()(example_function)
+
+        with self.assertRaises(ParameterTypeError):
+            new_func("a")
+
+        self.assertEqual(new_func.recorder.observed["a"], {str: 1})
+
+    def test_record_method(self):
+        class ExClass:
+            @record_type_hints(sample_every=2)
+            def ex_method(self, a):
+                return str(a)
+
+        ex = ExClass()
+        for i in range(4):
+            ex.ex_method(i)
+
+        recorder = ExClass.ex_method.recorder
+        self.assertEqual(recorder.num_sampled, 2)
+        self.assertEqual(
+            recorder.suggested_signature(), "(self, a: int) -> str")
+        self.assertEqual(recorder.suggest_hints(), {"a": int, "return": str})
+
+    def test_suggested_hints_are_enforceable(self):
+        def example_function(a):
+            return a
+
+        new_func = record_type_hints()(example_function)
+        new_func(1)
+        new_func(None)
+
+        hint = new_func.recorder.suggest_hints()["a"]
+
+        def hinted_function(a: hint):
+            return a
+
+        checked_func = record_type_hints()(hinted_function)
+        checked_func(2)
+        checked_func(None)
+        with self.assertRaises(ParameterTypeError):
+            checked_func("a")
+
+        def example_function(a, b=2):
+            return a
+
+        new_func = record_type_hints()(example_function)
+        new_func(1, b=None)
+
+        recorder = new_func.recorder
+        self.assertEqual(
+            recorder.suggested_signature(),
+            "(a: int, b: Either(None, int)) -> int",
+        )
+        hint = recorder.suggest_hints()["b"]
+
+        def hinted_function(a, b: hint = 2):
+            return a
+
+        # The call relies on the default value
+        checked_func = record_type_hints()(hinted_function)
+        self.assertEqual(checked_func(1), 1)
+        checked_func(1, None)
+        with self.assertRaises(ParameterTypeError):
+            checked_func(1, "a")
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import unittest
+
+from typen._decorators import (
+    enforce_type_hints,
+    EnforceTypeHints,
+    record_type_hints,
+)
+from typen._scope import trusted_scope
+from typen.exceptions import ParameterTypeError, ReturnTypeError
+
+
+def example_function(a: int) -> int:
+    return a
+
+
+class TestTrustedScope(unittest.TestCase):
+    def setUp(self):
+        self.func = enforce_type_hints(example_function)
+
+    def test_trusted_scope(self):
+        with trusted_scope():
+            self.assertEqual(self.func("a"), "a")
+
+        with self.assertRaises(ParameterTypeError):
+            self.func("a")
+
+    def test_nested_scopes(self):
+        with trusted_scope():
+            with trusted_scope():
+                self.func("a")
+            self.func("a")
+
+        with self.assertRaises(ParameterTypeError):
+            self.func("a")
+
+    def test_scope_ended_by_exception(self):
+        with self.assertRaises(KeyError):
+            with trusted_scope():
+                raise KeyError()
+
+        with self.assertRaises(ParameterTypeError):
+            self.func("a")
+
+    def test_methods(self):
+        class ExClass:
+            @enforce_type_hints
+            def ex_method(self, a: int) -> int:
+                return a
+
+        with trusted_scope():
+            self.assertEqual(ExClass().ex_method("a"), "a")
+
+        with self.assertRaises(ParameterTypeError):
+            ExClass().ex_method("a")
+
+    def test_other_threads_not_trusted(self):
+        errors = []
+
+        def target():
+            try:
+                self.func("a")
+            except ParameterTypeError as error:
+                errors.append(error)
+
+        with trusted_scope():
+            thread = threading.Thread(target=target)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(len(errors), 1)
+
+    def test_other_tasks_not_trusted(self):
+        results = []
+
+        async def untrusted(event):
+            await event.wait()
+            try:
+                self.func("a")
+            except ParameterTypeError:
+                results.append("untrusted")
+
+        async def trusted(event):
+            with trusted_scope():
+                event.set()
+                await asyncio.sleep(0)
+                self.func("a")
+                results.append("trusted")
+
+        async def main():
+            event = asyncio.Event()
+            await asyncio.gather(untrusted(event), trusted(event))
+
+        asyncio.run(main())
+        self.assertEqual(sorted(results), ["trusted", "untrusted"])
+
+    def test_sampled_and_recorded_functions(self):
+        sampled = EnforceTypeHints(
+            example_function,
+            require_args=False,
+            require_return=False,
+            sample_every=2,
+        )
+        recorded = record_type_hints()(example_function)
+        with trusted_scope():
+            for _ in range(2):
+                self.assertEqual(sampled("a"), "a")
+                self.assertEqual(recorded("a"), "a")
+
+
+class TestUnchecked(unittest.TestCase):
+    def test_function(self):
+        func = enforce_type_hints(example_function)
+        self.assertIs(func.unchecked, example_function)
+        self.assertEqual(func.unchecked("a"), "a")
+
+    def test_method(self):
+        class ExClass:
+            @enforce_type_hints
+            def ex_method(self, a: int) -> int:
+                return "a"
+
+        inst = ExClass()
+        self.assertEqual(ExClass.ex_method.unchecked(inst, "a"), "a")
+        with self.assertRaises(ReturnTypeError):
+            inst.ex_method(1)
@@ -0,0 +1,357 @@
+import collections
+import gc
+import sys
+import typing
+import unittest
+import weakref
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from unittest import mock
+
+from traits.api import Int
+
+from typen import _hints
+from typen._decorators import enforce_type_hints
+from typen._hints import (
+    compile_hint,
+    InstanceValidator,
+    MISSING,
+    TraitCache,
+    ValidationError,
+)
+from typen._typing import compile_typing_hint
+from typen.exceptions import ParameterTypeError, ReturnTypeError
+
+
+class ExClass:
+    pass
+
+
+class ExSubclass(ExClass):
+    pass
+
+
+def is_valid(validator, value):
+    try:
+        validator.validate(None, None, value)
+    except _hints.VALIDATION_ERRORS:
+        return False
+    return True
+
+
+def error_of(validator, value):
+    try:
+        validator.validate(None, None, value)
+    except ValidationError as error:
+        return error
+    raise AssertionError("{!r} is valid".format(value))
+
+
+Number = TypeVar("Number", int, float)
+Bounded = TypeVar("Bounded", bound=ExClass)
+UserId = typing.NewType("UserId", int)
+ExClassId = typing.NewType("ExClassId", ExClass)
+
+#: Hints with values they accept and values they reject
+CASES = [
+    (Any, [1, None, "a"], []),
+    (List[int], [[], [1, True]], [None, (1,), [1.0], ["a"]]),
+    (List[float], [[1.0, 1]], [[1j]]),
+    (List[ExClass], [[ExClass(), ExSubclass()]], [[None], [1]]),
+    (List[Optional[ExClass]], [[ExClass(), None]], [[1]]),
+    (List[List[str]], [[["a"], []]], [[["a", 1]], [("a",)]]),
+    (Sequence[int], [[1], (1,), range(3)], ["a", {1}]),
+    (Set[str], [{"a"}, set()], [frozenset(["a"]), {1}]),
+    (FrozenSet[int], [frozenset([1])], [{1}]),
+    (Dict[str, float], [{}, {"a": 1.0, "b": 1}], [{1: 1.0}, {"a": "b"}, []]),
+    (
+        Mapping[str, int],
+        [{"a": 1}, collections.OrderedDict(a=1)],
+        [{"a": 1.0}],
+    ),
+    (Optional[int], [1, None], [1.0, "a"]),
+    (Union[int, str], [1, "a"], [None, 1.0]),
+    (Union[List[int], str], [[1], "a"], [["a"], 1]),
+    (Tuple[int, str], [(1, "a")], [(1,), (1, "a", 1), ("a", 1), [1, "a"]]),
+    (Tuple[int, ...], [(), (1, 2)], [(1, "a"), [1]]),
+    (Tuple[()], [()], [(1,)]),
+    (Tuple, [(), (1, "a")], [[]]),
+    (List, [[], [1, "a"]], [()]),
+    (Type[ExClass], [ExClass, ExSubclass], [ExClass(), int]),
+    (Iterator[int], [iter([1]), iter(["a"])], [[1]]),
+    (Number, [1, 1.0], ["a"]),
+    (Bounded, [ExSubclass()], [1]),
+    (typing.ClassVar[int], [1], ["a"]),
+    (List[Int], [[1]], [["a"]]),
+    (UserId, [1], [None, "a"]),
+    (Optional[UserId], [1, None], ["a"]),
+    (List[typing.NewType("UserIds", UserId)], [[1]], [[None], ["a"]]),
+    (ExClassId, [ExClass(), None], [1]),
+    (List[ExClassId], [[ExClass()]], [[None], [1]]),
+]
+
+if sys.version_info >= (3, 8):
+    CASES += [
+        (typing.Literal["a", 1], ["a", 1], ["b", 2, True, 1.0, [1]]),
+        (typing.Literal[True], [True], [1]),
+    ]
+
+if sys.version_info >= (3, 9):
+    CASES += [
+        (list[int], [[1]], [["a"], (1,)]),
+        (dict[str, int], [{"a": 1}], [{"a": "b"}]),
+        (tuple[int, ...], [(1,)], [("a",)]),
+    ]
+
+if sys.version_info >= (3, 10):
+    CASES += [
+        (int | None, [1, None], ["a"]),
+        (List[int] | str, [[1], "a"], [1]),
+    ]
+
+
+class TestCompileTypingHint(unittest.TestCase):
+    def test_validation(self):
+        for hint, valid, invalid in CASES:
+            validator = compile_hint(hint)
+            for value in valid:
+                with self.subTest(hint=hint, value=value):
+                    self.assertTrue(is_valid(validator, value))
+            for value in invalid:
+                with self.subTest(hint=hint, value=value):
+                    self.assertFalse(is_valid(validator, value))
+
+    def test_translated_once(self):
+        self.assertIs(
+            compile_typing_hint(List[int]), compile_typing_hint(List[int]))
+        self.assertIs(
+            TraitCache().validator(Dict[str, float]),
+            TraitCache().validator(Dict[str, float]),
+        )
+
+    def test_local_classes_not_kept(self):
+        class LocalClass:
+            pass
+
+        self.assertIsNot(
+            compile_typing_hint(List[LocalClass]),
+            compile_typing_hint(List[LocalClass]),
+        )
+
+    def test_unions_of_classes_checked_at_once(self):
+        validator = compile_hint(Optional[Union[int, str]])
+        self.assertIsInstance(validator, InstanceValidator)
+        self.assertEqual(validator.types, (int, str, type(None)))
+
+    def test_plain_classes_not_translated(self):
+        self.assertIsNone(compile_typing_hint(ExClass))
+
+
+class TestEnforceTypingHints(unittest.TestCase):
+    def test_function(self):
+        @enforce_type_hints
+        def example_function(
+                a: List[int],
+                b: Optional[Dict[str, float]] = None,
+                ) -> Tuple[int, ...]:
+            return tuple(a)
+
+        self.assertEqual(example_function([1, 2], {"a": 1.0}), (1, 2))
+
+        with self.assertRaises(ParameterTypeError) as err:
+            example_function([1, "a"])
+        self.assertIn("typing.List[int]", str(err.exception))
+
+        with self.assertRaises(ParameterTypeError):
+            example_function([1], {"a": "b"})
+
+    def test_return(self):
+        @enforce_type_hints
+        def example_function(a) -> Optional[List[str]]:
+            return a
+
+        self.assertIsNone(example_function(None))
+        with self.assertRaises(ReturnTypeError):
+            example_function(["a", 1])
+
+
+@unittest.skipIf(sys.version_info < (3, 8), "Protocol requires Python 3.8")
+class TestProtocolHints(unittest.TestCase):
+    def setUp(self):
+        class Readable(typing.Protocol):
+            name: str
+
+            def read(self):
+                pass
+
+        class File:
+            name = "file"
+
+            def read(self):
+                pass
+
+        class Stream:
+            def __init__(self):
+                self.name = "stream"
+
+            def read(self):
+                pass
+
+        self.Readable = Readable
+        self.File = File
+        self.Stream = Stream
+
+    def test_validation(self):
+        validator = compile_hint(self.Readable)
+        self.assertTrue(is_valid(validator, self.File()))
+        self.assertTrue(is_valid(validator, self.Stream()))
+        self.assertFalse(is_valid(validator, ExClass()))
+        self.assertFalse(is_valid(validator, None))
+
+        stream = self.Stream()
+        del stream.name
+        self.assertFalse(is_valid(validator, stream))
+
+    def test_type_checked_once(self):
+        validator = compile_hint(self.Readable)
+        validator.validate(None, None, self.File())
+        validator.validate(None, None, self.Stream())
+        # Only instance attributes are looked up on each value
+        self.assertEqual(validator.missing[self.File], ())
+        self.assertEqual(validator.missing[self.Stream], ("name",))
+
+    def test_cache_bounded(self):
+        validator = compile_hint(self.Readable)
+        local_classes = [type("File", (self.File,), {}) for _ in range(3)]
+        refs = [weakref.ref(cls) for cls in local_classes]
+        with mock.patch.object(_hints, "TYPE_CACHE_SIZE", 2):
+            for cls in local_classes:
+                validator.validate(None, None, cls())
+            self.assertEqual(len(validator.missing), 1)
+            self.assertIn(local_classes[-1], validator.missing)
+            validator.validate(None, None, self.Stream())
+        del cls, local_classes
+        gc.collect()
+        # Only the last cached class is still referenced
+        self.assertEqual([ref() is None for ref in refs], [True, True, False])
+
+    def test_attributes_added_later(self):
+        class Partial:
+            name = "partial"
+
+        validator = compile_hint(self.Readable)
+        self.assertFalse(is_valid(validator, Partial()))
+        Partial.read = lambda self: None
+        self.assertTrue(is_valid(validator, Partial()))
+
+    def test_nested(self):
+        validator = compile_hint(Optional[List[self.Readable]])
+        self.assertTrue(is_valid(validator, [self.File(), self.Stream()]))
+        self.assertTrue(is_valid(validator, None))
+        self.assertFalse(is_valid(validator, [self.File(), ExClass()]))
+
+    def test_generic_protocol(self):
+        validator = compile_hint(typing.SupportsAbs[int])
+        self.assertTrue(is_valid(validator, -1))
+        self.assertFalse(is_valid(validator, "a"))
+
+    def test_enforced(self):
+        @enforce_type_hints
+        def read_all(source: self.Readable) -> str:
+            return source.name
+
+        self.assertEqual(read_all(self.File()), "file")
+        with self.assertRaises(ParameterTypeError):
+            read_all(ExClass())
+
+
+if sys.version_info >= (3, 8):
+    class Address(typing.TypedDict):
+        street: str
+        number: int
+
+    class Person(typing.TypedDict, total=False):
+        name: str
+        age: int
+        addresses: List[Address]
+        parent: "Person"
+
+
+@unittest.skipIf(sys.version_info < (3, 8), "TypedDict requires Python 3.8")
+class TestSchemaHints(unittest.TestCase):
+    def test_validation(self):
+        validator = compile_hint(Person)
+        self.assertTrue(is_valid(validator, {}))
+        self.assertTrue(is_valid(validator, {"name": "a", "other": 1}))
+        self.assertTrue(is_valid(validator, {
+            "addresses": [{"street": "a", "number": 1}],
+            "parent": {"name": "b", "parent": {}},
+        }))
+        self.assertFalse(is_valid(validator, None))
+        self.assertFalse(is_valid(validator, [("name", "a")]))
+        self.assertFalse(is_valid(validator, {"age": "1"}))
+        self.assertFalse(is_valid(validator, {"parent": {"age": 1.0}}))
+
+    def test_key_paths(self):
+        validator = compile_hint(Person)
+        error = error_of(validator, {"addresses": [
+            {"street": "a", "number": 1},
+            {"street": "b", "number": "2"},
+        ]})
+        self.assertEqual(error.path, ("addresses", 1, "number"))
+        self.assertEqual(error.value, "2")
+
+        error = error_of(validator, {"parent": {"addresses": [{"number": 1}]}})
+        self.assertEqual(error.path, ("parent", "addresses", 0, "street"))
+        self.assertIs(error.value, MISSING)
+
+        error = error_of(validator, {"addresses": [None]})
+        self.assertEqual(error.path, ("addresses", 0))
+
+    def test_collection_paths(self):
+        error = error_of(compile_hint(Dict[str, List[int]]), {"a": [1, "b"]})
+        self.assertEqual(error.path, ("a", 1))
+        self.assertEqual(error.value, "b")
+
+        error = error_of(compile_hint(Tuple[int, List[str]]), (1, ["a", 2]))
+        self.assertEqual(error.path, (1, 1))
+
+        error = error_of(compile_hint(Dict[str, int]), {1: 1})
+        self.assertEqual(error.path, ())
+
+    @unittest.skipIf(sys.version_info < (3, 11), "NotRequired requires 3.11")
+    def test_not_required(self):
+        class Item(typing.TypedDict):
+            name: str
+            price: typing.NotRequired[float]
+
+        validator = compile_hint(Item)
+        self.assertTrue(is_valid(validator, {"name": "a"}))
+        self.assertTrue(is_valid(validator, {"name": "a", "price": 1}))
+        self.assertFalse(is_valid(validator, {"price": 1.0}))
+
+    def test_enforced(self):
+        @enforce_type_hints
+        def greet(person: Person) -> str:
+            return person["name"]
+
+        self.assertEqual(greet({"name": "a"}), "a")
+        with self.assertRaises(ParameterTypeError) as err:
+            greet({"name": "a", "addresses": [{"street": 1, "number": 1}]})
+        self.assertIn(
+            "the item at ['addresses'][0]['street'] was 1 <class 'int'>",
+            str(err.exception),
+        )